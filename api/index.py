@@ -10,6 +10,10 @@ SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
+from nutrition_tracker.bootstrap import warm  # noqa: E402
+
+warm(prime=True)
+
 from nutrition_tracker.api.asgi import app  # noqa: E402
 
 __all__ = ["app"]
@@ -10,4 +10,4 @@ if [ -f ".venv/bin/activate" ]; then
 fi
 
 export ENVIRONMENT="${ENVIRONMENT:-local}"
-uvicorn nutrition_tracker.api.asgi:app --reload
+uvicorn nutrition_tracker.api.asgi:app --loop uvloop --http httptools --reload
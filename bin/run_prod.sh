@@ -9,4 +9,4 @@ if [ -f ".venv/bin/activate" ]; then
 fi
 
 export ENVIRONMENT="${ENVIRONMENT:-production}"
-uvicorn nutrition_tracker.api.asgi:app --host 0.0.0.0 --port 8000
+uvicorn nutrition_tracker.api.asgi:app --loop uvloop --http httptools --host 0.0.0.0 --port 8000
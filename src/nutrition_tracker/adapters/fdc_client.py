@@ -1,14 +1,23 @@
 """USDA FoodData Central API client."""
 
-from dataclasses import dataclass
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import partial
 from typing import Protocol
 
 import httpx
+import orjson
+
+_FDC_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+_FDC_TIMEOUT = httpx.Timeout(connect=5.0, read=15.0, write=15.0, pool=30.0)
+_FDC_HEADERS = {"Accept-Encoding": "br, gzip"}
 
 
 class FdcClient(Protocol):
     """Interface for FoodData Central API interactions."""
 
+    __slots__ = ()
+
     async def search_foods(self, query: str, page_size: int = 10) -> dict[str, object]:
         """Search foods by query and return raw API data."""
 
@@ -16,42 +25,53 @@ class FdcClient(Protocol):
         """Fetch a food by FDC id and return raw API data."""
 
 
-@dataclass
+@dataclass(slots=True)
 class HttpxFdcClient(FdcClient):
-    """HTTPX-backed FDC client."""
+    """HTTPX-backed FDC client using a session bound to base URL and API key."""
 
-    api_key: str
-    base_url: str
-    http_client: httpx.AsyncClient
+    http_client: httpx.AsyncClient | None = None
+    open_session: Callable[[], httpx.AsyncClient] | None = field(
+        default=None, repr=False
+    )
 
     @classmethod
     def create(cls, api_key: str, base_url: str) -> "HttpxFdcClient":
-        """Create an FDC client with a managed httpx session."""
-        return cls(api_key=api_key, base_url=base_url, http_client=httpx.AsyncClient())
+        """Create an FDC client whose pooled HTTP/2 session opens on first use."""
+        return cls(
+            open_session=partial(
+                httpx.AsyncClient,
+                base_url=base_url,
+                params={"api_key": api_key},
+                headers=_FDC_HEADERS,
+                http2=True,
+                limits=_FDC_LIMITS,
+                timeout=_FDC_TIMEOUT,
+            ),
+        )
+
+    def session(self) -> httpx.AsyncClient:
+        """Return the HTTP session, opening it on first use."""
+        if self.http_client is None:
+            if self.open_session is None:
+                raise RuntimeError("FDC client has no HTTP session")
+            self.http_client = self.open_session()
+        return self.http_client
 
     async def search_foods(self, query: str, page_size: int = 10) -> dict[str, object]:
         """Search foods by query."""
-        url = f"{self.base_url}/foods/search"
-        response = await self.http_client.post(
-            url,
-            params={"api_key": self.api_key},
-            json={"query": query, "pageSize": page_size},
-            timeout=15,
+        response = await self.session().post(
+            "/foods/search", json={"query": query, "pageSize": page_size}
         )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
 
     async def get_food(self, fdc_id: int) -> dict[str, object]:
         """Fetch a food by FDC id."""
-        url = f"{self.base_url}/food/{fdc_id}"
-        response = await self.http_client.get(
-            url,
-            params={"api_key": self.api_key},
-            timeout=15,
-        )
+        response = await self.session().get(f"/food/{fdc_id}")
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
 
     async def close(self) -> None:
-        """Close the underlying HTTP session."""
-        await self.http_client.aclose()
+        """Close the underlying HTTP session if it was opened."""
+        if self.http_client is not None:
+            await self.http_client.aclose()
@@ -1,22 +1,29 @@
 """OpenAI Responses API client for vision extraction."""
 
-import json
+from __future__ import annotations
+
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-from openai import AsyncOpenAI
+import orjson
 
 from nutrition_tracker.services.vision import VisionClient
 
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
 
-@dataclass
+@dataclass(slots=True)
 class OpenAIVisionClient(VisionClient):
     """Vision client backed by OpenAI Responses API."""
 
     client: AsyncOpenAI
 
     @classmethod
-    def create(cls, api_key: str) -> "OpenAIVisionClient":
+    def create(cls, api_key: str) -> OpenAIVisionClient:
         """Create an OpenAI vision client."""
+        from openai import AsyncOpenAI  # noqa: PLC0415
+
         return cls(client=AsyncOpenAI(api_key=api_key))
 
     async def extract(  # noqa: PLR0913
@@ -58,4 +65,4 @@ class OpenAIVisionClient(VisionClient):
         output_text = response.output_text
         if not output_text:
             raise RuntimeError("OpenAI returned an empty response")
-        return json.loads(output_text)
+        return orjson.loads(output_text)
@@ -1,16 +1,20 @@
 """Supabase admin data access."""
 
+from __future__ import annotations
+
 from dataclasses import dataclass
 from datetime import datetime
+from typing import TYPE_CHECKING
 from uuid import UUID
 
-from supabase import Client
-
 from nutrition_tracker.domain.admin import AdminUser
 from nutrition_tracker.services.admin import AdminRepository
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 
-@dataclass
+@dataclass(slots=True)
 class SupabaseAdminRepository(AdminRepository):
     """Supabase implementation for admin queries."""
 
@@ -41,24 +45,24 @@ class SupabaseAdminRepository(AdminRepository):
             )
         return users
 
-    def list_sessions(self, limit: int) -> list[dict[str, object]]:
-        """Return recent photo sessions."""
+    def list_sessions(self, limit: int, offset: int = 0) -> list[dict[str, object]]:
+        """Return a page of recent photo sessions."""
         response = (
             self.client.table("photo_sessions")
             .select("id, user_id, status, updated_at, context_json")
             .order("updated_at", desc=True)
-            .limit(limit)
+            .range(offset, offset + limit - 1)
             .execute()
         )
         return response.data or []
 
-    def list_costs(self, limit: int) -> list[dict[str, object]]:
-        """Return recent model usage entries."""
+    def list_costs(self, limit: int, offset: int = 0) -> list[dict[str, object]]:
+        """Return a page of recent model usage entries."""
         response = (
             self.client.table("model_usage_daily")
             .select("day, user_id, model, requests, input_tokens, output_tokens")
             .order("day", desc=True)
-            .limit(limit)
+            .range(offset, offset + limit - 1)
             .execute()
         )
         return response.data or []
@@ -67,7 +71,10 @@ class SupabaseAdminRepository(AdminRepository):
         """Return recent audit events for a user."""
         response = (
             self.client.table("audit_events")
-            .select("*")
+            .select(
+                "id, user_id, entity_type, entity_id, event_type, before_json, "
+                "after_json, created_at"
+            )
             .eq("user_id", str(user_id))
             .order("created_at", desc=True)
             .limit(limit)
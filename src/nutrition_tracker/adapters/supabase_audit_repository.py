@@ -1,14 +1,21 @@
 """Supabase repository for audit events."""
 
+from __future__ import annotations
+
 from dataclasses import dataclass
-from uuid import UUID
+from typing import TYPE_CHECKING
 
-from supabase import Client
+from postgrest.types import ReturnMethod
 
 from nutrition_tracker.services.audit import AuditRepository
 
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from supabase import Client
+
 
-@dataclass
+@dataclass(slots=True)
 class SupabaseAuditRepository(AuditRepository):
     """Supabase-backed audit repository."""
 
@@ -32,5 +39,6 @@ class SupabaseAuditRepository(AuditRepository):
                 "event_type": event_type,
                 "before_json": before,
                 "after_json": after,
-            }
+            },
+            returning=ReturnMethod.minimal,
         ).execute()
@@ -1,16 +1,29 @@
 """Supabase implementation for the user food library."""
 
+from __future__ import annotations
+
 from dataclasses import dataclass
-from datetime import datetime
+from typing import TYPE_CHECKING
 from uuid import UUID
 
-from supabase import Client
+from ciso8601 import parse_datetime
+from postgrest.types import ReturnMethod
 
 from nutrition_tracker.domain.library import LibraryFood
 from nutrition_tracker.services.library import LibraryRepository
 
+_FOOD_COLUMNS = (
+    "id, user_id, name, brand, store, source_type, source_ref, basis, "
+    "serving_size_g, calories, protein_g, fat_g, carbs_g, use_count, last_used_at"
+)
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from supabase import Client
 
-@dataclass
+
+@dataclass(slots=True)
 class SupabaseLibraryRepository(LibraryRepository):
     """Supabase-backed repository for user food libraries."""
 
@@ -43,7 +56,7 @@ class SupabaseLibraryRepository(LibraryRepository):
         """Return a food entry by id, if present."""
         response = (
             self.client.table("foods_user_library")
-            .select("*")
+            .select(_FOOD_COLUMNS)
             .eq("id", str(food_id))
             .limit(1)
             .execute()
@@ -58,7 +71,7 @@ class SupabaseLibraryRepository(LibraryRepository):
         """Return a food entry by source reference."""
         response = (
             self.client.table("foods_user_library")
-            .select("*")
+            .select(_FOOD_COLUMNS)
             .eq("user_id", str(user_id))
             .eq("source_type", source_type)
             .eq("source_ref", source_ref)
@@ -70,42 +83,23 @@ class SupabaseLibraryRepository(LibraryRepository):
         return _parse_food(response.data[0])
 
     def search_foods(self, user_id: UUID, query: str, limit: int) -> list[LibraryFood]:
-        """Search foods by name and aliases."""
-        pattern = f"%{query}%"
-        foods_response = (
-            self.client.table("foods_user_library")
-            .select("*")
+        """Search foods by name and aliases in a single query."""
+        pattern = _ilike_pattern(query)
+        response = (
+            self.client.table("foods_user_library_search")
+            .select(_FOOD_COLUMNS)
             .eq("user_id", str(user_id))
-            .ilike("name", pattern)
+            .or_(f"name.ilike.{pattern},alias_texts.ilike.{pattern}")
             .limit(limit)
             .execute()
         )
-        foods = [_parse_food(row) for row in foods_response.data or []]
-
-        alias_response = (
-            self.client.table("food_aliases")
-            .select("food_id")
-            .eq("user_id", str(user_id))
-            .ilike("alias_text", pattern)
-            .execute()
-        )
-        alias_ids = {row["food_id"] for row in alias_response.data or []}
-        if alias_ids:
-            alias_foods_response = (
-                self.client.table("foods_user_library")
-                .select("*")
-                .in_("id", list(alias_ids))
-                .execute()
-            )
-            foods.extend(_parse_food(row) for row in alias_foods_response.data or [])
-
-        return foods[:limit]
+        return [_parse_food(row) for row in response.data or []]
 
     def list_top_foods(self, user_id: UUID, limit: int) -> list[LibraryFood]:
         """Return top foods for a user by usage."""
         response = (
             self.client.table("foods_user_library")
-            .select("*")
+            .select(_FOOD_COLUMNS)
             .eq("user_id", str(user_id))
             .order("last_used_at", desc=True)
             .order("use_count", desc=True)
@@ -121,34 +115,29 @@ class SupabaseLibraryRepository(LibraryRepository):
                 "user_id": str(user_id),
                 "food_id": str(food_id),
                 "alias_text": alias_text,
-            }
+            },
+            returning=ReturnMethod.minimal,
         ).execute()
 
     def increment_usage(self, food_id: UUID, used_at: datetime) -> None:
-        """Increment usage counters for a food entry."""
-        response = (
-            self.client.table("foods_user_library")
-            .select("use_count")
-            .eq("id", str(food_id))
-            .limit(1)
-            .execute()
-        )
-        current = 0
-        if response.data:
-            current = int(response.data[0].get("use_count", 0))
-        self.client.table("foods_user_library").update(
-            {
-                "use_count": current + 1,
-                "last_used_at": used_at.isoformat(),
-            }
-        ).eq("id", str(food_id)).execute()
+        """Atomically increment usage counters for a food entry."""
+        self.client.rpc(
+            "increment_food_use_count",
+            {"p_food_id": str(food_id), "p_used_at": used_at.isoformat()},
+        ).execute()
+
+
+def _ilike_pattern(query: str) -> str:
+    """Return a quoted PostgREST ilike pattern safe for use inside or_()."""
+    escaped = query.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"*{escaped}*"'
 
 
 def _parse_food(row: dict[str, object]) -> LibraryFood:
     """Parse a library food row into a domain model."""
     last_used_raw = row.get("last_used_at")
     last_used_at = (
-        datetime.fromisoformat(last_used_raw)
+        parse_datetime(last_used_raw)
         if isinstance(last_used_raw, str) and last_used_raw
         else None
     )
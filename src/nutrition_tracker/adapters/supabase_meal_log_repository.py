@@ -1,73 +1,47 @@
 """Supabase repository for meal logs."""
 
+from __future__ import annotations
+
 from dataclasses import dataclass
-from datetime import datetime
+from typing import TYPE_CHECKING
 from uuid import UUID
 
-from supabase import Client
+from ciso8601 import parse_datetime
+from postgrest.types import ReturnMethod
 
 from nutrition_tracker.domain.meals import MealItemRecord, MealItemSnapshot
-from nutrition_tracker.domain.nutrition import MacroProfile
 from nutrition_tracker.domain.stats import MealLogRow
 from nutrition_tracker.services.meals import MealLogRepository
 
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from supabase import Client
+
+    from nutrition_tracker.domain.nutrition import MacroProfile
+
 
-@dataclass
+@dataclass(slots=True)
 class SupabaseMealLogRepository(MealLogRepository):
     """Supabase implementation for meal logs."""
 
     client: Client
 
-    def create_meal_log(
-        self, user_id: UUID, logged_at: datetime, totals: MacroProfile
+    def create_meal_log_with_items(
+        self, user_id: UUID, logged_at: datetime, items: list[MealItemSnapshot]
     ) -> UUID:
-        """Create a meal log row and return its id."""
-        response = (
-            self.client.table("meal_logs")
-            .insert(
-                {
-                    "user_id": str(user_id),
-                    "logged_at": logged_at.isoformat(),
-                    "total_calories": totals.calories,
-                    "total_protein_g": totals.protein_g,
-                    "total_fat_g": totals.fat_g,
-                    "total_carbs_g": totals.carbs_g,
-                }
-            )
-            .execute()
-        )
+        """Create a meal log and its items in one transaction and return its id."""
+        response = self.client.rpc(
+            "create_meal_log_with_items",
+            {
+                "p_user_id": str(user_id),
+                "p_logged_at": logged_at.isoformat(),
+                "p_items": [meal_item_payload(item) for item in items],
+            },
+        ).execute()
         if not response.data:
             raise RuntimeError("Failed to create meal log")
-        return UUID(response.data[0]["id"])
-
-    def create_meal_items(
-        self, meal_log_id: UUID, items: list[MealItemSnapshot]
-    ) -> None:
-        """Create meal item rows."""
-        payload = []
-        for item in items:
-            payload.append(
-                {
-                    "meal_log_id": str(meal_log_id),
-                    "food_id": str(item.food_id) if item.food_id else None,
-                    "name_snapshot": item.name,
-                    "nutrition_snapshot": item.nutrition_snapshot
-                    or {
-                        "calories": item.calories,
-                        "protein_g": item.protein_g,
-                        "fat_g": item.fat_g,
-                        "carbs_g": item.carbs_g,
-                        "basis": "per100g",
-                    },
-                    "portion_grams": item.grams,
-                    "item_calories": item.calories,
-                    "item_protein_g": item.protein_g,
-                    "item_fat_g": item.fat_g,
-                    "item_carbs_g": item.carbs_g,
-                }
-            )
-        if payload:
-            self.client.table("meal_items").insert(payload).execute()
+        return UUID(str(response.data))
 
     def get_meal_log(self, meal_log_id: UUID) -> MealLogRow | None:
         """Return a meal log row by id."""
@@ -84,7 +58,7 @@ class SupabaseMealLogRepository(MealLogRepository):
         if not response.data:
             return None
         row = response.data[0]
-        logged_at = datetime.fromisoformat(row["logged_at"])
+        logged_at = parse_datetime(row["logged_at"])
         return MealLogRow(
             meal_id=UUID(row["id"]),
             logged_at=logged_at,
@@ -135,7 +109,8 @@ class SupabaseMealLogRepository(MealLogRepository):
                 "item_protein_g": macros.protein_g,
                 "item_fat_g": macros.fat_g,
                 "item_carbs_g": macros.carbs_g,
-            }
+            },
+            returning=ReturnMethod.minimal,
         ).eq("id", str(meal_item_id)).execute()
 
     def update_meal_log_totals(self, meal_log_id: UUID, totals: MacroProfile) -> None:
@@ -146,10 +121,32 @@ class SupabaseMealLogRepository(MealLogRepository):
                 "total_protein_g": totals.protein_g,
                 "total_fat_g": totals.fat_g,
                 "total_carbs_g": totals.carbs_g,
-            }
+            },
+            returning=ReturnMethod.minimal,
         ).eq("id", str(meal_log_id)).execute()
 
 
+def meal_item_payload(item: MealItemSnapshot) -> dict[str, object]:
+    """Build the jsonb item row expected by the meal log RPC functions."""
+    return {
+        "food_id": str(item.food_id) if item.food_id else None,
+        "name_snapshot": item.name,
+        "nutrition_snapshot": item.nutrition_snapshot
+        or {
+            "calories": item.calories,
+            "protein_g": item.protein_g,
+            "fat_g": item.fat_g,
+            "carbs_g": item.carbs_g,
+            "basis": "per100g",
+        },
+        "portion_grams": item.grams,
+        "item_calories": item.calories,
+        "item_protein_g": item.protein_g,
+        "item_fat_g": item.fat_g,
+        "item_carbs_g": item.carbs_g,
+    }
+
+
 def _parse_item(row: dict[str, object]) -> MealItemRecord:
     return MealItemRecord(
         id=UUID(row["id"]),
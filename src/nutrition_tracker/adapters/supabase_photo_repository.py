@@ -1,14 +1,20 @@
 """Supabase-backed photo repository."""
 
+from __future__ import annotations
+
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 from uuid import UUID
 
-from supabase import Client
+from postgrest.types import ReturnMethod
 
 from nutrition_tracker.services.sessions import PhotoRepository
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 
-@dataclass
+@dataclass(slots=True)
 class SupabasePhotoRepository(PhotoRepository):
     """Supabase implementation for photo metadata persistence."""
 
@@ -43,4 +49,9 @@ class SupabasePhotoRepository(PhotoRepository):
 
     def delete_photo(self, photo_id: UUID) -> None:
         """Delete a photo metadata row."""
-        self.client.table("photos").delete().eq("id", str(photo_id)).execute()
+        (
+            self.client.table("photos")
+            .delete(returning=ReturnMethod.minimal)
+            .eq("id", str(photo_id))
+            .execute()
+        )
@@ -1,35 +1,27 @@
 """Supabase-backed session repository."""
 
+from __future__ import annotations
+
 from dataclasses import dataclass
-from datetime import UTC, datetime
+from types import MappingProxyType
+from typing import TYPE_CHECKING
 from uuid import UUID
 
-from supabase import Client
+from postgrest.types import ReturnMethod
 
+from nutrition_tracker.adapters.supabase_meal_log_repository import meal_item_payload
 from nutrition_tracker.domain.sessions import SessionRecord
 from nutrition_tracker.services.sessions import SessionRepository
 
-_ACTIVE_STATUSES = {
-    "AWAITING_CONFIRMATION",
-    "AWAITING_ITEM_LIST",
-    "AWAITING_ITEM_CONFIRMATION",
-    "AWAITING_ITEM_SELECTION",
-    "AWAITING_MANUAL_NAME",
-    "AWAITING_MANUAL_STORE",
-    "AWAITING_MANUAL_BASIS",
-    "AWAITING_MANUAL_SERVING",
-    "AWAITING_MANUAL_MACROS",
-    "AWAITING_PORTION_CHOICE",
-    "AWAITING_MANUAL_GRAMS",
-    "AWAITING_SAVE",
-    "AWAITING_EDIT_CHOICE",
-    "AWAITING_EDIT_GRAMS",
-    "EDIT_SELECT_ITEM",
-    "EDIT_ENTER_GRAMS",
-}
-
-
-@dataclass
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from supabase import Client
+
+    from nutrition_tracker.domain.meals import MealItemSnapshot
+
+
+@dataclass(slots=True)
 class SupabaseSessionRepository(SessionRepository):
     """Supabase implementation for photo sessions."""
 
@@ -57,14 +49,7 @@ class SupabaseSessionRepository(SessionRepository):
         )
         if not response.data:
             raise RuntimeError("Failed to create session")
-        row = response.data[0]
-        return SessionRecord(
-            id=UUID(row["id"]),
-            user_id=UUID(row["user_id"]),
-            photo_id=UUID(row["photo_id"]) if row.get("photo_id") else None,
-            status=row["status"],
-            context=row["context_json"],
-        )
+        return _parse_session(response.data[0])
 
     def get_session(self, session_id: UUID) -> SessionRecord | None:
         """Return a session by id, if present."""
@@ -77,14 +62,7 @@ class SupabaseSessionRepository(SessionRepository):
         )
         if not response.data:
             return None
-        row = response.data[0]
-        return SessionRecord(
-            id=UUID(row["id"]),
-            user_id=UUID(row["user_id"]),
-            photo_id=UUID(row["photo_id"]) if row.get("photo_id") else None,
-            status=row["status"],
-            context=row["context_json"],
-        )
+        return _parse_session(response.data[0])
 
     def get_active_session(self, user_id: UUID) -> SessionRecord | None:
         """Return the most recent active session for a user."""
@@ -92,30 +70,54 @@ class SupabaseSessionRepository(SessionRepository):
             self.client.table("photo_sessions")
             .select("id, user_id, photo_id, status, context_json")
             .eq("user_id", str(user_id))
-            .in_("status", list(_ACTIVE_STATUSES))
+            .eq("is_active", True)
             .order("created_at", desc=True)
             .limit(1)
             .execute()
         )
         if not response.data:
             return None
-        row = response.data[0]
-        return SessionRecord(
-            id=UUID(row["id"]),
-            user_id=UUID(row["user_id"]),
-            photo_id=UUID(row["photo_id"]) if row.get("photo_id") else None,
-            status=row["status"],
-            context=row["context_json"],
-        )
+        return _parse_session(response.data[0])
 
     def update_session(
         self, session_id: UUID, status: str, context: dict[str, object]
     ) -> None:
-        """Update session status and context."""
+        """Update session status and context, leaving ended sessions untouched."""
         self.client.table("photo_sessions").update(
             {
                 "status": status,
                 "context_json": context,
-                "updated_at": datetime.now(tz=UTC).isoformat(),
-            }
-        ).eq("id", str(session_id)).execute()
+            },
+            returning=ReturnMethod.minimal,
+        ).eq("id", str(session_id)).eq("is_active", True).execute()
+
+    def complete_with_meal_log(
+        self,
+        session: SessionRecord,
+        logged_at: datetime,
+        items: list[MealItemSnapshot],
+    ) -> UUID | None:
+        """Save the meal, complete the session and delete its photo in one RPC."""
+        response = self.client.rpc(
+            "save_session_meal",
+            {
+                "p_session_id": str(session.id),
+                "p_context": dict(session.context),
+                "p_user_id": str(session.user_id),
+                "p_logged_at": logged_at.isoformat(),
+                "p_items": [meal_item_payload(item) for item in items],
+            },
+        ).execute()
+        if not response.data:
+            return None
+        return UUID(str(response.data))
+
+
+def _parse_session(row: dict[str, object]) -> SessionRecord:
+    return SessionRecord(
+        id=UUID(row["id"]),
+        user_id=UUID(row["user_id"]),
+        photo_id=UUID(row["photo_id"]) if row.get("photo_id") else None,
+        status=row["status"],
+        context=MappingProxyType(row["context_json"]),
+    )
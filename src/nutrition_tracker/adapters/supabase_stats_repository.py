@@ -1,16 +1,22 @@
 """Supabase repository for meal log statistics."""
 
+from __future__ import annotations
+
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime
+from typing import TYPE_CHECKING
 from uuid import UUID
 
-from supabase import Client
+from ciso8601 import parse_datetime
 
-from nutrition_tracker.domain.stats import MealLogRow
+from nutrition_tracker.domain.stats import DailyTotals, MealLogRow, UserLogActivity
 from nutrition_tracker.services.stats import StatsRepository
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 
-@dataclass
+@dataclass(slots=True)
 class SupabaseStatsRepository(StatsRepository):
     """Supabase implementation for stats queries."""
 
@@ -34,6 +40,30 @@ class SupabaseStatsRepository(StatsRepository):
         )
         return [_parse_row(row) for row in response.data or []]
 
+    def list_daily_totals(
+        self, user_id: UUID, start: datetime, end: datetime, timezone_name: str
+    ) -> list[DailyTotals]:
+        """Return per-day totals aggregated by the database."""
+        response = self.client.rpc(
+            "meal_log_daily_stats",
+            {
+                "p_user_id": str(user_id),
+                "p_start": start.isoformat(),
+                "p_end": end.isoformat(),
+                "p_timezone": timezone_name,
+            },
+        ).execute()
+        return [
+            DailyTotals(
+                day=date.fromisoformat(row["day"]),
+                calories=float(row["calories"] or 0.0),
+                protein_g=float(row["protein_g"] or 0.0),
+                fat_g=float(row["fat_g"] or 0.0),
+                carbs_g=float(row["carbs_g"] or 0.0),
+            )
+            for row in response.data or []
+        ]
+
     def list_recent_meal_logs(self, user_id: UUID, limit: int) -> list[MealLogRow]:
         """Return recent meal logs for a user."""
         response = (
@@ -44,24 +74,51 @@ class SupabaseStatsRepository(StatsRepository):
             )
             .eq("user_id", str(user_id))
             .order("logged_at", desc=True)
-            .limit(limit)
+            .range(0, limit - 1)
             .execute()
         )
         return [_parse_row(row) for row in response.data or []]
 
+    def aggregate_user_logs(
+        self,
+        user_ids: list[UUID],
+        start_7d: datetime,
+        start_30d: datetime,
+        end: datetime,
+    ) -> dict[UUID, UserLogActivity]:
+        """Return per-user activity aggregated by the database in one query."""
+        response = self.client.rpc(
+            "meal_log_user_activity",
+            {
+                "p_user_ids": [str(user_id) for user_id in user_ids],
+                "p_start_7d": start_7d.isoformat(),
+                "p_start_30d": start_30d.isoformat(),
+                "p_end": end.isoformat(),
+            },
+        ).execute()
+        return {
+            UUID(row["user_id"]): UserLogActivity(
+                logs_last_7d=int(row["logs_7d"]),
+                logs_last_30d=int(row["logs_30d"]),
+                calories_last_7d=float(row["calories_7d"] or 0.0),
+            )
+            for row in response.data or []
+        }
+
 
 def _parse_row(row: dict[str, object]) -> MealLogRow:
-    logged_at_raw = row.get("logged_at")
+    get = row.get
+    logged_at_raw = get("logged_at")
     logged_at = (
-        datetime.fromisoformat(logged_at_raw)
+        parse_datetime(logged_at_raw)
         if isinstance(logged_at_raw, str) and logged_at_raw
         else datetime.min
     )
     return MealLogRow(
         meal_id=UUID(row["id"]),
         logged_at=logged_at,
-        total_calories=float(row.get("total_calories", 0.0)),
-        total_protein_g=float(row.get("total_protein_g", 0.0)),
-        total_fat_g=float(row.get("total_fat_g", 0.0)),
-        total_carbs_g=float(row.get("total_carbs_g", 0.0)),
+        total_calories=float(get("total_calories", 0.0)),
+        total_protein_g=float(get("total_protein_g", 0.0)),
+        total_fat_g=float(get("total_fat_g", 0.0)),
+        total_carbs_g=float(get("total_carbs_g", 0.0)),
     )
@@ -1,20 +1,33 @@
 """Supabase-backed user repository."""
 
-from dataclasses import dataclass
-from datetime import UTC, datetime
-from uuid import UUID
+from __future__ import annotations
 
-from supabase import Client
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+from uuid import UUID
 
 from nutrition_tracker.domain.models import UserRecord
 from nutrition_tracker.services.users import UserRepository
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 
-@dataclass
+@dataclass(slots=True)
 class SupabaseUserRepository(UserRepository):
     """Supabase implementation for user persistence."""
 
     client: Client
+    touch_interval_seconds: float = 5.0
+    _pending_touches: set[str] = field(default_factory=set, init=False, repr=False)
+    _last_touch_flush: float = field(
+        default_factory=time.monotonic, init=False, repr=False
+    )
+    _touch_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
 
     def get_by_telegram_id(self, telegram_user_id: int) -> UserRecord | None:
         """Return the user for a Telegram user id, if present."""
@@ -33,26 +46,42 @@ class SupabaseUserRepository(UserRepository):
             )
         return None
 
-    def create_user(self, telegram_user_id: int) -> UserRecord:
-        """Create a new user row and return it."""
-        response = (
-            self.client.table("users")
-            .insert({"telegram_user_id": telegram_user_id})
-            .execute()
-        )
-        if not response.data:
+    def create_user_with_settings(
+        self, telegram_user_id: int, timezone: str | None
+    ) -> UserRecord:
+        """Create a user and its settings row in one transaction."""
+        response = self.client.rpc(
+            "create_user_with_settings",
+            {"p_telegram_user_id": telegram_user_id, "p_timezone": timezone},
+        ).execute()
+        row = response.data
+        if not isinstance(row, dict):
             raise RuntimeError("Failed to create user in Supabase")
-        row = response.data[0]
         return UserRecord(id=UUID(row["id"]), telegram_user_id=row["telegram_user_id"])
 
-    def create_settings(self, user_id: UUID, timezone: str | None) -> None:
-        """Create the default settings row for a user."""
-        self.client.table("user_settings").insert(
-            {"user_id": str(user_id), "timezone": timezone}
-        ).execute()
-
     def touch_last_active(self, user_id: UUID) -> None:
-        """Update the last_active_at timestamp for a user."""
-        self.client.table("users").update(
-            {"last_active_at": datetime.now(tz=UTC).isoformat()}
-        ).eq("id", str(user_id)).execute()
+        """Buffer a last_active_at bump, flushing once per interval."""
+        with self._touch_lock:
+            self._pending_touches.add(str(user_id))
+            due = (
+                time.monotonic() - self._last_touch_flush >= self.touch_interval_seconds
+            )
+        if due:
+            self.flush_last_active()
+
+    def flush_last_active(self) -> None:
+        """Write buffered last_active_at bumps, keeping them if the write fails."""
+        with self._touch_lock:
+            user_ids = sorted(self._pending_touches)
+            self._pending_touches.clear()
+            self._last_touch_flush = time.monotonic()
+        if not user_ids:
+            return
+        try:
+            self.client.rpc(
+                "touch_users_last_active", {"p_user_ids": user_ids}
+            ).execute()
+        except Exception:
+            with self._touch_lock:
+                self._pending_touches.update(user_ids)
+            raise
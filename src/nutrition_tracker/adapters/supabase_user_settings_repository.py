@@ -1,15 +1,21 @@
 """Supabase repository for user settings."""
 
+from __future__ import annotations
+
 from dataclasses import dataclass
-from datetime import UTC, datetime
-from uuid import UUID
+from typing import TYPE_CHECKING
 
-from supabase import Client
+from postgrest.types import ReturnMethod
 
 from nutrition_tracker.services.user_settings import UserSettingsRepository
 
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from supabase import Client
+
 
-@dataclass
+@dataclass(slots=True)
 class SupabaseUserSettingsRepository(UserSettingsRepository):
     """Supabase implementation for user settings."""
 
@@ -31,8 +37,6 @@ class SupabaseUserSettingsRepository(UserSettingsRepository):
     def set_timezone(self, user_id: UUID, timezone_name: str) -> None:
         """Update the user's timezone."""
         self.client.table("user_settings").update(
-            {
-                "timezone": timezone_name,
-                "updated_at": datetime.now(tz=UTC).isoformat(),
-            }
+            {"timezone": timezone_name},
+            returning=ReturnMethod.minimal,
         ).eq("user_id", str(user_id)).execute()
@@ -1,18 +1,46 @@
 """Telegram API client adapter."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Protocol
 
 import httpx
+import orjson
+
+TELEGRAM_API_URL = "https://api.telegram.org"
+_TELEGRAM_LIMITS = httpx.Limits(max_keepalive_connections=50, max_connections=100)
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_BOT_METHODS = (
+    "sendMessage",
+    "answerCallbackQuery",
+    "setMyCommands",
+    "setChatMenuButton",
+)
+
+
+def create_telegram_http_client() -> httpx.AsyncClient:
+    """Create the pooled HTTP/2 session shared by the Telegram adapters."""
+    return httpx.AsyncClient(
+        base_url=TELEGRAM_API_URL,
+        transport=httpx.AsyncHTTPTransport(
+            http2=True, limits=_TELEGRAM_LIMITS, retries=1
+        ),
+    )
 
 
 class TelegramClient(Protocol):
     """Interface for Telegram API interactions."""
 
     async def send_message(
-        self, chat_id: int, text: str, reply_markup: dict | None = None
+        self,
+        chat_id: int,
+        text: str,
+        reply_markup: dict | orjson.Fragment | None = None,
     ) -> None:
-        """Send a text message to a Telegram chat."""
+        """Send a text message to a Telegram chat.
+
+        `reply_markup` may be a pre-serialized `orjson.Fragment`, which is
+        embedded in the request body without re-encoding.
+        """
 
     async def answer_callback_query(
         self, callback_query_id: str, text: str | None = None
@@ -28,58 +56,59 @@ class TelegramClient(Protocol):
         """Set the chat menu button."""
 
 
-@dataclass
+@dataclass(slots=True)
 class HttpxTelegramClient:
     """Telegram client implemented with httpx."""
 
     bot_token: str
     http_client: httpx.AsyncClient
+    _method_paths: dict[str, str] = field(init=False, repr=False)
 
-    @classmethod
-    def create(cls, bot_token: str) -> "HttpxTelegramClient":
-        """Create a Telegram client with a managed httpx session."""
-        return cls(bot_token=bot_token, http_client=httpx.AsyncClient())
+    def __post_init__(self) -> None:
+        """Precompute Bot API method paths for this token."""
+        base_path = f"/bot{self.bot_token}"
+        self._method_paths = {
+            method: f"{base_path}/{method}" for method in _BOT_METHODS
+        }
 
     async def send_message(
-        self, chat_id: int, text: str, reply_markup: dict | None = None
+        self,
+        chat_id: int,
+        text: str,
+        reply_markup: dict | orjson.Fragment | None = None,
     ) -> None:
         """Send a message using Telegram's sendMessage API."""
-        url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
         payload: dict[str, object] = {"chat_id": chat_id, "text": text}
         if reply_markup is not None:
             payload["reply_markup"] = reply_markup
-        response = await self.http_client.post(url, json=payload, timeout=10)
-        response.raise_for_status()
+        await self._post("sendMessage", payload)
 
     async def answer_callback_query(
         self, callback_query_id: str, text: str | None = None
     ) -> None:
         """Answer a callback query using Telegram's API."""
-        url = f"https://api.telegram.org/bot{self.bot_token}/answerCallbackQuery"
         payload: dict[str, object] = {"callback_query_id": callback_query_id}
         if text is not None:
             payload["text"] = text
-        response = await self.http_client.post(url, json=payload, timeout=10)
-        response.raise_for_status()
-
-    async def close(self) -> None:
-        """Close the underlying HTTP client session."""
-        await self.http_client.aclose()
+        await self._post("answerCallbackQuery", payload)
 
     async def set_my_commands(self, commands: list[dict[str, str]]) -> None:
         """Set the bot command list."""
-        url = f"https://api.telegram.org/bot{self.bot_token}/setMyCommands"
-        payload: dict[str, object] = {"commands": commands}
-        response = await self.http_client.post(url, json=payload, timeout=10)
-        response.raise_for_status()
+        await self._post("setMyCommands", {"commands": commands})
 
     async def set_chat_menu_button(
         self, menu_button: dict[str, object] | None = None
     ) -> None:
         """Set the chat menu button."""
-        url = f"https://api.telegram.org/bot{self.bot_token}/setChatMenuButton"
-        payload: dict[str, object] = {
-            "menu_button": menu_button or {"type": "commands"}
-        }
-        response = await self.http_client.post(url, json=payload, timeout=10)
+        await self._post(
+            "setChatMenuButton", {"menu_button": menu_button or {"type": "commands"}}
+        )
+
+    async def _post(self, method: str, payload: dict[str, object]) -> None:
+        response = await self.http_client.post(
+            self._method_paths[method],
+            content=orjson.dumps(payload),
+            headers=_JSON_HEADERS,
+            timeout=10,
+        )
         response.raise_for_status()
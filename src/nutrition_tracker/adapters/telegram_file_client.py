@@ -1,46 +1,62 @@
 """Telegram file download client."""
 
-from dataclasses import dataclass
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
 from typing import Protocol
 
 import httpx
 
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
 
 class TelegramFileClient(Protocol):
     """Interface for downloading Telegram files."""
 
+    __slots__ = ()
+
     async def download_file_bytes(self, file_id: str) -> bytes:
         """Download a Telegram file and return its bytes."""
 
+    def download_file_stream(self, file_id: str) -> AsyncIterator[bytes]:
+        """Stream a Telegram file's bytes in chunks."""
+
 
-@dataclass
+@dataclass(slots=True)
 class HttpxTelegramFileClient(TelegramFileClient):
     """Telegram file client using httpx."""
 
     bot_token: str
     http_client: httpx.AsyncClient
+    _get_file_path: str = field(init=False, repr=False)
+    _file_path_prefix: str = field(init=False, repr=False)
 
-    @classmethod
-    def create(cls, bot_token: str) -> "HttpxTelegramFileClient":
-        """Create a Telegram file client with a managed httpx session."""
-        return cls(bot_token=bot_token, http_client=httpx.AsyncClient())
+    def __post_init__(self) -> None:
+        """Precompute file API paths for this token."""
+        self._get_file_path = f"/bot{self.bot_token}/getFile"
+        self._file_path_prefix = f"/file/bot{self.bot_token}/"
 
     async def download_file_bytes(self, file_id: str) -> bytes:
         """Download Telegram file bytes via getFile."""
-        get_file_url = f"https://api.telegram.org/bot{self.bot_token}/getFile"
+        buffer = bytearray()
+        async for chunk in self.download_file_stream(file_id):
+            buffer.extend(chunk)
+        return bytes(buffer)
+
+    async def download_file_stream(self, file_id: str) -> AsyncIterator[bytes]:
+        """Stream Telegram file bytes in chunks via getFile."""
+        download_url = await self._resolve_download_url(file_id)
+        async with self.http_client.stream("GET", download_url, timeout=20) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(_DOWNLOAD_CHUNK_SIZE):
+                yield chunk
+
+    async def _resolve_download_url(self, file_id: str) -> str:
         response = await self.http_client.get(
-            get_file_url, params={"file_id": file_id}, timeout=10
+            self._get_file_path, params={"file_id": file_id}, timeout=10
         )
         response.raise_for_status()
         payload = response.json()
         if not payload.get("ok"):
             raise RuntimeError("Telegram getFile failed")
         file_path = payload["result"]["file_path"]
-        download_url = f"https://api.telegram.org/file/bot{self.bot_token}/{file_path}"
-        file_response = await self.http_client.get(download_url, timeout=20)
-        file_response.raise_for_status()
-        return file_response.content
-
-    async def close(self) -> None:
-        """Close the underlying HTTP session."""
-        await self.http_client.aclose()
+        return self._file_path_prefix + file_path
@@ -2,29 +2,36 @@
 
 from __future__ import annotations
 
+import asyncio
+import gzip
+import hashlib
+import hmac
 from typing import TYPE_CHECKING
 from uuid import UUID  # noqa: TC003
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
+
+from nutrition_tracker.api.responses import OrjsonResponse
 
 if TYPE_CHECKING:
     from nutrition_tracker.containers import AppContainer
 
-router = APIRouter(prefix="/admin", tags=["admin"])
-
-
-def _get_admin_token(request: Request) -> str:
-    container: AppContainer = request.app.state.container
-    return container.settings.admin_token
+router = APIRouter(
+    prefix="/admin", tags=["admin"], default_response_class=OrjsonResponse
+)
 
 
 async def require_admin(
-    x_admin_token: str | None = Header(default=None),
-    admin_token: str = Depends(_get_admin_token),
+    request: Request, x_admin_token: str | None = Header(default=None)
 ) -> None:
     """Ensure requests include a valid admin token."""
-    if not x_admin_token or x_admin_token != admin_token:
+    admin_token: bytes = request.app.state.admin_token
+    if (
+        not x_admin_token
+        or not admin_token
+        or not hmac.compare_digest(x_admin_token.encode(), admin_token)
+    ):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
 
 
@@ -35,37 +42,74 @@ async def admin_health() -> dict[str, str]:
 
 
 @router.get("/users", dependencies=[Depends(require_admin)])
-async def list_users(request: Request) -> dict[str, object]:
+async def list_users(request: Request) -> OrjsonResponse:
     """Return a list of users with usage summaries."""
     container: AppContainer = request.app.state.container
-    return {"users": container.admin_service.list_users()}
+    users = await asyncio.to_thread(container.admin_service.list_users)
+    return OrjsonResponse({"users": users})
 
 
 @router.get("/users/{user_id}", dependencies=[Depends(require_admin)])
-async def user_detail(user_id: UUID, request: Request) -> dict[str, object]:
+async def user_detail(user_id: UUID, request: Request) -> OrjsonResponse:
     """Return a detailed user summary."""
     container: AppContainer = request.app.state.container
-    return container.admin_service.get_user_detail(user_id)
+    return OrjsonResponse(await container.admin_service.get_user_detail(user_id))
 
 
 @router.get("/sessions", dependencies=[Depends(require_admin)])
-async def list_sessions(request: Request, limit: int = 20) -> dict[str, object]:
-    """Return recent photo sessions."""
+async def list_sessions(
+    request: Request, limit: int = 20, offset: int = 0
+) -> OrjsonResponse:
+    """Return a page of recent photo sessions."""
     container: AppContainer = request.app.state.container
-    return {"sessions": container.admin_service.list_sessions(limit)}
+    sessions = await asyncio.to_thread(
+        container.admin_service.list_sessions, limit, offset
+    )
+    return OrjsonResponse({"sessions": sessions})
 
 
 @router.get("/costs", dependencies=[Depends(require_admin)])
-async def list_costs(request: Request, limit: int = 30) -> dict[str, object]:
-    """Return recent model usage entries."""
+async def list_costs(
+    request: Request, limit: int = 30, offset: int = 0
+) -> OrjsonResponse:
+    """Return a page of recent model usage entries."""
     container: AppContainer = request.app.state.container
-    return {"usage": container.admin_service.list_costs(limit)}
+    usage = await asyncio.to_thread(container.admin_service.list_costs, limit, offset)
+    return OrjsonResponse({"usage": usage})
+
+
+@router.get("/overview", dependencies=[Depends(require_admin)])
+async def overview(
+    request: Request, sessions_limit: int = 20, costs_limit: int = 30
+) -> OrjsonResponse:
+    """Return users, sessions and usage in a single response."""
+    container: AppContainer = request.app.state.container
+    service = container.admin_service
+    users, sessions, usage = await asyncio.gather(
+        asyncio.to_thread(service.list_users),
+        asyncio.to_thread(service.list_sessions, sessions_limit),
+        asyncio.to_thread(service.list_costs, costs_limit),
+    )
+    return OrjsonResponse({"users": users, "sessions": sessions, "usage": usage})
 
 
 @router.get("/ui", response_class=HTMLResponse)
-async def admin_ui() -> HTMLResponse:
+async def admin_ui(
+    accept_encoding: str = Header(default=""),
+    if_none_match: str | None = Header(default=None),
+) -> Response:
     """Minimal admin UI that consumes the admin API."""
-    return HTMLResponse(_ADMIN_UI_HTML)
+    headers = {
+        "Cache-Control": "public, max-age=300",
+        "ETag": _ADMIN_UI_ETAG,
+        "Vary": "Accept-Encoding",
+    }
+    if if_none_match == _ADMIN_UI_ETAG:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if "gzip" in accept_encoding:
+        headers["Content-Encoding"] = "gzip"
+        return HTMLResponse(_ADMIN_UI_GZIP, headers=headers)
+    return HTMLResponse(_ADMIN_UI_BYTES, headers=headers)
 
 
 _ADMIN_UI_HTML = """<!doctype html>
@@ -90,27 +134,49 @@ _ADMIN_UI_HTML = """<!doctype html>
       <input id="token" type="password" placeholder="X-Admin-Token" />
     </div>
     <div class="row">
-      <button onclick="loadEndpoint('/admin/users')">Users</button>
-      <button onclick="loadEndpoint('/admin/sessions')">Sessions</button>
-      <button onclick="loadEndpoint('/admin/costs')">Costs</button>
+      <button onclick="showSection('users')">Users</button>
+      <button onclick="showSection('sessions')">Sessions</button>
+      <button onclick="showSection('usage')">Costs</button>
+      <button onclick="refresh()">Refresh</button>
     </div>
     <pre id="output">Ready.</pre>
     <script>
-      async function loadEndpoint(path) {
+      let overview = null;
+
+      async function loadOverview() {
         const token = document.getElementById('token').value;
-        const output = document.getElementById('output');
-        output.textContent = 'Loading...';
-        const res = await fetch(path, {
+        const res = await fetch('/admin/overview', {
           headers: { 'X-Admin-Token': token }
         });
         if (!res.ok) {
-          output.textContent = 'Error: ' + res.status;
-          return;
+          throw new Error('Error: ' + res.status);
+        }
+        return res.json();
+      }
+
+      async function showSection(key) {
+        const output = document.getElementById('output');
+        if (!overview) {
+          output.textContent = 'Loading...';
+          try {
+            overview = await loadOverview();
+          } catch (err) {
+            output.textContent = err.message;
+            return;
+          }
         }
-        const data = await res.json();
-        output.textContent = JSON.stringify(data, null, 2);
+        output.textContent = JSON.stringify({ [key]: overview[key] }, null, 2);
+      }
+
+      function refresh() {
+        overview = null;
+        document.getElementById('output').textContent = 'Ready.';
       }
     </script>
   </body>
 </html>
 """
+
+_ADMIN_UI_BYTES = _ADMIN_UI_HTML.encode()
+_ADMIN_UI_GZIP = gzip.compress(_ADMIN_UI_BYTES, mtime=0)
+_ADMIN_UI_ETAG = f'"{hashlib.sha1(_ADMIN_UI_BYTES, usedforsecurity=False).hexdigest()}"'
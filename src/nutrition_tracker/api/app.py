@@ -1,370 +1,247 @@
 """FastAPI application factory."""
 
+import asyncio
 import logging
-from collections.abc import AsyncIterator
+import os
+import re
+from collections.abc import AsyncIterator, Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from uuid import UUID
 from zoneinfo import ZoneInfo
 
-from fastapi import FastAPI, Request
+import msgspec
+import orjson
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Request, Response, status
 
 from nutrition_tracker.api.admin import router as admin_router
-from nutrition_tracker.api.telegram_models import TelegramPhotoSize, TelegramUpdate
-from nutrition_tracker.app_logging import configure_logging
+from nutrition_tracker.api.telegram_models import (
+    TelegramCallbackQuery,
+    TelegramMessage,
+    TelegramPhotoSize,
+    TelegramUpdate,
+    TelegramUpdateEnvelope,
+    decode_update,
+    decode_update_envelope,
+)
 from nutrition_tracker.config import parse_allowed_user_ids
 from nutrition_tracker.containers import AppContainer
 from nutrition_tracker.domain.library import LibraryFood
 from nutrition_tracker.domain.meals import MealLogDetail, MealLogSummary
 from nutrition_tracker.domain.stats import DailyTotals, MealLogRow
+from nutrition_tracker.services.cache import InMemoryCache
+from nutrition_tracker.services.sessions import TERMINAL_STATUSES
 from nutrition_tracker.services.stats import PeriodSummary
+from nutrition_tracker.services.vision import stream_to_data_url
 from nutrition_tracker.telegram_commands import CHAT_MENU_BUTTON, telegram_commands
 
+_logger = logging.getLogger(__name__)
+_MAX_INFLIGHT_UPDATES = 64
+_SEEN_UPDATES_MAX_ENTRIES = 10_000
+_SEEN_UPDATES_TTL_SECONDS = 3600
+_MAX_TIMEZONE_LENGTH = 64
+_OK_BODY = b'{"status":"ok"}'
+_BLOCKING_CALL_THREADS = min(32, (os.cpu_count() or 1) * 4)
+_UUID_PATTERN = (
+    r"([0-9a-fA-F]{8})-([0-9a-fA-F]{4})-([0-9a-fA-F]{4})-"
+    r"([0-9a-fA-F]{4})-([0-9a-fA-F]{12})"
+)
+_SESSION_CALLBACK_RE = re.compile(rf"{_UUID_PATTERN}:([^:]*)(?::(.*))?")
+_UUID_RE = re.compile(_UUID_PATTERN)
+_format_meal_summary_header = (
+    "Meal saved!\n"
+    "Total: {calories:.0f} kcal, {protein:.1f}P / {fat:.1f}F / {carbs:.1f}C\n"
+    "Items:"
+).format
+_format_meal_summary_item = (
+    "- {name}: {grams:.0f}g — {calories:.0f} kcal "
+    "({protein:.1f}P/{fat:.1f}F/{carbs:.1f}C)"
+).format
+_format_daily_totals_template = (
+    "{label} totals:\n"
+    "Calories: {calories:.0f}\n"
+    "Protein: {protein:.1f} g\n"
+    "Fat: {fat:.1f} g\n"
+    "Carbs: {carbs:.1f} g"
+).format
+_format_period_header = (
+    "{label} averages:\n"
+    "Calories: {calories:.0f}\n"
+    "Protein: {protein:.1f} g\n"
+    "Fat: {fat:.1f} g\n"
+    "Carbs: {carbs:.1f} g\n"
+    "Daily totals:"
+).format
+# Constant keyboards are serialized once and embedded verbatim in the request body.
+_LIBRARY_KEYBOARD = orjson.Fragment(
+    orjson.dumps(
+        {
+            "inline_keyboard": [
+                [{"text": "Add manual entry", "callback_data": "lib:add"}]
+            ]
+        }
+    )
+)
+_HISTORY_DETAIL_KEYBOARD_TEMPLATE = (
+    '{{"inline_keyboard":[[{{"text":"Edit grams","callback_data":"e:{meal_id}"}}]]}}'
+)
+
 
-def create_app(container: AppContainer) -> FastAPI:  # noqa: PLR0915
-    """Create a FastAPI app configured with dependencies."""
-    configure_logging()
-    logger = logging.getLogger(__name__)
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(
+            max_workers=_BLOCKING_CALL_THREADS, thread_name_prefix="blocking"
+        )
+    )
+    try:
+        await app.state.container.telegram_client.set_my_commands(telegram_commands())
+        await app.state.container.telegram_client.set_chat_menu_button(CHAT_MENU_BUTTON)
+    except Exception:
+        _logger.exception("Failed to sync Telegram bot commands")
+    yield
+    await app.state.container.close_resources()
+
+
+def create_app(container: AppContainer) -> FastAPI:
+    """Create a FastAPI app configured with dependencies.
+
+    Serve the app with uvloop and httptools
+    (`uvicorn --loop uvloop --http httptools`); the webhook is almost pure I/O
+    orchestration, so event-loop and parser overhead matter.
+    """
     allowed_user_ids = parse_allowed_user_ids(
         container.settings.telegram_allowed_user_ids
     )
 
-    @asynccontextmanager
-    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
-        try:
-            await app.state.container.telegram_client.set_my_commands(
-                telegram_commands()
-            )
-            await app.state.container.telegram_client.set_chat_menu_button(
-                CHAT_MENU_BUTTON
-            )
-        except Exception:
-            logger.exception("Failed to sync Telegram bot commands")
-        yield
-        await app.state.container.close_resources()
-
-    app = FastAPI(lifespan=lifespan)
+    app = FastAPI(lifespan=_lifespan)
     app.state.container = container
+    app.state.admin_token = container.settings.admin_token.encode()
 
     app.include_router(admin_router)
 
     @app.get("/health")
-    async def health() -> dict[str, str]:
+    async def health() -> Response:
         """Simple health check endpoint."""
-        return {"status": "ok"}
-
-    @app.post("/telegram/webhook")
-    async def telegram_webhook(  # noqa: PLR0911, PLR0912, PLR0915
-        update: TelegramUpdate, request: Request
-    ) -> dict[str, str]:
-        """Handle Telegram webhook updates."""
-        state_container: AppContainer = request.app.state.container
-        user_id = _extract_user_id(update)
-        if user_id is not None and not _is_user_allowed(user_id, allowed_user_ids):
-            if update.callback_query:
-                await state_container.telegram_client.answer_callback_query(
-                    update.callback_query.id,
-                    text="Not authorized.",
-                )
-                return {"status": "ok"}
-            if update.message:
-                await state_container.telegram_client.send_message(
-                    chat_id=update.message.chat.id,
-                    text="This bot is private.",
-                )
-                return {"status": "ok"}
+        return _ok_response()
+
+    async def process_update(
+        update: TelegramUpdate | TelegramUpdateEnvelope,
+        state_container: AppContainer,
+    ) -> None:
+        """Run the bot flow for a single Telegram update."""
+        if isinstance(update, TelegramUpdateEnvelope):
+            await _reject_unauthorized(update, state_container)
+            return
         if update.callback_query:
-            callback = update.callback_query
-            await state_container.telegram_client.answer_callback_query(callback.id)
-            if callback.data:
-                session_callback = _parse_session_callback(callback.data)
-                if session_callback:
-                    session_id, action, payload = session_callback
-                    if action == "save":
-                        session_repository = (
-                            state_container.session_service.session_repository
-                        )
-                        session = session_repository.get_session(session_id)
-                        if session and callback.message:
-                            resolved_items = session.context.get("resolved_items", [])
-                            summary = await state_container.meal_log_service.save_meal(
-                                user_id=session.user_id,
-                                items=(
-                                    resolved_items
-                                    if isinstance(resolved_items, list)
-                                    else []
-                                ),
-                            )
-                            if session.photo_id:
-                                state_container.session_service.photo_repository.delete_photo(
-                                    session.photo_id
-                                )
-                            state_container.session_service.session_repository.update_session(
-                                session_id,
-                                status="COMPLETED",
-                                context=session.context,
-                            )
-                            await state_container.telegram_client.send_message(
-                                chat_id=callback.message.chat.id,
-                                text=_format_meal_summary(summary),
-                            )
-                    else:
-                        prompt = await state_container.session_service.handle_callback(
-                            session_id, action, payload
-                        )
-                        if prompt and callback.message:
-                            await state_container.telegram_client.send_message(
-                                chat_id=callback.message.chat.id,
-                                text=prompt.text,
-                                reply_markup=prompt.reply_markup,
-                            )
-                history_id = _parse_history_callback(callback.data)
-                if history_id and callback.message:
-                    detail = state_container.meal_log_service.get_meal_detail(
-                        history_id
-                    )
-                    if detail:
-                        await state_container.telegram_client.send_message(
-                            chat_id=callback.message.chat.id,
-                            text=_format_meal_detail(detail),
-                            reply_markup=_history_detail_keyboard(history_id),
-                        )
-                edit_id = _parse_edit_callback(callback.data)
-                if edit_id and callback.message:
-                    user = state_container.user_service.ensure_user(
-                        callback.from_user.id
-                    )
-                    session_repo = state_container.session_service.session_repository
-                    active = session_repo.get_active_session(user.id)
-                    if active and active.status not in {"COMPLETED", "CANCELLED"}:
-                        await state_container.telegram_client.send_message(
-                            chat_id=callback.message.chat.id,
-                            text=(
-                                "You already have an active session. "
-                                "Send /cancel to stop it."
-                            ),
-                        )
-                        return {"status": "ok"}
-                    prompt = state_container.session_service.start_edit_session(
-                        user.id, edit_id
-                    )
-                    if prompt:
-                        await state_container.telegram_client.send_message(
-                            chat_id=callback.message.chat.id,
-                            text=prompt.text,
-                            reply_markup=prompt.reply_markup,
-                        )
-                library_action = _parse_library_callback(callback.data)
-                if library_action == "add" and callback.message:
-                    user = state_container.user_service.ensure_user(
-                        callback.from_user.id
-                    )
-                    session_repo = state_container.session_service.session_repository
-                    active = session_repo.get_active_session(user.id)
-                    if active and active.status not in {"COMPLETED", "CANCELLED"}:
-                        await state_container.telegram_client.send_message(
-                            chat_id=callback.message.chat.id,
-                            text=(
-                                "You already have an active session. "
-                                "Send /cancel to stop it."
-                            ),
-                        )
-                        return {"status": "ok"}
-                    prompt = state_container.session_service.start_library_add_session(
-                        user.id
-                    )
-                    await state_container.telegram_client.send_message(
-                        chat_id=callback.message.chat.id, text=prompt.text
-                    )
-            return {"status": "ok"}
-
+            await _handle_callback(update.callback_query, state_container)
+            return
         message = update.message
-        if message and message.text and message.text.startswith("/start"):
-            await state_container.start_command_handler.handle(
-                telegram_user_id=message.from_user.id,
-                chat_id=message.chat.id,
-            )
-            return {"status": "ok"}
-
-        if message and message.text in {"/today", "/week", "/month", "/history"}:
-            user = state_container.user_service.ensure_user(message.from_user.id)
-            timezone = state_container.user_settings_service.get_timezone(user.id)
-            if message.text == "/today":
-                daily, logs = state_container.stats_service.get_today_with_logs(
-                    user.id, timezone
-                )
-                await state_container.telegram_client.send_message(
-                    chat_id=message.chat.id,
-                    text=_format_daily_with_logs("Today", daily, logs),
-                )
-            elif message.text == "/week":
-                summary = state_container.stats_service.get_week(user.id, timezone)
-                await state_container.telegram_client.send_message(
-                    chat_id=message.chat.id,
-                    text=_format_period_summary("This week", summary),
-                )
-            elif message.text == "/month":
-                summary = state_container.stats_service.get_month(user.id, timezone)
-                await state_container.telegram_client.send_message(
-                    chat_id=message.chat.id,
-                    text=_format_period_summary("This month", summary),
-                )
-            else:
-                history = state_container.stats_service.get_history(user.id, limit=10)
-                await state_container.telegram_client.send_message(
-                    chat_id=message.chat.id,
-                    text=_format_history(history),
-                    reply_markup=_history_keyboard(history),
-                )
-            return {"status": "ok"}
-
-        if message and message.text == "/library":
-            user = state_container.user_service.ensure_user(message.from_user.id)
-            session_repo = state_container.session_service.session_repository
-            active = session_repo.get_active_session(user.id)
-            if active and active.status not in {"COMPLETED", "CANCELLED"}:
-                await state_container.telegram_client.send_message(
-                    chat_id=message.chat.id,
-                    text="You already have an active session. Send /cancel to stop it.",
-                )
-                return {"status": "ok"}
-            foods = state_container.library_service.search(user.id, None, limit=5)
-            await state_container.telegram_client.send_message(
-                chat_id=message.chat.id,
-                text=_format_library(foods),
-                reply_markup=_library_keyboard(),
+        if message is None:
+            return
+        handler = _message_handler(message)
+        if handler:
+            await handler(message, state_container)
+
+    update_slots = asyncio.Semaphore(_MAX_INFLIGHT_UPDATES)
+    seen_updates = InMemoryCache(max_entries=_SEEN_UPDATES_MAX_ENTRIES)
+    running_updates = 0
+
+    async def run_update(
+        update: TelegramUpdate | TelegramUpdateEnvelope,
+        state_container: AppContainer,
+    ) -> None:
+        nonlocal running_updates
+        running_updates += 1
+        try:
+            await process_update(update, state_container)
+        except Exception:
+            _logger.exception(
+                "Failed to process Telegram update",
+                extra={"update_id": update.update_id},
             )
-            return {"status": "ok"}
-
-        if message and message.text == "/cancel":
-            user = state_container.user_service.ensure_user(message.from_user.id)
-            prompt = state_container.session_service.cancel_active_session(user.id)
-            if prompt:
-                await state_container.telegram_client.send_message(
-                    chat_id=message.chat.id, text=prompt.text
-                )
-            else:
-                await state_container.telegram_client.send_message(
-                    chat_id=message.chat.id, text="No active session to cancel."
-                )
-            return {"status": "ok"}
-
-        if message and message.photo:
-            user = state_container.user_service.ensure_user(message.from_user.id)
-            session_repo = state_container.session_service.session_repository
-            active = session_repo.get_active_session(user.id)
-            if active and active.status not in {"COMPLETED", "CANCELLED"}:
-                await state_container.telegram_client.send_message(
-                    chat_id=message.chat.id,
-                    text="You already have an active session. Send /cancel to stop it.",
-                )
-                return {"status": "ok"}
-            photo = _select_largest_photo(message.photo)
-            try:
-                image_bytes = (
-                    await state_container.telegram_file_client.download_file_bytes(
-                        photo.file_id
-                    )
-                )
-            except Exception as exc:
-                logger.exception(
-                    "Failed to download Telegram photo",
-                    extra={"file_id": photo.file_id},
-                )
-                await state_container.telegram_client.send_message(
-                    chat_id=message.chat.id,
-                    text=_format_photo_error(
-                        state_container, exc, "Couldn't download that photo."
-                    ),
-                )
-                return {"status": "ok"}
+        finally:
+            running_updates -= 1
+            update_slots.release()
+        if running_updates == 0:
+            await _flush_last_active(state_container)
 
-            try:
-                vision_result = await state_container.vision_service.extract(
-                    image_bytes
-                )
-            except Exception as exc:
-                logger.exception(
-                    "Vision extraction failed",
-                    extra={"file_id": photo.file_id},
-                )
-                await state_container.telegram_client.send_message(
-                    chat_id=message.chat.id,
-                    text=_format_photo_error(
-                        state_container,
-                        exc,
-                        (
-                            "Sorry, I couldn't analyze that photo. "
-                            "Please try a clearer shot."
-                        ),
-                    ),
-                )
-                return {"status": "ok"}
-
-            try:
-                vision_items = [item.model_dump() for item in vision_result.items]
-                _, prompt = await state_container.session_service.start_session(
-                    user_id=user.id,
-                    telegram_chat_id=message.chat.id,
-                    telegram_message_id=message.message_id,
-                    telegram_file_id=photo.file_id,
-                    telegram_file_unique_id=photo.file_unique_id,
-                    vision_items=vision_items,
-                )
-                await state_container.telegram_client.send_message(
-                    chat_id=message.chat.id,
-                    text=prompt.text,
-                    reply_markup=prompt.reply_markup,
-                )
-            except Exception as exc:
-                logger.exception("Failed to start session", extra={"user_id": user.id})
-                await state_container.telegram_client.send_message(
-                    chat_id=message.chat.id,
-                    text=_format_photo_error(
-                        state_container,
-                        exc,
-                        ("Sorry, I couldn't start a meal session. Please try again."),
-                    ),
-                )
-            return {"status": "ok"}
-
-        if message and message.text:
-            user = state_container.user_service.ensure_user(message.from_user.id)
-            prompt = await state_container.session_service.handle_text(
-                user.id, message.text
-            )
-            if prompt:
-                await state_container.telegram_client.send_message(
-                    chat_id=message.chat.id,
-                    text=prompt.text,
-                    reply_markup=prompt.reply_markup,
-                )
-                return {"status": "ok"}
-            if not state_container.user_settings_service.is_timezone_set(user.id):
-                timezone = message.text.strip()
-                if _is_valid_timezone(timezone):
-                    state_container.user_settings_service.set_timezone(
-                        user.id, timezone
-                    )
-                    await state_container.telegram_client.send_message(
-                        chat_id=message.chat.id,
-                        text=f"Timezone saved: {timezone}.",
-                    )
-                else:
-                    await state_container.telegram_client.send_message(
-                        chat_id=message.chat.id,
-                        text=("Please send a valid timezone like America/Los_Angeles."),
-                    )
-        return {"status": "ok"}
+    @app.post("/telegram/webhook")
+    async def telegram_webhook(
+        request: Request, background_tasks: BackgroundTasks
+    ) -> Response:
+        """Acknowledge a Telegram update and process it after responding."""
+        try:
+            update = _decode_for_sender(await request.body(), allowed_user_ids)
+        except msgspec.DecodeError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+            ) from exc
+        if update_slots.locked():
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+        if _first_delivery(seen_updates, update.update_id):
+            await update_slots.acquire()
+            background_tasks.add_task(run_update, update, request.app.state.container)
+        return _ok_response()
 
     return app
 
 
+def _decode_for_sender(
+    body: bytes, allowed: frozenset[int] | None
+) -> TelegramUpdate | TelegramUpdateEnvelope:
+    """Decode the full update only when its sender is allowed.
+
+    Updates from other senders stop at the envelope, which carries just enough
+    to reply, so their message content and photo arrays are never validated.
+    """
+    if allowed is None:
+        return decode_update(body)
+    envelope = decode_update_envelope(body)
+    user_id = _extract_user_id(envelope)
+    if user_id is None or _is_user_allowed(user_id, allowed):
+        return decode_update(body)
+    return envelope
+
+
+async def _flush_last_active(container: AppContainer) -> None:
+    """Write buffered last-active bumps once no update is in flight.
+
+    Serverless instances can be frozen without running the lifespan shutdown,
+    so the tail of each burst is flushed here instead of waiting for close.
+    """
+    try:
+        await asyncio.to_thread(container.user_service.flush_last_active)
+    except Exception:
+        _logger.exception("Failed to flush last active timestamps")
+
+
+def _first_delivery(seen_updates: InMemoryCache, update_id: int) -> bool:
+    """Record an update id and return False if Telegram already delivered it."""
+    key = f"update:{update_id}"
+    if seen_updates.get(key) is not None:
+        return False
+    seen_updates.set(key, True, ttl_seconds=_SEEN_UPDATES_TTL_SECONDS)
+    return True
+
+
+def _ok_response() -> Response:
+    """Return the pre-encoded ok body.
+
+    A fresh Response is built per call because FastAPI attaches the request's
+    background tasks to the returned instance.
+    """
+    return Response(content=_OK_BODY, media_type="application/json")
+
+
 def _select_largest_photo(photos: list[TelegramPhotoSize]) -> TelegramPhotoSize:
     """Select the largest photo size from the Telegram payload."""
-    return max(photos, key=lambda photo: (photo.width * photo.height))
+    # The Bot API sends the available sizes in ascending order.
+    return photos[-1]
 
 
-def _extract_user_id(update: TelegramUpdate) -> int | None:
+def _extract_user_id(update: TelegramUpdateEnvelope) -> int | None:
     """Extract Telegram user id from update, if present."""
     if update.callback_query:
         return update.callback_query.from_user.id
@@ -373,7 +250,7 @@ def _extract_user_id(update: TelegramUpdate) -> int | None:
     return None
 
 
-def _is_user_allowed(user_id: int, allowed: set[int] | None) -> bool:
+def _is_user_allowed(user_id: int, allowed: frozenset[int] | None) -> bool:
     """Return true when the user is allowed to interact with the bot."""
     return allowed is None or user_id in allowed
 
@@ -389,74 +266,454 @@ def _format_photo_error(
     return fallback
 
 
-def _parse_session_callback(data: str) -> tuple[UUID, str, str | None] | None:
-    """Parse callback data in the format s:<uuid>:<action>[:payload]."""
-    if not data.startswith("s:"):
-        return None
-    parts = data.split(":", maxsplit=3)
-    if len(parts) not in {3, 4}:
-        return None
-    _, session_id, action, *rest = parts
-    payload = rest[0] if rest else None
-    try:
-        return UUID(session_id), action, payload
-    except ValueError:
-        return None
+async def _reject_unauthorized(
+    update: TelegramUpdateEnvelope, container: AppContainer
+) -> None:
+    if update.callback_query:
+        await container.telegram_client.answer_callback_query(
+            update.callback_query.id,
+            text="Not authorized.",
+        )
+    elif update.message:
+        await container.telegram_client.send_message(
+            chat_id=update.message.chat.id,
+            text="This bot is private.",
+        )
 
 
-def _parse_history_callback(data: str) -> UUID | None:
-    if not data.startswith("h:"):
-        return None
-    _, raw_id = data.split(":", maxsplit=1)
+async def _handle_callback(
+    callback: TelegramCallbackQuery, container: AppContainer
+) -> None:
+    await asyncio.gather(
+        container.telegram_client.answer_callback_query(callback.id),
+        _route_callback(callback, container),
+    )
+
+
+async def _route_callback(
+    callback: TelegramCallbackQuery, container: AppContainer
+) -> None:
+    if not callback.data:
+        return
+    prefix, _, rest = callback.data.partition(":")
+    handler = _CALLBACK_HANDLERS.get(prefix)
+    if handler:
+        await handler(rest, callback, container)
+
+
+async def _on_session_callback(
+    rest: str, callback: TelegramCallbackQuery, container: AppContainer
+) -> None:
+    session_callback = _parse_session_callback(rest)
+    if session_callback:
+        await _handle_session_callback(callback, container, *session_callback)
+
+
+async def _on_history_callback(
+    rest: str, callback: TelegramCallbackQuery, container: AppContainer
+) -> None:
+    meal_log_id = _parse_uuid(rest)
+    if meal_log_id and callback.message:
+        await _send_meal_detail(container, callback.message.chat.id, meal_log_id)
+
+
+async def _on_edit_callback(
+    rest: str, callback: TelegramCallbackQuery, container: AppContainer
+) -> None:
+    meal_log_id = _parse_uuid(rest)
+    if meal_log_id and callback.message:
+        await _start_edit(container, callback, meal_log_id)
+
+
+async def _on_library_callback(
+    rest: str, callback: TelegramCallbackQuery, container: AppContainer
+) -> None:
+    if rest == "add" and callback.message:
+        await _start_library_add(container, callback)
+
+
+async def _handle_session_callback(
+    callback: TelegramCallbackQuery,
+    container: AppContainer,
+    session_id: UUID,
+    action: str,
+    payload: str | None,
+) -> None:
+    if action != "save":
+        prompt = await container.session_service.handle_callback(
+            session_id, action, payload
+        )
+        if prompt and callback.message:
+            await container.telegram_client.send_message(
+                chat_id=callback.message.chat.id,
+                text=prompt.text,
+                reply_markup=prompt.reply_markup,
+            )
+        return
+    if not callback.message:
+        return
+    summary = await container.session_service.save_session(session_id)
+    if summary is None:
+        return
+    await container.telegram_client.send_message(
+        chat_id=callback.message.chat.id, text=_format_meal_summary(summary)
+    )
+
+
+async def _send_meal_detail(
+    container: AppContainer, chat_id: int, meal_log_id: UUID
+) -> None:
+    detail = await asyncio.to_thread(
+        container.meal_log_service.get_meal_detail, meal_log_id
+    )
+    if detail:
+        await container.telegram_client.send_message(
+            chat_id=chat_id,
+            text=_format_meal_detail(detail),
+            reply_markup=_history_detail_keyboard(meal_log_id),
+        )
+
+
+async def _start_edit(
+    container: AppContainer, callback: TelegramCallbackQuery, meal_log_id: UUID
+) -> None:
+    chat_id = callback.message.chat.id
+    user = await asyncio.to_thread(
+        container.user_service.ensure_user, callback.from_user.id
+    )
+    if await _reject_if_session_open(container, chat_id, user.id):
+        return
+    prompt = await container.session_service.start_edit_session(user.id, meal_log_id)
+    if prompt:
+        await container.telegram_client.send_message(
+            chat_id=chat_id, text=prompt.text, reply_markup=prompt.reply_markup
+        )
+
+
+async def _start_library_add(
+    container: AppContainer, callback: TelegramCallbackQuery
+) -> None:
+    chat_id = callback.message.chat.id
+    user = await asyncio.to_thread(
+        container.user_service.ensure_user, callback.from_user.id
+    )
+    if await _reject_if_session_open(container, chat_id, user.id):
+        return
+    prompt = await container.session_service.start_library_add_session(user.id)
+    if prompt:
+        await container.telegram_client.send_message(chat_id=chat_id, text=prompt.text)
+
+
+async def _reject_if_session_open(
+    container: AppContainer, chat_id: int, user_id: UUID
+) -> bool:
+    """Tell the user to cancel first when they already have an open session."""
+    active = await asyncio.to_thread(
+        container.session_service.session_repository.get_active_session, user_id
+    )
+    if active and active.status not in TERMINAL_STATUSES:
+        await container.telegram_client.send_message(
+            chat_id=chat_id,
+            text="You already have an active session. Send /cancel to stop it.",
+        )
+        return True
+    return False
+
+
+async def _handle_start(message: TelegramMessage, container: AppContainer) -> None:
+    await container.start_command_handler.handle(
+        telegram_user_id=message.from_user.id,
+        chat_id=message.chat.id,
+    )
+
+
+async def _handle_stats(message: TelegramMessage, container: AppContainer) -> None:
+    user = await asyncio.to_thread(
+        container.user_service.ensure_user, message.from_user.id
+    )
+    timezone = await asyncio.to_thread(
+        container.user_settings_service.get_timezone, user.id
+    )
+    await _STATS_COMMANDS[message.text](container, message.chat.id, user.id, timezone)
+
+
+async def _handle_library(message: TelegramMessage, container: AppContainer) -> None:
+    chat_id = message.chat.id
+    user = await asyncio.to_thread(
+        container.user_service.ensure_user, message.from_user.id
+    )
+    if await _reject_if_session_open(container, chat_id, user.id):
+        return
+    foods = await asyncio.to_thread(
+        container.library_service.search, user.id, None, limit=5
+    )
+    await container.telegram_client.send_message(
+        chat_id=chat_id,
+        text=_format_library(foods),
+        reply_markup=_LIBRARY_KEYBOARD,
+    )
+
+
+async def _handle_cancel(message: TelegramMessage, container: AppContainer) -> None:
+    user = await asyncio.to_thread(
+        container.user_service.ensure_user, message.from_user.id
+    )
+    prompt = await container.session_service.cancel_active_session(user.id)
+    await container.telegram_client.send_message(
+        chat_id=message.chat.id,
+        text=prompt.text if prompt else "No active session to cancel.",
+    )
+
+
+async def _handle_photo(message: TelegramMessage, container: AppContainer) -> None:
+    chat_id = message.chat.id
+    telegram_client = container.telegram_client
+    photo = _select_largest_photo(message.photo)
+    download = asyncio.create_task(
+        stream_to_data_url(
+            container.telegram_file_client.download_file_stream(photo.file_id)
+        )
+    )
     try:
-        return UUID(raw_id)
-    except ValueError:
-        return None
+        user = await asyncio.to_thread(
+            container.user_service.ensure_user, message.from_user.id
+        )
+        session_open = await _reject_if_session_open(container, chat_id, user.id)
+    except BaseException:
+        download.cancel()
+        raise
+    if session_open:
+        download.cancel()
+        return
+    try:
+        image_data_url = await download
+    except Exception as exc:
+        _logger.exception(
+            "Failed to download Telegram photo",
+            extra={"file_id": photo.file_id},
+        )
+        await telegram_client.send_message(
+            chat_id=chat_id,
+            text=_format_photo_error(container, exc, "Couldn't download that photo."),
+        )
+        return
 
+    try:
+        vision_result = await container.vision_service.extract_data_url(image_data_url)
+    except Exception as exc:
+        _logger.exception(
+            "Vision extraction failed",
+            extra={"file_id": photo.file_id},
+        )
+        await telegram_client.send_message(
+            chat_id=chat_id,
+            text=_format_photo_error(
+                container,
+                exc,
+                "Sorry, I couldn't analyze that photo. Please try a clearer shot.",
+            ),
+        )
+        return
 
-def _parse_edit_callback(data: str) -> UUID | None:
-    if not data.startswith("e:"):
-        return None
-    _, raw_id = data.split(":", maxsplit=1)
     try:
-        return UUID(raw_id)
-    except ValueError:
-        return None
+        vision_items = [item.model_dump() for item in vision_result.items]
+        _, prompt = await container.session_service.start_session(
+            user_id=user.id,
+            telegram_chat_id=chat_id,
+            telegram_message_id=message.message_id,
+            telegram_file_id=photo.file_id,
+            telegram_file_unique_id=photo.file_unique_id,
+            vision_items=vision_items,
+        )
+        await telegram_client.send_message(
+            chat_id=chat_id,
+            text=prompt.text,
+            reply_markup=prompt.reply_markup,
+        )
+    except Exception as exc:
+        _logger.exception("Failed to start session", extra={"user_id": user.id})
+        await telegram_client.send_message(
+            chat_id=chat_id,
+            text=_format_photo_error(
+                container,
+                exc,
+                "Sorry, I couldn't start a meal session. Please try again.",
+            ),
+        )
+
+
+async def _handle_text(message: TelegramMessage, container: AppContainer) -> None:
+    chat_id = message.chat.id
+    telegram_client = container.telegram_client
+    user_settings_service = container.user_settings_service
+    user = await asyncio.to_thread(
+        container.user_service.ensure_user, message.from_user.id
+    )
+    prompt = await container.session_service.handle_text(user.id, message.text)
+    if prompt:
+        await telegram_client.send_message(
+            chat_id=chat_id,
+            text=prompt.text,
+            reply_markup=prompt.reply_markup,
+        )
+        return
+    timezone_set = await asyncio.to_thread(
+        user_settings_service.is_timezone_set, user.id
+    )
+    if timezone_set:
+        return
+    timezone = message.text.strip()
+    if _is_valid_timezone(timezone):
+        await asyncio.to_thread(user_settings_service.set_timezone, user.id, timezone)
+        await telegram_client.send_message(
+            chat_id=chat_id, text=f"Timezone saved: {timezone}."
+        )
+    else:
+        await telegram_client.send_message(
+            chat_id=chat_id,
+            text="Please send a valid timezone like America/Los_Angeles.",
+        )
+
+
+async def _send_today(
+    container: AppContainer, chat_id: int, user_id: UUID, timezone: str
+) -> None:
+    daily, logs = await asyncio.to_thread(
+        container.stats_service.get_today_with_logs, user_id, timezone
+    )
+    await container.telegram_client.send_message(
+        chat_id=chat_id, text=_format_daily_with_logs("Today", daily, logs)
+    )
+
+
+async def _send_week(
+    container: AppContainer, chat_id: int, user_id: UUID, timezone: str
+) -> None:
+    summary = await asyncio.to_thread(
+        container.stats_service.get_week, user_id, timezone
+    )
+    await container.telegram_client.send_message(
+        chat_id=chat_id, text=_format_period_summary("This week", summary)
+    )
+
+
+async def _send_month(
+    container: AppContainer, chat_id: int, user_id: UUID, timezone: str
+) -> None:
+    summary = await asyncio.to_thread(
+        container.stats_service.get_month, user_id, timezone
+    )
+    await container.telegram_client.send_message(
+        chat_id=chat_id, text=_format_period_summary("This month", summary)
+    )
 
 
-def _parse_library_callback(data: str) -> str | None:
-    if not data.startswith("lib:"):
+async def _send_history(
+    container: AppContainer, chat_id: int, user_id: UUID, _timezone: str
+) -> None:
+    history = await asyncio.to_thread(
+        container.stats_service.get_history, user_id, limit=10
+    )
+    await container.telegram_client.send_message(
+        chat_id=chat_id,
+        text=_format_history(history),
+        reply_markup=_history_keyboard(history),
+    )
+
+
+_STATS_COMMANDS: dict[
+    str | None, Callable[[AppContainer, int, UUID, str], Awaitable[None]]
+] = {
+    "/today": _send_today,
+    "/week": _send_week,
+    "/month": _send_month,
+    "/history": _send_history,
+}
+_CALLBACK_HANDLERS: dict[
+    str, Callable[[str, TelegramCallbackQuery, AppContainer], Awaitable[None]]
+] = {
+    "s": _on_session_callback,
+    "h": _on_history_callback,
+    "e": _on_edit_callback,
+    "lib": _on_library_callback,
+}
+_COMMAND_HANDLERS: dict[
+    str, Callable[[TelegramMessage, AppContainer], Awaitable[None]]
+] = {
+    **dict.fromkeys(_STATS_COMMANDS, _handle_stats),
+    "/library": _handle_library,
+    "/cancel": _handle_cancel,
+}
+
+
+def _message_handler(
+    message: TelegramMessage,
+) -> Callable[[TelegramMessage, AppContainer], Awaitable[None]] | None:
+    """Return the handler for a message, or None to ignore it."""
+    text = message.text
+    if text:
+        handler = _COMMAND_HANDLERS.get(text)
+        if handler:
+            return handler
+        if text.startswith("/start"):
+            return _handle_start
+    if message.photo:
+        return _handle_photo
+    return _handle_text if text else None
+
+
+def _parse_session_callback(data: str) -> tuple[UUID, str, str | None] | None:
+    """Parse session callback data in the format <uuid>:<action>[:payload]."""
+    match = _SESSION_CALLBACK_RE.fullmatch(data)
+    if match is None:
         return None
-    _, action = data.split(":", maxsplit=1)
-    return action
+    return _uuid_from_match(match), match[6], match[7]
+
+
+def _parse_uuid(data: str) -> UUID | None:
+    match = _UUID_RE.fullmatch(data)
+    return _uuid_from_match(match) if match else None
+
+
+def _uuid_from_match(match: re.Match[str]) -> UUID:
+    """Build a UUID from pre-validated hex groups, skipping UUID's parser."""
+    return UUID(int=int("".join(match.group(1, 2, 3, 4, 5)), 16))
 
 
 def _format_meal_summary(summary: MealLogSummary) -> str:
     """Format a meal summary for Telegram messages."""
-    lines = [
-        "Meal saved!",
-        f"Total: {summary.total_calories:.0f} kcal, "
-        f"{summary.total_protein_g:.1f}P / "
-        f"{summary.total_fat_g:.1f}F / "
-        f"{summary.total_carbs_g:.1f}C",
-        "Items:",
-    ]
-    for item in summary.items:
-        lines.append(
-            f"- {item.name}: {item.grams:.0f}g — {item.calories:.0f} kcal "
-            f"({item.protein_g:.1f}P/{item.fat_g:.1f}F/{item.carbs_g:.1f}C)"
+    header = _format_meal_summary_header(
+        calories=summary.total_calories,
+        protein=summary.total_protein_g,
+        fat=summary.total_fat_g,
+        carbs=summary.total_carbs_g,
+    )
+    return "\n".join(
+        (
+            header,
+            *(
+                _format_meal_summary_item(
+                    name=item.name,
+                    grams=item.grams,
+                    calories=item.calories,
+                    protein=item.protein_g,
+                    fat=item.fat_g,
+                    carbs=item.carbs_g,
+                )
+                for item in summary.items
+            ),
         )
-    return "\n".join(lines)
+    )
 
 
 def _format_daily_totals(label: str, totals: DailyTotals) -> str:
     """Format daily totals for Telegram."""
-    return (
-        f"{label} totals:\\n"
-        f"Calories: {totals.calories:.0f}\\n"
-        f"Protein: {totals.protein_g:.1f} g\\n"
-        f"Fat: {totals.fat_g:.1f} g\\n"
-        f"Carbs: {totals.carbs_g:.1f} g"
+    return _format_daily_totals_template(
+        label=label,
+        calories=totals.calories,
+        protein=totals.protein_g,
+        fat=totals.fat_g,
+        carbs=totals.carbs_g,
     )
 
 
@@ -464,51 +721,59 @@ def _format_daily_with_logs(
     label: str, totals: DailyTotals, logs: list[MealLogRow]
 ) -> str:
     """Format daily totals with per-meal list."""
-    lines = [
-        _format_daily_totals(label, totals),
-    ]
-    if logs:
-        lines.append("Meals:")
-        for log in logs:
-            lines.append(
-                f"- {log.logged_at.time().strftime('%H:%M')}: "
-                f"{log.total_calories:.0f} kcal"
-            )
-    return "\n".join(lines)
+    totals_text = _format_daily_totals(label, totals)
+    if not logs:
+        return totals_text
+    return "\n".join(
+        (
+            totals_text,
+            "Meals:",
+            *(
+                f"- {log.logged_at:%H:%M}: {log.total_calories:.0f} kcal"
+                for log in logs
+            ),
+        )
+    )
 
 
 def _format_period_summary(label: str, summary: PeriodSummary) -> str:
     """Format weekly or monthly totals."""
-    lines = [
-        f"{label} averages:",
-        f"Calories: {summary.avg_calories:.0f}",
-        f"Protein: {summary.avg_protein_g:.1f} g",
-        f"Fat: {summary.avg_fat_g:.1f} g",
-        f"Carbs: {summary.avg_carbs_g:.1f} g",
-        "Daily totals:",
-    ]
-    for day in summary.daily:
-        lines.append(f"- {day.day}: {day.calories:.0f} kcal")
-    return "\n".join(lines)
+    header = _format_period_header(
+        label=label,
+        calories=summary.avg_calories,
+        protein=summary.avg_protein_g,
+        fat=summary.avg_fat_g,
+        carbs=summary.avg_carbs_g,
+    )
+    return "\n".join(
+        (header, *(f"- {day.day}: {day.calories:.0f} kcal" for day in summary.daily))
+    )
 
 
 def _format_history(history: list[MealLogRow]) -> str:
     """Format recent meal history for Telegram."""
     if not history:
         return "No recent meals logged."
-    lines = ["Recent meals:"]
-    for entry in history:
-        lines.append(f"- {entry.logged_at.date()}: {entry.total_calories:.0f} kcal")
-    return "\n".join(lines)
+    return "\n".join(
+        (
+            "Recent meals:",
+            *(
+                f"- {entry.logged_at.date()}: {entry.total_calories:.0f} kcal"
+                for entry in history
+            ),
+        )
+    )
 
 
 def _format_library(foods: list[LibraryFood]) -> str:
     if not foods:
         return "Your library is empty. Add a manual entry to get started."
-    lines = ["Your top foods:"]
-    for food in foods:
-        lines.append(f"- {food.name} ({food.calories:.0f} kcal per 100g)")
-    return "\n".join(lines)
+    return "\n".join(
+        (
+            "Your top foods:",
+            *(f"- {food.name} ({food.calories:.0f} kcal per 100g)" for food in foods),
+        )
+    )
 
 
 def _history_keyboard(history: list[MealLogRow]) -> dict | None:
@@ -527,33 +792,32 @@ def _history_keyboard(history: list[MealLogRow]) -> dict | None:
     }
 
 
-def _history_detail_keyboard(meal_id: UUID) -> dict:
-    return {
-        "inline_keyboard": [[{"text": "Edit grams", "callback_data": f"e:{meal_id}"}]]
-    }
-
-
-def _library_keyboard() -> dict:
-    return {
-        "inline_keyboard": [[{"text": "Add manual entry", "callback_data": "lib:add"}]]
-    }
+def _history_detail_keyboard(meal_id: UUID) -> orjson.Fragment:
+    return orjson.Fragment(_HISTORY_DETAIL_KEYBOARD_TEMPLATE.format(meal_id=meal_id))
 
 
 def _format_meal_detail(detail: MealLogDetail) -> str:
-    lines = [
-        f"Meal: {detail.total_calories:.0f} kcal",
-        "Items:",
-    ]
-    for item in detail.items:
-        lines.append(f"- {item.name}: {item.grams:.0f}g — {item.calories:.0f} kcal")
-    return "\n".join(lines)
+    return "\n".join(
+        (
+            f"Meal: {detail.total_calories:.0f} kcal",
+            "Items:",
+            *(
+                f"- {item.name}: {item.grams:.0f}g — {item.calories:.0f} kcal"
+                for item in detail.items
+            ),
+        )
+    )
 
 
 def _history_button_label(entry: MealLogRow) -> str:
     return f"{entry.logged_at.date()} — {entry.total_calories:.0f} kcal"
 
 
+@lru_cache(maxsize=512)
 def _is_valid_timezone(value: str) -> bool:
+    """Check an IANA zone name, remembering results to skip repeat tzdata reads."""
+    if not value or len(value) > _MAX_TIMEZONE_LENGTH:
+        return False
     try:
         ZoneInfo(value)
     except Exception:
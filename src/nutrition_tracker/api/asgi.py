@@ -1,6 +1,9 @@
 """ASGI entrypoint for the nutrition tracker API."""
 
 from nutrition_tracker.api.app import create_app
+from nutrition_tracker.app_logging import configure_logging
 from nutrition_tracker.containers import build_container
 
-app = create_app(build_container())
+_container = build_container()
+configure_logging(_container.settings.log_level.upper())
+app = create_app(_container)
@@ -0,0 +1,14 @@
+"""Shared HTTP response classes."""
+
+import orjson
+from fastapi.responses import Response
+
+
+class OrjsonResponse(Response):
+    """JSON response rendered with orjson."""
+
+    media_type = "application/json"
+
+    def render(self, content: object) -> bytes:
+        """Serialize content to JSON bytes."""
+        return orjson.dumps(content)
@@ -1,63 +1,102 @@
-"""Pydantic models for Telegram webhook payloads."""
+"""msgspec models for Telegram webhook payloads.
 
-from pydantic import BaseModel, Field
+Only the fields the bot reads are declared; msgspec skips the rest while decoding.
+"""
 
+import msgspec
 
-class TelegramUser(BaseModel):
+
+class TelegramUser(msgspec.Struct, frozen=True):
     """Telegram user payload."""
 
     id: int
-    is_bot: bool | None = None
-    first_name: str | None = None
-    last_name: str | None = None
-    username: str | None = None
-    language_code: str | None = None
 
 
-class TelegramChat(BaseModel):
+class TelegramChat(msgspec.Struct, frozen=True):
     """Telegram chat payload."""
 
     id: int
     type: str
-    title: str | None = None
-    username: str | None = None
-    first_name: str | None = None
-    last_name: str | None = None
 
 
-class TelegramPhotoSize(BaseModel):
+class TelegramPhotoSize(msgspec.Struct, frozen=True):
     """Telegram photo size payload."""
 
     file_id: str
     file_unique_id: str
     width: int
     height: int
-    file_size: int | None = None
 
 
-class TelegramMessage(BaseModel):
+class TelegramMessage(msgspec.Struct, frozen=True):
     """Telegram message payload."""
 
     message_id: int
     date: int
     chat: TelegramChat
-    from_user: TelegramUser = Field(alias="from")
+    from_user: TelegramUser = msgspec.field(name="from")
     text: str | None = None
     photo: list[TelegramPhotoSize] | None = None
 
 
-class TelegramCallbackQuery(BaseModel):
+class TelegramCallbackQuery(msgspec.Struct, frozen=True):
     """Telegram callback query payload."""
 
     id: str
-    from_user: TelegramUser = Field(alias="from")
+    from_user: TelegramUser = msgspec.field(name="from")
     message: TelegramMessage | None = None
     data: str | None = None
 
 
-class TelegramUpdate(BaseModel):
+class TelegramUpdate(msgspec.Struct, frozen=True):
     """Telegram update payload."""
 
     update_id: int
     message: TelegramMessage | None = None
     callback_query: TelegramCallbackQuery | None = None
+
+
+class TelegramMessageEnvelope(msgspec.Struct, frozen=True):
+    """Sender and chat of a message, decoded without its content."""
+
+    chat: TelegramChat
+    from_user: TelegramUser = msgspec.field(name="from")
+
+
+class TelegramCallbackQueryEnvelope(msgspec.Struct, frozen=True):
+    """Id and sender of a callback query, decoded without its message."""
+
+    id: str
+    from_user: TelegramUser = msgspec.field(name="from")
+
+
+class TelegramUpdateEnvelope(msgspec.Struct, frozen=True):
+    """Minimal update view used to authorize the sender before a full decode."""
+
+    update_id: int
+    message: TelegramMessageEnvelope | None = None
+    callback_query: TelegramCallbackQueryEnvelope | None = None
+
+
+_update_decoder = msgspec.json.Decoder(TelegramUpdate)
+_envelope_decoder = msgspec.json.Decoder(TelegramUpdateEnvelope)
+
+
+def decode_update(body: bytes) -> TelegramUpdate:
+    """Decode and validate a raw Telegram update payload.
+
+    Raises:
+        msgspec.ValidationError: If the payload doesn't match the update schema.
+        msgspec.DecodeError: If the body isn't valid JSON.
+    """
+    return _update_decoder.decode(body)
+
+
+def decode_update_envelope(body: bytes) -> TelegramUpdateEnvelope:
+    """Decode only the update id, sender and reply target of a raw update.
+
+    Raises:
+        msgspec.ValidationError: If the payload doesn't match the envelope schema.
+        msgspec.DecodeError: If the body isn't valid JSON.
+    """
+    return _envelope_decoder.decode(body)
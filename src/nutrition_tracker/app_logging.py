@@ -2,14 +2,39 @@
 
 import logging
 
+import orjson
 
-def configure_logging() -> None:
+_RESERVED_ATTRS = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__.keys()
+    | {"message", "asctime"}
+)
+
+
+class JsonFormatter(logging.Formatter):
+    """Render log records as single-line JSON, keeping `extra` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Serialize the record and any structured extras with orjson."""
+        payload = {
+            "lvl": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return orjson.dumps(payload, default=str).decode()
+
+
+def configure_logging(level: int | str = logging.INFO) -> None:
     """Configure application logging with a single stream handler."""
     logger = logging.getLogger("nutrition_tracker")
-    logger.setLevel(logging.INFO)
+    logger.setLevel(level)
     if logger.handlers:
         return
     handler = logging.StreamHandler()
-    handler.setFormatter(logging.Formatter("%(levelname)s: %(name)s: %(message)s"))
+    handler.setFormatter(JsonFormatter())
     logger.addHandler(handler)
     logger.propagate = False
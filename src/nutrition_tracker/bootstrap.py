@@ -0,0 +1,85 @@
+"""Process-wide SDK clients shared across warm serverless invocations."""
+
+from __future__ import annotations
+
+import logging
+import os
+from functools import cache
+from typing import TYPE_CHECKING
+
+import httpx
+
+from nutrition_tracker.config import Settings
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+    from supabase import Client
+
+_logger = logging.getLogger(__name__)
+_SUPABASE_HEADERS = {"Accept-Encoding": "br, gzip"}
+_SUPABASE_POSTGREST_TIMEOUT_SECONDS = 10
+_SUPABASE_POOL_SIZE = (os.cpu_count() or 1) * 2
+_SUPABASE_LIMITS = httpx.Limits(
+    max_connections=_SUPABASE_POOL_SIZE,
+    max_keepalive_connections=_SUPABASE_POOL_SIZE,
+    keepalive_expiry=30.0,
+)
+
+
+@cache
+def shared_supabase_client(supabase_url: str, service_key: str) -> Client:
+    """Return the process-wide Supabase client for the given credentials."""
+    from supabase import ClientOptions, create_client  # noqa: PLC0415
+
+    return create_client(
+        supabase_url,
+        service_key,
+        options=ClientOptions(
+            schema="public",
+            headers=dict(_SUPABASE_HEADERS),
+            httpx_client=create_supabase_http_client(),
+        ),
+    )
+
+
+def create_supabase_http_client() -> httpx.Client:
+    """Create the pooled HTTP/2 client shared by all Supabase sub-clients."""
+    return httpx.Client(
+        http2=True,
+        limits=_SUPABASE_LIMITS,
+        timeout=_SUPABASE_POSTGREST_TIMEOUT_SECONDS,
+        follow_redirects=True,
+    )
+
+
+@cache
+def shared_openai_client(api_key: str) -> AsyncOpenAI:
+    """Return the process-wide OpenAI client for the given API key."""
+    from openai import AsyncOpenAI  # noqa: PLC0415
+
+    return AsyncOpenAI(api_key=api_key)
+
+
+def warm(settings: Settings | None = None, *, prime: bool = False) -> None:
+    """Construct shared clients eagerly so the first request finds them ready.
+
+    Args:
+        settings: Settings to build clients from; loaded from env when omitted.
+        prime: Also issue a cheap Supabase query so DNS resolution and the
+            TLS handshake happen during cold start instead of the first request.
+    """
+    resolved_settings = settings or Settings()
+    supabase_client = shared_supabase_client(
+        resolved_settings.supabase_url, resolved_settings.supabase_service_key
+    )
+    shared_openai_client(resolved_settings.openai_api_key)
+    if prime:
+        _prime_supabase(supabase_client)
+
+
+def _prime_supabase(client: Client) -> None:
+    """Open the Supabase connection pool with a minimal query."""
+    try:
+        client.table("users").select("id").limit(1).execute()
+    except Exception:
+        _logger.warning("Supabase warm-up query failed", exc_info=True)
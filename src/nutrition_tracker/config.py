@@ -1,6 +1,7 @@
 """Application configuration."""
 
 import os
+from functools import lru_cache
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -22,6 +23,7 @@ class Settings(BaseSettings):
     fdc_api_key: str
     fdc_base_url: str = "https://api.nal.usda.gov/fdc/v1"
     environment: str = _ENVIRONMENT
+    log_level: str = "INFO"
 
     model_config = SettingsConfigDict(
         env_file=(f".env.{_ENVIRONMENT}", ".env"),
@@ -29,18 +31,17 @@ class Settings(BaseSettings):
     )
 
 
-def parse_allowed_user_ids(raw: str | None) -> set[int] | None:
+@lru_cache(maxsize=8)
+def parse_allowed_user_ids(raw: str | None) -> frozenset[int] | None:
     """Parse allowed Telegram user IDs from env."""
     if raw is None:
         return None
     cleaned = raw.strip()
     if cleaned in {"", "*"}:
         return None
-    ids: set[int] = set()
-    for chunk in cleaned.split(","):
-        value = chunk.strip()
-        if not value:
-            continue
-        if value.isdigit():
-            ids.add(int(value))
+    ids = frozenset(
+        int(value)
+        for value in (chunk.strip() for chunk in cleaned.split(","))
+        if value.isdigit()
+    )
     return ids or None
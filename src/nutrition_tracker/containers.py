@@ -3,8 +3,6 @@
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 
-from supabase import create_client
-
 from nutrition_tracker.adapters.fdc_client import HttpxFdcClient
 from nutrition_tracker.adapters.openai_vision_client import OpenAIVisionClient
 from nutrition_tracker.adapters.supabase_admin_repository import SupabaseAdminRepository
@@ -27,11 +25,13 @@ from nutrition_tracker.adapters.supabase_user_settings_repository import (
 from nutrition_tracker.adapters.telegram_client import (
     HttpxTelegramClient,
     TelegramClient,
+    create_telegram_http_client,
 )
 from nutrition_tracker.adapters.telegram_file_client import (
     HttpxTelegramFileClient,
     TelegramFileClient,
 )
+from nutrition_tracker.bootstrap import shared_openai_client, shared_supabase_client
 from nutrition_tracker.config import Settings
 from nutrition_tracker.services.admin import AdminService
 from nutrition_tracker.services.audit import AuditService
@@ -70,7 +70,7 @@ class AppContainer:
 def build_container(settings: Settings | None = None) -> AppContainer:
     """Create the default dependency container."""
     resolved_settings = settings or Settings()
-    supabase_client = create_client(
+    supabase_client = shared_supabase_client(
         resolved_settings.supabase_url, resolved_settings.supabase_service_key
     )
     user_repository = SupabaseUserRepository(supabase_client)
@@ -83,11 +83,18 @@ def build_container(settings: Settings | None = None) -> AppContainer:
     admin_repository = SupabaseAdminRepository(supabase_client)
     audit_repository = SupabaseAuditRepository(supabase_client)
     user_service = UserService(user_repository)
-    telegram_client = HttpxTelegramClient.create(resolved_settings.telegram_bot_token)
-    telegram_file_client = HttpxTelegramFileClient.create(
-        resolved_settings.telegram_bot_token
+    telegram_http_client = create_telegram_http_client()
+    telegram_client = HttpxTelegramClient(
+        bot_token=resolved_settings.telegram_bot_token,
+        http_client=telegram_http_client,
+    )
+    telegram_file_client = HttpxTelegramFileClient(
+        bot_token=resolved_settings.telegram_bot_token,
+        http_client=telegram_http_client,
+    )
+    openai_client = OpenAIVisionClient(
+        client=shared_openai_client(resolved_settings.openai_api_key)
     )
-    openai_client = OpenAIVisionClient.create(resolved_settings.openai_api_key)
     vision_service = VisionService(
         client=openai_client,
         model=resolved_settings.openai_model,
@@ -112,6 +119,7 @@ def build_container(settings: Settings | None = None) -> AppContainer:
         debug=debug,
     )
     audit_service = AuditService(audit_repository)
+    stats_service = StatsService(stats_repository, cache=InMemoryCache())
     session_service = SessionService(
         photo_repository=photo_repository,
         session_repository=session_repository,
@@ -119,14 +127,15 @@ def build_container(settings: Settings | None = None) -> AppContainer:
         nutrition_service=nutrition_service,
         meal_log_service=meal_log_service,
         audit_service=audit_service,
+        stats_service=stats_service,
         debug=debug,
     )
-    stats_service = StatsService(stats_repository)
     user_settings_service = UserSettingsService(user_settings_repository)
     admin_service = AdminService(
         admin_repository=admin_repository,
         stats_repository=stats_repository,
         library_repository=library_repository,
+        cache=InMemoryCache(),
     )
     start_handler = StartCommandHandler(
         user_service=user_service,
@@ -135,8 +144,8 @@ def build_container(settings: Settings | None = None) -> AppContainer:
     )
 
     async def close_resources() -> None:
-        await telegram_client.close()
-        await telegram_file_client.close()
+        user_repository.flush_last_active()
+        await telegram_http_client.aclose()
         await fdc_client.close()
 
     return AppContainer(
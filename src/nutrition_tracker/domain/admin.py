@@ -1,12 +1,12 @@
 """Admin domain models."""
 
-from dataclasses import dataclass
 from datetime import datetime
 from uuid import UUID
 
+import msgspec
 
-@dataclass(frozen=True)
-class AdminUser:
+
+class AdminUser(msgspec.Struct, frozen=True):
     """Minimal admin view of a user."""
 
     id: UUID
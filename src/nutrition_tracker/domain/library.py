@@ -1,12 +1,12 @@
 """Domain models for the user food library."""
 
-from dataclasses import dataclass
 from datetime import datetime
 from uuid import UUID
 
+import msgspec
 
-@dataclass(frozen=True)
-class LibraryFood:
+
+class LibraryFood(msgspec.Struct, frozen=True):
     """Represents a food entry in a user's library."""
 
     id: UUID
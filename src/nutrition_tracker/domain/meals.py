@@ -1,12 +1,12 @@
 """Domain models for meal logging."""
 
-from dataclasses import dataclass
 from datetime import datetime
 from uuid import UUID
 
+import msgspec
 
-@dataclass(frozen=True)
-class MealItemSnapshot:
+
+class MealItemSnapshot(msgspec.Struct, frozen=True):
     """Snapshot of a meal item with macros."""
 
     name: str
@@ -19,8 +19,7 @@ class MealItemSnapshot:
     nutrition_snapshot: dict[str, object] | None = None
 
 
-@dataclass(frozen=True)
-class MealLogSummary:
+class MealLogSummary(msgspec.Struct, frozen=True):
     """Summary of a logged or previewed meal."""
 
     meal_id: UUID | None
@@ -31,8 +30,7 @@ class MealLogSummary:
     items: list[MealItemSnapshot]
 
 
-@dataclass(frozen=True)
-class MealItemRecord:
+class MealItemRecord(msgspec.Struct, frozen=True):
     """Meal item row with identifiers."""
 
     id: UUID
@@ -47,8 +45,7 @@ class MealItemRecord:
     nutrition_snapshot: dict[str, object]
 
 
-@dataclass(frozen=True)
-class MealLogDetail:
+class MealLogDetail(msgspec.Struct, frozen=True):
     """Meal log with items."""
 
     id: UUID
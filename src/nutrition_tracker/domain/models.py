@@ -1,11 +1,11 @@
 """Domain models for the nutrition tracker."""
 
-from dataclasses import dataclass
 from uuid import UUID
 
+import msgspec
 
-@dataclass(frozen=True)
-class UserRecord:
+
+class UserRecord(msgspec.Struct, frozen=True):
     """Represents a user stored in the database."""
 
     id: UUID
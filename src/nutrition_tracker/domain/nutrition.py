@@ -1,10 +1,9 @@
 """Nutrition domain models."""
 
-from dataclasses import dataclass
+import msgspec
 
 
-@dataclass(frozen=True)
-class MacroProfile:
+class MacroProfile(msgspec.Struct, frozen=True):
     """Macronutrient profile for a food item."""
 
     calories: float
@@ -13,8 +12,7 @@ class MacroProfile:
     carbs_g: float
 
 
-@dataclass(frozen=True)
-class FoodSummary:
+class FoodSummary(msgspec.Struct, frozen=True):
     """Summary information about a food from FDC."""
 
     fdc_id: int
@@ -24,8 +22,7 @@ class FoodSummary:
     data_type: str | None
 
 
-@dataclass(frozen=True)
-class FoodDetails:
+class FoodDetails(msgspec.Struct, frozen=True):
     """Full food details with macros."""
 
     summary: FoodSummary
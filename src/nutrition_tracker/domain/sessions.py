@@ -1,15 +1,16 @@
 """Domain models for photo sessions."""
 
-from dataclasses import dataclass
+from collections.abc import Mapping
 from uuid import UUID
 
+import msgspec
 
-@dataclass(frozen=True)
-class SessionRecord:
+
+class SessionRecord(msgspec.Struct, frozen=True):
     """Represents a persisted photo session."""
 
     id: UUID
     user_id: UUID
     photo_id: UUID | None
     status: str
-    context: dict[str, object]
+    context: Mapping[str, object]
@@ -1,12 +1,12 @@
 """Domain models for statistics."""
 
-from dataclasses import dataclass
 from datetime import date, datetime
 from uuid import UUID
 
+import msgspec
 
-@dataclass(frozen=True)
-class MealLogRow:
+
+class MealLogRow(msgspec.Struct, frozen=True):
     """Summary data for a logged meal."""
 
     meal_id: UUID
@@ -17,8 +17,7 @@ class MealLogRow:
     total_carbs_g: float
 
 
-@dataclass(frozen=True)
-class DailyTotals:
+class DailyTotals(msgspec.Struct, frozen=True):
     """Daily total macros."""
 
     day: date
@@ -26,3 +25,11 @@ class DailyTotals:
     protein_g: float
     fat_g: float
     carbs_g: float
+
+
+class UserLogActivity(msgspec.Struct, frozen=True):
+    """Recent meal log counts and calories for one user."""
+
+    logs_last_7d: int
+    logs_last_30d: int
+    calories_last_7d: float
@@ -1,28 +1,35 @@
 """Admin service for reporting."""
 
-from dataclasses import dataclass
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
-from typing import Protocol
+from typing import Protocol, cast
 from uuid import UUID
 
 from nutrition_tracker.domain.admin import AdminUser
 from nutrition_tracker.domain.library import LibraryFood
-from nutrition_tracker.domain.stats import MealLogRow
+from nutrition_tracker.domain.stats import MealLogRow, UserLogActivity
+from nutrition_tracker.services.cache import Cache, InMemoryCache
 from nutrition_tracker.services.library import LibraryRepository
 from nutrition_tracker.services.stats import StatsRepository
 
+_NO_ACTIVITY = UserLogActivity(logs_last_7d=0, logs_last_30d=0, calories_last_7d=0.0)
+
 
 class AdminRepository(Protocol):
     """Persistence interface for admin data."""
 
+    __slots__ = ()
+
     def list_users(self) -> list[AdminUser]:
         """Return all users."""
 
-    def list_sessions(self, limit: int) -> list[dict[str, object]]:
-        """Return recent photo sessions."""
+    def list_sessions(self, limit: int, offset: int = 0) -> list[dict[str, object]]:
+        """Return a page of recent photo sessions."""
 
-    def list_costs(self, limit: int) -> list[dict[str, object]]:
-        """Return recent model usage entries."""
+    def list_costs(self, limit: int, offset: int = 0) -> list[dict[str, object]]:
+        """Return a page of recent model usage entries."""
 
     def list_audit_events(self, user_id: UUID, limit: int) -> list[dict[str, object]]:
         """Return recent audit events for a user."""
@@ -30,61 +37,97 @@ class AdminRepository(Protocol):
 
 @dataclass
 class AdminService:
-    """Service for admin dashboards."""
+    """Service for admin dashboards.
+
+    Datetimes and UUIDs in the returned rows are left for the admin API's
+    orjson encoder, which formats them natively.
+    """
 
     admin_repository: AdminRepository
     stats_repository: StatsRepository
     library_repository: LibraryRepository
+    cache: Cache = field(default_factory=InMemoryCache)
+    ttl_seconds: int = 60
 
     def list_users(self) -> list[dict[str, object]]:
-        """Return users with usage summaries."""
+        """Return users with usage summaries, cached for a short TTL."""
+        return self._cached("admin:users_summary", self._load_users)
+
+    def _load_users(self) -> list[dict[str, object]]:
         users = self.admin_repository.list_users()
         now = datetime.now(tz=UTC)
         start_7d = now - timedelta(days=7)
         start_30d = now - timedelta(days=30)
+        activity = (
+            self.stats_repository.aggregate_user_logs(
+                [user.id for user in users], start_7d, start_30d, now
+            )
+            if users
+            else {}
+        )
         summaries = []
         for user in users:
-            logs_7d = self.stats_repository.list_meal_logs(user.id, start_7d, now)
-            logs_30d = self.stats_repository.list_meal_logs(user.id, start_30d, now)
-            total_calories_7d = sum(log.total_calories for log in logs_7d)
+            user_activity = activity.get(user.id, _NO_ACTIVITY)
             summaries.append(
                 {
-                    "id": str(user.id),
+                    "id": user.id,
                     "telegram_user_id": user.telegram_user_id,
-                    "last_active_at": user.last_active_at.isoformat()
-                    if user.last_active_at
-                    else None,
-                    "logs_last_7d": len(logs_7d),
-                    "logs_last_30d": len(logs_30d),
-                    "avg_calories_7d": total_calories_7d / 7,
+                    "last_active_at": user.last_active_at,
+                    "logs_last_7d": user_activity.logs_last_7d,
+                    "logs_last_30d": user_activity.logs_last_30d,
+                    "avg_calories_7d": user_activity.calories_last_7d / 7,
                 }
             )
         return summaries
 
-    def get_user_detail(self, user_id: UUID) -> dict[str, object]:
-        """Return detailed info for a user."""
-        recent_logs = self.stats_repository.list_recent_meal_logs(user_id, limit=10)
-        library = self.library_repository.list_top_foods(user_id, limit=20)
-        audits = self.admin_repository.list_audit_events(user_id, limit=20)
+    async def get_user_detail(self, user_id: UUID) -> dict[str, object]:
+        """Return detailed info for a user, querying its sources concurrently."""
+        recent_logs, library, audits = await asyncio.gather(
+            asyncio.to_thread(
+                self.stats_repository.list_recent_meal_logs, user_id, limit=10
+            ),
+            asyncio.to_thread(
+                self.library_repository.list_top_foods, user_id, limit=20
+            ),
+            asyncio.to_thread(
+                self.admin_repository.list_audit_events, user_id, limit=20
+            ),
+        )
         return {
-            "user_id": str(user_id),
+            "user_id": user_id,
             "recent_meals": [_serialize_meal_log(log) for log in recent_logs],
             "library": [_serialize_library(food) for food in library],
             "audit_events": audits,
         }
 
-    def list_sessions(self, limit: int = 20) -> list[dict[str, object]]:
+    def list_sessions(
+        self, limit: int = 20, offset: int = 0
+    ) -> list[dict[str, object]]:
         """Return recent sessions."""
-        return self.admin_repository.list_sessions(limit)
+        return self._cached(
+            f"admin:sessions:{limit}:{offset}",
+            lambda: self.admin_repository.list_sessions(limit, offset),
+        )
 
-    def list_costs(self, limit: int = 30) -> list[dict[str, object]]:
+    def list_costs(self, limit: int = 30, offset: int = 0) -> list[dict[str, object]]:
         """Return model usage entries."""
-        return self.admin_repository.list_costs(limit)
+        return self._cached(
+            f"admin:costs:{limit}:{offset}",
+            lambda: self.admin_repository.list_costs(limit, offset),
+        )
+
+    def _cached[T](self, cache_key: str, load: Callable[[], T]) -> T:
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cast("T", cached)
+        value = load()
+        self.cache.set(cache_key, value, ttl_seconds=self.ttl_seconds)
+        return value
 
 
 def _serialize_meal_log(log: MealLogRow) -> dict[str, object]:
     return {
-        "logged_at": log.logged_at.isoformat(),
+        "logged_at": log.logged_at,
         "total_calories": log.total_calories,
         "total_protein_g": log.total_protein_g,
         "total_fat_g": log.total_fat_g,
@@ -94,10 +137,10 @@ def _serialize_meal_log(log: MealLogRow) -> dict[str, object]:
 
 def _serialize_library(food: LibraryFood) -> dict[str, object]:
     return {
-        "id": str(food.id),
+        "id": food.id,
         "name": food.name,
         "brand": food.brand,
         "store": food.store,
         "use_count": food.use_count,
-        "last_used_at": food.last_used_at.isoformat() if food.last_used_at else None,
+        "last_used_at": food.last_used_at,
     }
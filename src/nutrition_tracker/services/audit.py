@@ -8,6 +8,8 @@ from uuid import UUID
 class AuditRepository(Protocol):
     """Persistence interface for audit events."""
 
+    __slots__ = ()
+
     def create_event(  # noqa: PLR0913
         self,
         user_id: UUID,
@@ -1,7 +1,9 @@
 """Simple cache abstractions."""
 
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from datetime import UTC, datetime, timedelta
 from typing import Protocol
 
 
@@ -15,32 +17,39 @@ class Cache(Protocol):
         """Store a cached value with a TTL in seconds."""
 
 
-@dataclass
-class _CacheEntry:
-    value: object
-    expires_at: datetime
-
-
 @dataclass
 class InMemoryCache(Cache):
-    """In-memory cache implementation for MVP."""
+    """In-memory LRU cache for MVP, bounded to `max_entries` keys.
+
+    Safe to share between the event loop and `asyncio.to_thread` workers.
+    """
 
-    _entries: dict[str, _CacheEntry]
+    _entries: OrderedDict[str, tuple[object, float]]
+    _lock: threading.Lock
+    max_entries: int
 
-    def __init__(self) -> None:
-        self._entries = {}
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_entries = max_entries
 
     def get(self, key: str) -> object | None:
         """Return a cached value if it hasn't expired."""
-        entry = self._entries.get(key)
-        if entry is None:
-            return None
-        if datetime.now(tz=UTC) >= entry.expires_at:
-            self._entries.pop(key, None)
-            return None
-        return entry.value
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
 
     def set(self, key: str, value: object, ttl_seconds: int) -> None:
-        """Store a cached value with a TTL."""
-        expires_at = datetime.now(tz=UTC) + timedelta(seconds=ttl_seconds)
-        self._entries[key] = _CacheEntry(value=value, expires_at=expires_at)
+        """Store a cached value with a TTL, evicting the least recently used."""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl_seconds)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -1,5 +1,6 @@
 """Command handlers for Telegram updates."""
 
+import asyncio
 from dataclasses import dataclass
 
 from nutrition_tracker.adapters.telegram_client import TelegramClient
@@ -17,8 +18,11 @@ class StartCommandHandler:
 
     async def handle(self, telegram_user_id: int, chat_id: int) -> None:
         """Create the user if needed and send a welcome message."""
-        user = self.user_service.ensure_user(telegram_user_id)
-        if self.user_settings_service.is_timezone_set(user.id):
+        user = await asyncio.to_thread(self.user_service.ensure_user, telegram_user_id)
+        timezone_set = await asyncio.to_thread(
+            self.user_settings_service.is_timezone_set, user.id
+        )
+        if timezone_set:
             await self.telegram_client.send_message(
                 chat_id=chat_id,
                 text="Welcome back! Your timezone is already set.",
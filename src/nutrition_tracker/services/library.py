@@ -1,5 +1,6 @@
 """Services for managing the user food library."""
 
+import heapq
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import Protocol
@@ -7,10 +8,14 @@ from uuid import UUID
 
 from nutrition_tracker.domain.library import LibraryFood
 
+_NEVER_USED = datetime.min.replace(tzinfo=UTC)
+
 
 class LibraryRepository(Protocol):
     """Persistence interface for the user food library."""
 
+    __slots__ = ()
+
     def create_food(self, user_id: UUID, payload: dict[str, object]) -> LibraryFood:
         """Create a food entry and return it."""
 
@@ -63,12 +68,14 @@ class LibraryService:
     ) -> list[LibraryFood]:
         """Search the library, falling back to top foods when query is empty."""
         if not query:
-            return self._rank(self.repository.list_top_foods(user_id, limit))
-        return self._rank(self.repository.search_foods(user_id, query, limit))
+            return self._rank(self.repository.list_top_foods(user_id, limit), limit)
+        return self._rank(self.repository.search_foods(user_id, query, limit), limit)
 
-    def record_use(self, food_id: UUID) -> None:
-        """Record that a food item has been used."""
-        self.repository.increment_usage(food_id, used_at=datetime.now(tz=UTC))
+    def record_use(self, food_id: UUID, used_at: datetime | None = None) -> None:
+        """Record that a food item has been used, defaulting to the current time."""
+        self.repository.increment_usage(
+            food_id, used_at=used_at or datetime.now(tz=UTC)
+        )
 
     def find_by_source_ref(
         self, user_id: UUID, source_type: str, source_ref: str
@@ -77,13 +84,10 @@ class LibraryService:
         return self.repository.find_by_source_ref(user_id, source_type, source_ref)
 
     @staticmethod
-    def _rank(items: list[LibraryFood]) -> list[LibraryFood]:
-        """Rank foods by recent use then frequency."""
-        return sorted(
-            items,
-            key=lambda item: (
-                item.last_used_at or datetime.min.replace(tzinfo=UTC),
-                item.use_count,
-            ),
-            reverse=True,
-        )
+    def _rank(items: list[LibraryFood], limit: int) -> list[LibraryFood]:
+        """Return the top `limit` foods by recent use then frequency."""
+        return heapq.nlargest(limit, items, key=_rank_key)
+
+
+def _rank_key(item: LibraryFood) -> tuple[datetime, int]:
+    return item.last_used_at or _NEVER_USED, item.use_count
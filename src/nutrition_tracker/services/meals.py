@@ -1,5 +1,6 @@
 """Meal logging service."""
 
+import asyncio
 import logging
 from dataclasses import dataclass
 from datetime import UTC, datetime
@@ -24,18 +25,15 @@ _logger = logging.getLogger(__name__)
 class MealLogRepository(Protocol):
     """Persistence interface for meal logs."""
 
-    def create_meal_log(
+    __slots__ = ()
+
+    def create_meal_log_with_items(
         self,
         user_id: UUID,
         logged_at: datetime,
-        totals: MacroProfile,
+        items: list[MealItemSnapshot],
     ) -> UUID:
-        """Create a meal log and return its id."""
-
-    def create_meal_items(
-        self, meal_log_id: UUID, items: list[MealItemSnapshot]
-    ) -> None:
-        """Create meal item rows for a meal log."""
+        """Create a meal log with its items atomically and return its id."""
 
     def get_meal_log(self, meal_log_id: UUID) -> MealLogRow | None:
         """Return a meal log row by id."""
@@ -82,19 +80,8 @@ class MealLogService:
         self, user_id: UUID, items: list[dict[str, object]]
     ) -> MealLogSummary:
         """Compute macros for items and persist the meal log."""
-        resolved_items = _ensure_library_refs(self.library_service, items, user_id)
-        snapshots, total = await _build_snapshots(
-            self.nutrition_service, resolved_items, debug=self.debug
-        )
-        meal_id = self.repository.create_meal_log(
-            user_id=user_id,
-            logged_at=datetime.now(tz=UTC),
-            totals=total,
-        )
-        self.repository.create_meal_items(meal_id, snapshots)
-        for snapshot in snapshots:
-            if snapshot.food_id:
-                self.library_service.record_use(snapshot.food_id)
+        snapshots, total = await self.prepare_meal(user_id, items)
+        meal_id = await asyncio.to_thread(self._persist_meal, user_id, snapshots)
 
         return MealLogSummary(
             meal_id=meal_id,
@@ -105,6 +92,33 @@ class MealLogService:
             items=snapshots,
         )
 
+    async def prepare_meal(
+        self, user_id: UUID, items: list[dict[str, object]]
+    ) -> tuple[list[MealItemSnapshot], MacroProfile]:
+        """Resolve library references and compute item snapshots and totals."""
+        resolved_items = await asyncio.to_thread(
+            _ensure_library_refs, self.library_service, items, user_id
+        )
+        return await _build_snapshots(
+            self.nutrition_service, resolved_items, debug=self.debug
+        )
+
+    def record_uses(self, snapshots: list[MealItemSnapshot], used_at: datetime) -> None:
+        """Bump library use counts for the foods in a meal saved at used_at."""
+        for snapshot in snapshots:
+            if snapshot.food_id:
+                self.library_service.record_use(snapshot.food_id, used_at)
+
+    def _persist_meal(self, user_id: UUID, snapshots: list[MealItemSnapshot]) -> UUID:
+        logged_at = datetime.now(tz=UTC)
+        meal_id = self.repository.create_meal_log_with_items(
+            user_id=user_id,
+            logged_at=logged_at,
+            items=snapshots,
+        )
+        self.record_uses(snapshots, logged_at)
+        return meal_id
+
     def get_meal_detail(self, meal_log_id: UUID) -> MealLogDetail | None:
         """Return a meal log with items."""
         log = self.repository.get_meal_log(meal_log_id)
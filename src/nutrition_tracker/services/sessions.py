@@ -1,18 +1,26 @@
 """Session state machine for photo-based logging and edits."""
 
+import asyncio
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
 from typing import Protocol
 from uuid import UUID
+from weakref import WeakValueDictionary
 
 from nutrition_tracker.domain.library import LibraryFood
-from nutrition_tracker.domain.meals import MealLogDetail, MealLogSummary
+from nutrition_tracker.domain.meals import (
+    MealItemSnapshot,
+    MealLogDetail,
+    MealLogSummary,
+)
 from nutrition_tracker.domain.nutrition import FoodSummary
 from nutrition_tracker.domain.sessions import SessionRecord
 from nutrition_tracker.services.audit import AuditService
 from nutrition_tracker.services.library import LibraryService
 from nutrition_tracker.services.meals import MealLogService
 from nutrition_tracker.services.nutrition import NutritionService
+from nutrition_tracker.services.stats import StatsService
 
 STATUS_AWAITING_CONFIRMATION = "AWAITING_CONFIRMATION"
 STATUS_AWAITING_ITEM_LIST = "AWAITING_ITEM_LIST"
@@ -32,6 +40,7 @@ STATUS_EDIT_SELECT_ITEM = "EDIT_SELECT_ITEM"
 STATUS_EDIT_ENTER_GRAMS = "EDIT_ENTER_GRAMS"
 STATUS_CANCELLED = "CANCELLED"
 STATUS_COMPLETED = "COMPLETED"
+TERMINAL_STATUSES = frozenset({STATUS_COMPLETED, STATUS_CANCELLED})
 MACRO_PARTS = 4
 
 _logger = logging.getLogger(__name__)
@@ -40,6 +49,8 @@ _logger = logging.getLogger(__name__)
 class PhotoRepository(Protocol):
     """Persistence interface for photo metadata."""
 
+    __slots__ = ()
+
     def create_photo(
         self,
         user_id: UUID,
@@ -57,6 +68,8 @@ class PhotoRepository(Protocol):
 class SessionRepository(Protocol):
     """Persistence interface for photo sessions."""
 
+    __slots__ = ()
+
     def create_session(
         self,
         user_id: UUID,
@@ -75,7 +88,18 @@ class SessionRepository(Protocol):
     def update_session(
         self, session_id: UUID, status: str, context: dict[str, object]
     ) -> None:
-        """Update a session status and context."""
+        """Update a session status and context if the session is still active."""
+
+    def complete_with_meal_log(
+        self,
+        session: SessionRecord,
+        logged_at: datetime,
+        items: list[MealItemSnapshot],
+    ) -> UUID | None:
+        """Log the session's meal, complete it and drop its photo atomically.
+
+        Return None without logging anything if the session is no longer active.
+        """
 
 
 @dataclass(frozen=True)
@@ -96,7 +120,11 @@ class SessionService:
     nutrition_service: NutritionService
     meal_log_service: MealLogService
     audit_service: AuditService
+    stats_service: StatsService
     debug: bool = False
+    _session_locks: WeakValueDictionary[UUID, asyncio.Lock] = field(
+        default_factory=WeakValueDictionary, init=False, repr=False
+    )
 
     async def start_session(  # noqa: PLR0913
         self,
@@ -108,7 +136,8 @@ class SessionService:
         vision_items: list[dict[str, object]] | None = None,
     ) -> tuple[UUID, SessionPrompt]:
         """Create a session for a new photo and return the first prompt."""
-        photo_id = self.photo_repository.create_photo(
+        photo_id = await asyncio.to_thread(
+            self.photo_repository.create_photo,
             user_id=user_id,
             telegram_chat_id=telegram_chat_id,
             telegram_message_id=telegram_message_id,
@@ -122,7 +151,8 @@ class SessionService:
             "current_index": 0,
             "resolved_items": [],
         }
-        session = self.session_repository.create_session(
+        session = await asyncio.to_thread(
+            self.session_repository.create_session,
             user_id=user_id,
             photo_id=photo_id,
             status=STATUS_AWAITING_CONFIRMATION,
@@ -146,14 +176,17 @@ class SessionService:
         )
         return session.id, prompt
 
-    def start_library_add_session(self, user_id: UUID) -> SessionPrompt:
-        """Start a manual library-add session."""
+    async def start_library_add_session(self, user_id: UUID) -> SessionPrompt | None:
+        """Start a manual library-add session unless one is already open."""
+        if await self._has_open_session(user_id):
+            return None
         context: dict[str, object] = {
             "flow": "library",
             "user_id": str(user_id),
             "manual": {"target": "library"},
         }
-        self.session_repository.create_session(
+        await asyncio.to_thread(
+            self.session_repository.create_session,
             user_id=user_id,
             photo_id=None,
             status=STATUS_AWAITING_MANUAL_NAME,
@@ -161,11 +194,15 @@ class SessionService:
         )
         return SessionPrompt(text="Enter the food name to add to your library.")
 
-    def start_edit_session(
+    async def start_edit_session(
         self, user_id: UUID, meal_log_id: UUID
     ) -> SessionPrompt | None:
-        """Start editing a saved meal log."""
-        detail = self.meal_log_service.get_meal_detail(meal_log_id)
+        """Start editing a saved meal log unless another session is open."""
+        if await self._has_open_session(user_id):
+            return None
+        detail = await asyncio.to_thread(
+            self.meal_log_service.get_meal_detail, meal_log_id
+        )
         if detail is None:
             return None
         context: dict[str, object] = {
@@ -185,7 +222,8 @@ class SessionService:
                 for item in detail.items
             ],
         }
-        session = self.session_repository.create_session(
+        session = await asyncio.to_thread(
+            self.session_repository.create_session,
             user_id=user_id,
             photo_id=None,
             status=STATUS_EDIT_SELECT_ITEM,
@@ -193,46 +231,145 @@ class SessionService:
         )
         return _edit_item_prompt(session.id, context)
 
-    def cancel_active_session(self, user_id: UUID) -> SessionPrompt | None:
+    async def cancel_active_session(self, user_id: UUID) -> SessionPrompt | None:
         """Cancel the active session for a user, if any."""
-        session = self.session_repository.get_active_session(user_id)
-        if session is None:
+        active = await asyncio.to_thread(
+            self.session_repository.get_active_session, user_id
+        )
+        if active is None:
             return None
-        return self._cancel_session(session)
+        async with self._session_lock(active.id):
+            session = await self._get_open_session(active.id)
+            if session is None:
+                return None
+            return await self._cancel_session(session)
+
+    async def save_session(self, session_id: UUID) -> MealLogSummary | None:
+        """Save a session's meal in one transaction, unless the session ended."""
+        async with self._session_lock(session_id):
+            session = await self._get_open_session(session_id)
+            if session is None:
+                return None
+            return await self._save_session_meal(session)
 
     async def handle_callback(
         self, session_id: UUID, action: str, payload: str | None = None
     ) -> SessionPrompt | None:
         """Handle a callback action and return the next prompt."""
-        session = self.session_repository.get_session(session_id)
-        if session is None or session.status in {STATUS_COMPLETED, STATUS_CANCELLED}:
+        async with self._session_lock(session_id):
+            return await self._handle_callback(session_id, action, payload)
+
+    async def handle_text(self, user_id: UUID, text: str) -> SessionPrompt | None:
+        """Handle free-text replies for the active session."""
+        active = await asyncio.to_thread(
+            self.session_repository.get_active_session, user_id
+        )
+        if active is None:
+            return None
+        async with self._session_lock(active.id):
+            # Another handler may have moved the session on since it was read.
+            session = await self._get_open_session(active.id)
+            if session is None:
+                return None
+            return await self._handle_text(session, text)
+
+    async def _has_open_session(self, user_id: UUID) -> bool:
+        active = await asyncio.to_thread(
+            self.session_repository.get_active_session, user_id
+        )
+        if active is None:
+            return False
+        # Let an in-flight step on that session finish before deciding.
+        async with self._session_lock(active.id):
+            return await self._get_open_session(active.id) is not None
+
+    async def _get_open_session(self, session_id: UUID) -> SessionRecord | None:
+        session = await asyncio.to_thread(
+            self.session_repository.get_session, session_id
+        )
+        if session is None or session.status in TERMINAL_STATUSES:
+            return None
+        return session
+
+    async def _save_session_meal(self, session: SessionRecord) -> MealLogSummary | None:
+        resolved_items = session.context.get("resolved_items", [])
+        snapshots, total = await self.meal_log_service.prepare_meal(
+            session.user_id,
+            resolved_items if isinstance(resolved_items, list) else [],
+        )
+        meal_id = await asyncio.to_thread(
+            self._persist_session_meal, session, snapshots
+        )
+        if meal_id is None:
+            return None
+        return MealLogSummary(
+            meal_id=meal_id,
+            total_calories=total.calories,
+            total_protein_g=total.protein_g,
+            total_fat_g=total.fat_g,
+            total_carbs_g=total.carbs_g,
+            items=snapshots,
+        )
+
+    def _persist_session_meal(
+        self, session: SessionRecord, snapshots: list[MealItemSnapshot]
+    ) -> UUID | None:
+        logged_at = datetime.now(tz=UTC)
+        meal_id = self.session_repository.complete_with_meal_log(
+            session, logged_at, snapshots
+        )
+        if meal_id is None:
+            return None
+        self.meal_log_service.record_uses(snapshots, logged_at)
+        self.stats_service.invalidate_user(session.user_id)
+        return meal_id
+
+    async def _update_session(
+        self, session_id: UUID, status: str, context: dict[str, object]
+    ) -> None:
+        await asyncio.to_thread(
+            self.session_repository.update_session,
+            session_id,
+            status=status,
+            context=context,
+        )
+
+    def _session_lock(self, session_id: UUID) -> asyncio.Lock:
+        lock = self._session_locks.get(session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._session_locks[session_id] = lock
+        return lock
+
+    async def _handle_callback(
+        self, session_id: UUID, action: str, payload: str | None
+    ) -> SessionPrompt | None:
+        session = await self._get_open_session(session_id)
+        if session is None:
             return None
 
         flow = str(session.context.get("flow", "photo"))
         if action == "cancel":
-            return self._cancel_session(session)
+            return await self._cancel_session(session)
 
         if flow == "photo":
             return await self._handle_photo_callback(session, action, payload)
         if flow == "edit":
-            return self._handle_edit_callback(session, action, payload)
+            return await self._handle_edit_callback(session, action, payload)
         if flow == "library":
-            return self._handle_library_callback(session, action, payload)
+            return await self._handle_library_callback(session, action, payload)
         return None
 
-    async def handle_text(self, user_id: UUID, text: str) -> SessionPrompt | None:
-        """Handle free-text replies for the active session."""
-        session = self.session_repository.get_active_session(user_id)
-        if session is None:
-            return None
-
+    async def _handle_text(
+        self, session: SessionRecord, text: str
+    ) -> SessionPrompt | None:
         flow = str(session.context.get("flow", "photo"))
         if flow == "photo":
             return await self._handle_photo_text(session, text)
         if flow == "library":
             return await self._handle_library_text(session, text)
         if flow == "edit":
-            return self._handle_edit_text(session, text)
+            return await self._handle_edit_text(session, text)
         return None
 
     async def _handle_photo_callback(  # noqa: PLR0911, PLR0912
@@ -243,7 +380,7 @@ class SessionService:
             context["current_index"] = 0
             return await self._prompt_item_confirmation(session.id, context)
         if action == "fix":
-            self.session_repository.update_session(
+            await self._update_session(
                 session.id, status=STATUS_AWAITING_ITEM_LIST, context=context
             )
             return SessionPrompt(
@@ -252,22 +389,22 @@ class SessionService:
         if action == "item_yes":
             return await self._apply_candidate_selection(session.id, context, 0)
         if action == "item_no":
-            return self._prompt_item_selection(session.id, context)
+            return await self._prompt_item_selection(session.id, context)
         if action == "choose" and payload is not None:
             index = _safe_int(payload)
             if index is None:
                 return None
             return await self._apply_candidate_selection(session.id, context, index)
         if action == "basis_100":
-            return self._set_manual_basis(session.id, context, "per100g")
+            return await self._set_manual_basis(session.id, context, "per100g")
         if action == "basis_serv":
-            return self._set_manual_basis(session.id, context, "perServing")
+            return await self._set_manual_basis(session.id, context, "perServing")
         if action.startswith("store_"):
-            return self._set_manual_store(session.id, context, action)
+            return await self._set_manual_store(session.id, context, action)
         if action == "portion_est":
             return await self._apply_estimate(session.id, context)
         if action == "portion_manual":
-            self.session_repository.update_session(
+            await self._update_session(
                 session.id, status=STATUS_AWAITING_MANUAL_GRAMS, context=context
             )
             item = _current_item(context)
@@ -277,7 +414,7 @@ class SessionService:
             _mark_skipped(context)
             return await self._advance_or_summarize(session.id, context)
         if action == "edit":
-            self.session_repository.update_session(
+            await self._update_session(
                 session.id, status=STATUS_AWAITING_EDIT_CHOICE, context=context
             )
             return _edit_choice_prompt(session.id, context)
@@ -286,7 +423,7 @@ class SessionService:
             if index is None:
                 return None
             context["edit_index"] = index
-            self.session_repository.update_session(
+            await self._update_session(
                 session.id, status=STATUS_AWAITING_EDIT_GRAMS, context=context
             )
             items = context.get("resolved_items", [])
@@ -316,7 +453,7 @@ class SessionService:
             manual = dict(context.get("manual", {}))
             manual["name"] = name
             context["manual"] = manual
-            self.session_repository.update_session(
+            await self._update_session(
                 session.id, status=STATUS_AWAITING_MANUAL_STORE, context=context
             )
             return _manual_store_prompt(session.id, name)
@@ -331,7 +468,7 @@ class SessionService:
             manual = dict(context.get("manual", {}))
             manual["serving_size_g"] = grams
             context["manual"] = manual
-            self.session_repository.update_session(
+            await self._update_session(
                 session.id, status=STATUS_AWAITING_MANUAL_MACROS, context=context
             )
             return SessionPrompt(
@@ -368,7 +505,7 @@ class SessionService:
 
         return None
 
-    def _handle_edit_callback(
+    async def _handle_edit_callback(
         self, session: SessionRecord, action: str, payload: str | None
     ) -> SessionPrompt | None:
         context = dict(session.context)
@@ -378,14 +515,14 @@ class SessionService:
                 return None
             context["edit_item_id"] = _edit_item_id(context, index)
             context["edit_item_name"] = _edit_item_name(context, index)
-            self.session_repository.update_session(
+            await self._update_session(
                 session.id, status=STATUS_EDIT_ENTER_GRAMS, context=context
             )
             name = context.get("edit_item_name", "item")
             return SessionPrompt(text=f"Enter new grams for {name}.")
         return None
 
-    def _handle_edit_text(
+    async def _handle_edit_text(
         self, session: SessionRecord, text: str
     ) -> SessionPrompt | None:
         if session.status != STATUS_EDIT_ENTER_GRAMS:
@@ -400,8 +537,11 @@ class SessionService:
             item_id = UUID(item_id_raw)
         except ValueError:
             return None
-        detail = self.meal_log_service.update_meal_item_grams(item_id, grams)
-        self.session_repository.update_session(
+        detail = await asyncio.to_thread(
+            self.meal_log_service.update_meal_item_grams, item_id, grams
+        )
+        self.stats_service.invalidate_user(session.user_id)
+        await self._update_session(
             session.id, status=STATUS_COMPLETED, context=dict(session.context)
         )
         if detail is None:
@@ -409,7 +549,8 @@ class SessionService:
         before = _edit_item_snapshot(session.context, item_id)
         after = _detail_item_snapshot(detail, item_id)
         if before or after:
-            self.audit_service.record_event(
+            await asyncio.to_thread(
+                self.audit_service.record_event,
                 user_id=session.user_id,
                 entity_type="meal_item",
                 entity_id=item_id,
@@ -419,16 +560,16 @@ class SessionService:
             )
         return SessionPrompt(text=_format_meal_detail(detail))
 
-    def _handle_library_callback(
+    async def _handle_library_callback(
         self, session: SessionRecord, action: str, _payload: str | None
     ) -> SessionPrompt | None:
         context = dict(session.context)
         if action == "basis_100":
-            return self._set_manual_basis(session.id, context, "per100g")
+            return await self._set_manual_basis(session.id, context, "per100g")
         if action == "basis_serv":
-            return self._set_manual_basis(session.id, context, "perServing")
+            return await self._set_manual_basis(session.id, context, "perServing")
         if action.startswith("store_"):
-            return self._set_manual_store(session.id, context, action)
+            return await self._set_manual_store(session.id, context, action)
         return None
 
     async def _handle_library_text(
@@ -443,10 +584,12 @@ class SessionService:
             return await self._handle_photo_text(session, text)
         return None
 
-    def _cancel_session(self, session: SessionRecord) -> SessionPrompt:
+    async def _cancel_session(self, session: SessionRecord) -> SessionPrompt:
         if session.photo_id:
-            self.photo_repository.delete_photo(session.photo_id)
-        self.session_repository.update_session(
+            await asyncio.to_thread(
+                self.photo_repository.delete_photo, session.photo_id
+            )
+        await self._update_session(
             session.id,
             status=STATUS_CANCELLED,
             context=dict(session.context),
@@ -462,16 +605,16 @@ class SessionService:
         await self._ensure_candidates(context)
         options = context.get("candidate_options", [])
         if not isinstance(options, list) or not options:
-            self.session_repository.update_session(
+            await self._update_session(
                 session_id, status=STATUS_AWAITING_MANUAL_NAME, context=context
             )
             return SessionPrompt(text="What is the item? Reply with a name.")
         top = options[0]
         if isinstance(top, dict) and top.get("type") == "manual":
-            return self._set_manual_target(session_id, context)
+            return await self._set_manual_target(session_id, context)
         label = _current_item_label(context)
         choice = str(top.get("label", "this item"))
-        self.session_repository.update_session(
+        await self._update_session(
             session_id, status=STATUS_AWAITING_ITEM_CONFIRMATION, context=context
         )
         return SessionPrompt(
@@ -484,7 +627,7 @@ class SessionService:
             ),
         )
 
-    def _prompt_item_selection(
+    async def _prompt_item_selection(
         self, session_id: UUID, context: dict[str, object]
     ) -> SessionPrompt:
         options = context.get("candidate_options", [])
@@ -497,7 +640,7 @@ class SessionService:
                 buttons.append(
                     (label, _callback_data(session_id, "choose", str(index)))
                 )
-        self.session_repository.update_session(
+        await self._update_session(
             session_id, status=STATUS_AWAITING_ITEM_SELECTION, context=context
         )
         label = _current_item_label(context)
@@ -523,10 +666,10 @@ class SessionService:
                 option.get("label"),
             )
         if option_type == "manual":
-            return self._set_manual_target(session_id, context)
+            return await self._set_manual_target(session_id, context)
         if option_type == "library":
             _set_item_food(context, option)
-            self.session_repository.update_session(
+            await self._update_session(
                 session_id, status=STATUS_AWAITING_PORTION_CHOICE, context=context
             )
             return _portion_prompt(session_id, context)
@@ -537,7 +680,7 @@ class SessionService:
                     details = await self.nutrition_service.get_food(fdc_id)
                 except Exception:
                     _logger.exception("FDC get failed: fdc_id=%s", fdc_id)
-                    prompt = self._prompt_item_selection(session_id, context)
+                    prompt = await self._prompt_item_selection(session_id, context)
                     return SessionPrompt(
                         text=(
                             "USDA lookup timed out. "
@@ -559,13 +702,13 @@ class SessionService:
                     }
                 )
                 _set_item_food(context, option)
-                self.session_repository.update_session(
+                await self._update_session(
                     session_id, status=STATUS_AWAITING_PORTION_CHOICE, context=context
                 )
                 return _portion_prompt(session_id, context)
         return None
 
-    def _set_manual_target(
+    async def _set_manual_target(
         self, session_id: UUID, context: dict[str, object]
     ) -> SessionPrompt:
         manual = {
@@ -573,31 +716,31 @@ class SessionService:
             "item_index": context.get("current_index"),
         }
         context["manual"] = manual
-        self.session_repository.update_session(
+        await self._update_session(
             session_id, status=STATUS_AWAITING_MANUAL_NAME, context=context
         )
         label = _current_item_label(context)
         return SessionPrompt(text=f"Enter the name for {label}.")
 
-    def _set_manual_basis(
+    async def _set_manual_basis(
         self, session_id: UUID, context: dict[str, object], basis: str
     ) -> SessionPrompt:
         manual = dict(context.get("manual", {}))
         manual["basis"] = basis
         context["manual"] = manual
         if basis == "perServing":
-            self.session_repository.update_session(
+            await self._update_session(
                 session_id, status=STATUS_AWAITING_MANUAL_SERVING, context=context
             )
             return SessionPrompt(text="Enter the serving size in grams.")
-        self.session_repository.update_session(
+        await self._update_session(
             session_id, status=STATUS_AWAITING_MANUAL_MACROS, context=context
         )
         return SessionPrompt(
             text="Enter calories, protein, fat, carbs per 100g (e.g., 200, 10, 5, 30)."
         )
 
-    def _set_manual_store(
+    async def _set_manual_store(
         self, session_id: UUID, context: dict[str, object], action: str
     ) -> SessionPrompt:
         store = {
@@ -609,7 +752,7 @@ class SessionService:
         manual = dict(context.get("manual", {}))
         manual["store"] = store
         context["manual"] = manual
-        self.session_repository.update_session(
+        await self._update_session(
             session_id, status=STATUS_AWAITING_MANUAL_BASIS, context=context
         )
         name = str(manual.get("name", "item"))
@@ -643,7 +786,8 @@ class SessionService:
                 macros[0],
             )
         if manual.get("target") == "library":
-            self.library_service.create_manual_food(
+            await asyncio.to_thread(
+                self.library_service.create_manual_food,
                 user_id=_require_user_id(context),
                 payload={
                     "name": name,
@@ -659,13 +803,13 @@ class SessionService:
                     "carbs_g": macros[3],
                 },
             )
-            self.session_repository.update_session(
+            await self._update_session(
                 session_id, status=STATUS_COMPLETED, context=context
             )
             return context
 
         _set_item_food(context, food_payload)
-        self.session_repository.update_session(
+        await self._update_session(
             session_id, status=STATUS_AWAITING_PORTION_CHOICE, context=context
         )
         return context
@@ -676,7 +820,7 @@ class SessionService:
         item = _current_item(context)
         estimate = _estimate_grams(item)
         if estimate is None:
-            self.session_repository.update_session(
+            await self._update_session(
                 session_id, status=STATUS_AWAITING_MANUAL_GRAMS, context=context
             )
             return SessionPrompt(text="Enter grams for the item.")
@@ -704,7 +848,7 @@ class SessionService:
                 len(summary.items),
                 summary.total_calories,
             )
-        self.session_repository.update_session(
+        await self._update_session(
             session_id, status=STATUS_AWAITING_SAVE, context=context
         )
         return SessionPrompt(
@@ -722,7 +866,9 @@ class SessionService:
         item = _current_item(context)
         label = _item_label(item)
         user_id = _require_user_id(context)
-        library = self.library_service.search(user_id, label, limit=3)
+        library = await asyncio.to_thread(
+            self.library_service.search, user_id, label, limit=3
+        )
         try:
             fdc = await self.nutrition_service.search(label, limit=3)
         except Exception:
@@ -1089,9 +1235,10 @@ def _edit_item_snapshot(
     context: dict[str, object], item_id: UUID
 ) -> dict[str, object] | None:
     items = context.get("edit_items", [])
+    item_id_str = str(item_id)
     if isinstance(items, list):
         for item in items:
-            if isinstance(item, dict) and item.get("id") == str(item_id):
+            if isinstance(item, dict) and item.get("id") == item_id_str:
                 return {
                     "name": item.get("name"),
                     "grams": item.get("grams"),
@@ -1,27 +1,46 @@
 """Statistics service for meal logs."""
 
-from dataclasses import dataclass
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from datetime import UTC, date, datetime, timedelta
-from typing import Protocol
+from typing import Protocol, cast
 from uuid import UUID
 from zoneinfo import ZoneInfo
 
-from nutrition_tracker.domain.stats import DailyTotals, MealLogRow
+from nutrition_tracker.domain.stats import DailyTotals, MealLogRow, UserLogActivity
+from nutrition_tracker.services.cache import Cache, InMemoryCache
 
 DECEMBER = 12
+_GENERATION_TTL_SECONDS = 2 * 24 * 60 * 60
 
 
 class StatsRepository(Protocol):
     """Persistence interface for meal log statistics."""
 
+    __slots__ = ()
+
     def list_meal_logs(
         self, user_id: UUID, start: datetime, end: datetime
     ) -> list[MealLogRow]:
         """Return meal logs within a time range."""
 
+    def list_daily_totals(
+        self, user_id: UUID, start: datetime, end: datetime, timezone_name: str
+    ) -> list[DailyTotals]:
+        """Return per-day totals within a time range in the given timezone."""
+
     def list_recent_meal_logs(self, user_id: UUID, limit: int) -> list[MealLogRow]:
         """Return recent meal logs."""
 
+    def aggregate_user_logs(
+        self,
+        user_ids: list[UUID],
+        start_7d: datetime,
+        start_30d: datetime,
+        end: datetime,
+    ) -> dict[UUID, UserLogActivity]:
+        """Return 7- and 30-day activity per user; idle users are omitted."""
+
 
 @dataclass
 class PeriodSummary:
@@ -36,66 +55,144 @@ class PeriodSummary:
 
 @dataclass
 class StatsService:
-    """Service for computing user stats by timezone."""
+    """Service for computing user stats by timezone.
+
+    Results are cached per process, so the TTL stays short: a meal logged
+    through another instance shows up here within `ttl_seconds`.
+    """
 
     repository: StatsRepository
+    cache: Cache = field(default_factory=InMemoryCache)
+    ttl_seconds: int = 60
 
     def get_today(self, user_id: UUID, timezone_name: str) -> DailyTotals:
         """Return today's totals in the user's timezone."""
-        tz = ZoneInfo(timezone_name)
-        now = datetime.now(tz=tz)
-        start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        end = start + timedelta(days=1)
-        logs = self.repository.list_meal_logs(
-            user_id, start.astimezone(UTC), end.astimezone(UTC)
+        now = datetime.now(tz=ZoneInfo(timezone_name))
+        return self._cached(
+            user_id,
+            "today",
+            timezone_name,
+            now,
+            lambda: self._load_today(user_id, timezone_name, now),
         )
-        return _aggregate_day(start.date(), logs, tz)
 
     def get_today_with_logs(
         self, user_id: UUID, timezone_name: str
     ) -> tuple[DailyTotals, list[MealLogRow]]:
         """Return today's totals and meal logs."""
-        tz = ZoneInfo(timezone_name)
-        now = datetime.now(tz=tz)
+        now = datetime.now(tz=ZoneInfo(timezone_name))
+        return self._cached(
+            user_id,
+            "today_logs",
+            timezone_name,
+            now,
+            lambda: self._load_today_with_logs(user_id, timezone_name, now),
+        )
+
+    def get_week(self, user_id: UUID, timezone_name: str) -> PeriodSummary:
+        """Return week-to-date totals and averages."""
+        now = datetime.now(tz=ZoneInfo(timezone_name))
+        return self._cached(
+            user_id,
+            "week",
+            timezone_name,
+            now,
+            lambda: self._load_week(user_id, timezone_name, now),
+        )
+
+    def get_month(self, user_id: UUID, timezone_name: str) -> PeriodSummary:
+        """Return month-to-date totals and averages."""
+        now = datetime.now(tz=ZoneInfo(timezone_name))
+        return self._cached(
+            user_id,
+            "month",
+            timezone_name,
+            now,
+            lambda: self._load_month(user_id, timezone_name, now),
+        )
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        """Drop cached stats for a user after their meal logs change."""
+        self.cache.set(
+            f"stats:{user_id}:generation",
+            self._generation(user_id) + 1,
+            ttl_seconds=_GENERATION_TTL_SECONDS,
+        )
+
+    def get_history(self, user_id: UUID, limit: int = 10) -> list[MealLogRow]:
+        """Return recent meal logs."""
+        return self.repository.list_recent_meal_logs(user_id, limit)
+
+    def _cached[T](
+        self,
+        user_id: UUID,
+        period: str,
+        timezone_name: str,
+        now: datetime,
+        load: Callable[[], T],
+    ) -> T:
+        generation = self._generation(user_id)
+        cache_key = (
+            f"stats:{user_id}:{generation}:{period}:{timezone_name}:"
+            f"{now.date().isoformat()}"
+        )
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cast("T", cached)
+        value = load()
+        self.cache.set(cache_key, value, ttl_seconds=self.ttl_seconds)
+        return value
+
+    def _generation(self, user_id: UUID) -> int:
+        generation = self.cache.get(f"stats:{user_id}:generation")
+        return generation if isinstance(generation, int) else 0
+
+    def _load_today(
+        self, user_id: UUID, timezone_name: str, now: datetime
+    ) -> DailyTotals:
+        start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        end = start + timedelta(days=1)
+        daily = self.repository.list_daily_totals(
+            user_id, start.astimezone(UTC), end.astimezone(UTC), timezone_name
+        )
+        return _fill_days(start, 1, daily)[0]
+
+    def _load_today_with_logs(
+        self, user_id: UUID, timezone_name: str, now: datetime
+    ) -> tuple[DailyTotals, list[MealLogRow]]:
         start = now.replace(hour=0, minute=0, second=0, microsecond=0)
         end = start + timedelta(days=1)
         logs = self.repository.list_meal_logs(
             user_id, start.astimezone(UTC), end.astimezone(UTC)
         )
-        totals = _aggregate_day(start.date(), logs, tz)
+        totals = _aggregate_day(start.date(), logs, ZoneInfo(timezone_name))
         return totals, logs
 
-    def get_week(self, user_id: UUID, timezone_name: str) -> PeriodSummary:
-        """Return week-to-date totals and averages."""
-        tz = ZoneInfo(timezone_name)
-        now = datetime.now(tz=tz)
+    def _load_week(
+        self, user_id: UUID, timezone_name: str, now: datetime
+    ) -> PeriodSummary:
         start = (now - timedelta(days=now.weekday())).replace(
             hour=0, minute=0, second=0, microsecond=0
         )
         end = start + timedelta(days=7)
-        logs = self.repository.list_meal_logs(
-            user_id, start.astimezone(UTC), end.astimezone(UTC)
+        daily = self.repository.list_daily_totals(
+            user_id, start.astimezone(UTC), end.astimezone(UTC), timezone_name
         )
-        return _aggregate_period(start, 7, logs, tz)
+        return _summarize_period(start, _fill_days(start, 7, daily))
 
-    def get_month(self, user_id: UUID, timezone_name: str) -> PeriodSummary:
-        """Return month-to-date totals and averages."""
-        tz = ZoneInfo(timezone_name)
-        now = datetime.now(tz=tz)
+    def _load_month(
+        self, user_id: UUID, timezone_name: str, now: datetime
+    ) -> PeriodSummary:
         start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
         if start.month == DECEMBER:
             end = start.replace(year=start.year + 1, month=1)
         else:
             end = start.replace(month=start.month + 1)
         days = (end - start).days
-        logs = self.repository.list_meal_logs(
-            user_id, start.astimezone(UTC), end.astimezone(UTC)
+        daily = self.repository.list_daily_totals(
+            user_id, start.astimezone(UTC), end.astimezone(UTC), timezone_name
         )
-        return _aggregate_period(start, days, logs, tz)
-
-    def get_history(self, user_id: UUID, limit: int = 10) -> list[MealLogRow]:
-        """Return recent meal logs."""
-        return self.repository.list_recent_meal_logs(user_id, limit)
+        return _summarize_period(start, _fill_days(start, days, daily))
 
 
 def _aggregate_day(day: date, logs: list[MealLogRow], tz: ZoneInfo) -> DailyTotals:
@@ -114,14 +211,21 @@ def _aggregate_day(day: date, logs: list[MealLogRow], tz: ZoneInfo) -> DailyTota
     return total
 
 
-def _aggregate_period(
-    start: datetime, days: int, logs: list[MealLogRow], tz: ZoneInfo
-) -> PeriodSummary:
+def _fill_days(
+    start: datetime, days: int, totals: list[DailyTotals]
+) -> list[DailyTotals]:
+    by_day = {entry.day: entry for entry in totals}
     daily = []
     for offset in range(days):
         day = (start + timedelta(days=offset)).date()
-        daily.append(_aggregate_day(day, logs, tz))
+        daily.append(
+            by_day.get(day)
+            or DailyTotals(day=day, calories=0, protein_g=0, fat_g=0, carbs_g=0)
+        )
+    return daily
+
 
+def _summarize_period(start: datetime, daily: list[DailyTotals]) -> PeriodSummary:
     total_days = max(len(daily), 1)
     totals = DailyTotals(day=start.date(), calories=0, protein_g=0, fat_g=0, carbs_g=0)
     for entry in daily:
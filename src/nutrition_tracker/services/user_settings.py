@@ -1,13 +1,17 @@
 """User settings service."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Protocol
 from uuid import UUID
 
+from nutrition_tracker.services.cache import Cache, InMemoryCache
+
 
 class UserSettingsRepository(Protocol):
     """Persistence interface for user settings."""
 
+    __slots__ = ()
+
     def get_timezone(self, user_id: UUID) -> str | None:
         """Return the user's timezone if set."""
 
@@ -20,15 +24,32 @@ class UserSettingsService:
     """Service for user settings."""
 
     repository: UserSettingsRepository
+    cache: Cache = field(default_factory=InMemoryCache)
+    timezone_ttl_seconds: int = 300
 
     def get_timezone(self, user_id: UUID) -> str:
         """Return the user timezone or UTC if unset."""
-        return self.repository.get_timezone(user_id) or "UTC"
+        return self._stored_timezone(user_id) or "UTC"
 
     def set_timezone(self, user_id: UUID, timezone: str) -> None:
         """Persist a user's timezone."""
         self.repository.set_timezone(user_id, timezone)
+        self.cache.set(
+            f"timezone:{user_id}", timezone, ttl_seconds=self.timezone_ttl_seconds
+        )
 
     def is_timezone_set(self, user_id: UUID) -> bool:
         """Return True when the user's timezone is configured."""
-        return self.repository.get_timezone(user_id) is not None
+        return self._stored_timezone(user_id) is not None
+
+    def _stored_timezone(self, user_id: UUID) -> str | None:
+        cache_key = f"timezone:{user_id}"
+        cached = self.cache.get(cache_key)
+        if isinstance(cached, str):
+            return cached
+        timezone = self.repository.get_timezone(user_id)
+        # Only cache a real timezone: one set through another instance must show
+        # up on the next lookup here.
+        if timezone:
+            self.cache.set(cache_key, timezone, ttl_seconds=self.timezone_ttl_seconds)
+        return timezone
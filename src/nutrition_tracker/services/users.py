@@ -1,41 +1,61 @@
 """User-related business logic."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Protocol
 from uuid import UUID
 
 from nutrition_tracker.domain.models import UserRecord
+from nutrition_tracker.services.cache import Cache, InMemoryCache
 
 
 class UserRepository(Protocol):
     """Persistence interface for user data."""
 
+    __slots__ = ()
+
     def get_by_telegram_id(self, telegram_user_id: int) -> UserRecord | None:
         """Return the user for a Telegram user id, if present."""
 
-    def create_user(self, telegram_user_id: int) -> UserRecord:
-        """Create and return a new user record."""
-
-    def create_settings(self, user_id: UUID, timezone: str | None) -> None:
-        """Create initial settings for a user."""
+    def create_user_with_settings(
+        self, telegram_user_id: int, timezone: str | None
+    ) -> UserRecord:
+        """Create a user with its initial settings and return the user."""
 
     def touch_last_active(self, user_id: UUID) -> None:
         """Update the last active timestamp for the user."""
 
+    def flush_last_active(self) -> None:
+        """Write any buffered last active timestamps."""
+
 
 @dataclass
 class UserService:
     """Application service for user lifecycle actions."""
 
     repository: UserRepository
+    cache: Cache = field(default_factory=InMemoryCache)
+    user_ttl_seconds: int = 300
 
     def ensure_user(self, telegram_user_id: int) -> UserRecord:
         """Ensure a user exists for the Telegram id and return it."""
-        existing = self.repository.get_by_telegram_id(telegram_user_id)
+        cache_key = f"user:telegram:{telegram_user_id}"
+        cached = self.cache.get(cache_key)
+        existing = (
+            cached
+            if isinstance(cached, UserRecord)
+            else self.repository.get_by_telegram_id(telegram_user_id)
+        )
         if existing:
             self.repository.touch_last_active(existing.id)
+            self.cache.set(cache_key, existing, ttl_seconds=self.user_ttl_seconds)
             return existing
 
-        created = self.repository.create_user(telegram_user_id)
-        self.repository.create_settings(created.id, timezone=None)
+        created = self.repository.create_user_with_settings(
+            telegram_user_id, timezone=None
+        )
+        self.cache.set(cache_key, created, ttl_seconds=self.user_ttl_seconds)
         return created
+
+    def flush_last_active(self) -> None:
+        """Persist last active timestamps buffered by the repository."""
+        self.repository.flush_last_active()
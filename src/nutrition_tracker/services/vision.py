@@ -1,6 +1,7 @@
 """Vision extraction service using LLMs."""
 
 import base64
+from collections.abc import AsyncIterable
 from dataclasses import dataclass
 from typing import Protocol
 
@@ -40,9 +41,14 @@ VISION_SCHEMA: dict[str, object] = {
 }
 
 
+_MIME_SNIFF_BYTES = 12
+
+
 class VisionClient(Protocol):
     """Interface for LLM vision extraction."""
 
+    __slots__ = ()
+
     async def extract(  # noqa: PLR0913
         self,
         *,
@@ -67,7 +73,10 @@ class VisionService:
 
     async def extract(self, image_bytes: bytes) -> VisionExtract:
         """Extract food items from an image via the configured client."""
-        data_url = _to_data_url(image_bytes)
+        return await self.extract_data_url(_to_data_url(image_bytes))
+
+    async def extract_data_url(self, data_url: str) -> VisionExtract:
+        """Extract food items from an already encoded image data URL."""
         prompt = (
             "Identify food items in the image. "
             "Return each item with a short label, confidence (0-1), "
@@ -91,6 +100,24 @@ def _to_data_url(image_bytes: bytes) -> str:
     return f"data:{mime_type};base64,{encoded}"
 
 
+async def stream_to_data_url(chunks: AsyncIterable[bytes]) -> str:
+    """Base64-encode streamed image bytes into a data URL as they arrive."""
+    head = bytearray()
+    pending = bytearray()
+    encoded: list[bytes] = []
+    async for chunk in chunks:
+        if len(head) < _MIME_SNIFF_BYTES:
+            head.extend(chunk[: _MIME_SNIFF_BYTES - len(head)])
+        pending.extend(chunk)
+        aligned = len(pending) - len(pending) % 3
+        if aligned:
+            encoded.append(base64.b64encode(pending[:aligned]))
+            del pending[:aligned]
+    encoded.append(base64.b64encode(pending))
+    prefix = f"data:{_detect_mime_type(bytes(head))};base64,"
+    return prefix + b"".join(encoded).decode("ascii")
+
+
 def _detect_mime_type(image_bytes: bytes) -> str:
     """Infer a basic image MIME type from file signatures."""
     if image_bytes.startswith(b"\xff\xd8\xff"):
@@ -0,0 +1,11 @@
+create or replace function increment_food_use_count(
+    p_food_id uuid,
+    p_used_at timestamptz
+) returns void
+language sql
+as $$
+    update foods_user_library
+    set use_count = use_count + 1,
+        last_used_at = p_used_at
+    where id = p_food_id;
+$$;
@@ -0,0 +1,9 @@
+create or replace view foods_user_library_search
+with (security_invoker = true)
+as
+select
+    f.*,
+    coalesce(string_agg(a.alias_text, E'\n'), '') as alias_texts
+from foods_user_library f
+left join food_aliases a on a.food_id = f.id
+group by f.id;
@@ -0,0 +1,68 @@
+create or replace function create_meal_log_with_items(
+    p_user_id uuid,
+    p_logged_at timestamptz,
+    p_items jsonb
+) returns uuid
+language plpgsql
+as $$
+declare
+    v_meal_log_id uuid;
+begin
+    insert into meal_logs (
+        user_id,
+        logged_at,
+        total_calories,
+        total_protein_g,
+        total_fat_g,
+        total_carbs_g
+    )
+    select
+        p_user_id,
+        p_logged_at,
+        coalesce(sum(i.item_calories), 0),
+        coalesce(sum(i.item_protein_g), 0),
+        coalesce(sum(i.item_fat_g), 0),
+        coalesce(sum(i.item_carbs_g), 0)
+    from jsonb_to_recordset(p_items) as i(
+        item_calories numeric,
+        item_protein_g numeric,
+        item_fat_g numeric,
+        item_carbs_g numeric
+    )
+    returning id into v_meal_log_id;
+
+    insert into meal_items (
+        meal_log_id,
+        food_id,
+        name_snapshot,
+        nutrition_snapshot,
+        portion_grams,
+        item_calories,
+        item_protein_g,
+        item_fat_g,
+        item_carbs_g
+    )
+    select
+        v_meal_log_id,
+        i.food_id,
+        i.name_snapshot,
+        i.nutrition_snapshot,
+        i.portion_grams,
+        i.item_calories,
+        i.item_protein_g,
+        i.item_fat_g,
+        i.item_carbs_g
+    from jsonb_to_recordset(p_items) as i(
+        food_id uuid,
+        name_snapshot text,
+        nutrition_snapshot jsonb,
+        portion_grams numeric,
+        item_calories numeric,
+        item_protein_g numeric,
+        item_fat_g numeric,
+        item_carbs_g numeric
+    );
+
+    return v_meal_log_id;
+end;
+$$;
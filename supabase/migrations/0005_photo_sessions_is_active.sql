@@ -0,0 +1,7 @@
+alter table photo_sessions
+    add column if not exists is_active boolean
+    generated always as (status not in ('COMPLETED', 'CANCELLED')) stored;
+
+create index if not exists idx_photo_sessions_active_user
+    on photo_sessions(user_id, created_at desc)
+    where is_active;
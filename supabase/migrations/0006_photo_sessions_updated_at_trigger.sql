@@ -0,0 +1,7 @@
+create extension if not exists moddatetime schema extensions;
+
+drop trigger if exists set_photo_sessions_updated_at on photo_sessions;
+create trigger set_photo_sessions_updated_at
+    before update on photo_sessions
+    for each row
+    execute function extensions.moddatetime(updated_at);
@@ -0,0 +1,31 @@
+create index if not exists idx_meal_logs_user_id_logged_at
+    on meal_logs(user_id, logged_at);
+
+create or replace function meal_log_daily_stats(
+    p_user_id uuid,
+    p_start timestamptz,
+    p_end timestamptz,
+    p_timezone text
+) returns table (
+    day date,
+    calories float8,
+    protein_g float8,
+    fat_g float8,
+    carbs_g float8
+)
+language sql
+stable
+as $$
+    select
+        (logged_at at time zone p_timezone)::date as day,
+        sum(total_calories)::float8,
+        sum(total_protein_g)::float8,
+        sum(total_fat_g)::float8,
+        sum(total_carbs_g)::float8
+    from meal_logs
+    where user_id = p_user_id
+      and logged_at >= p_start
+      and logged_at < p_end
+    group by 1
+    order by 1;
+$$;
@@ -0,0 +1,15 @@
+drop trigger if exists set_user_settings_updated_at on user_settings;
+create trigger set_user_settings_updated_at
+    before update on user_settings
+    for each row
+    execute function extensions.moddatetime(updated_at);
+
+create or replace function touch_users_last_active(
+    p_user_ids uuid[]
+) returns void
+language sql
+as $$
+    update users
+    set last_active_at = now()
+    where id = any(p_user_ids);
+$$;
@@ -0,0 +1,22 @@
+create or replace function create_user_with_settings(
+    p_telegram_user_id bigint,
+    p_timezone text
+) returns users
+language plpgsql
+as $$
+declare
+    v_user users;
+begin
+    insert into users (telegram_user_id)
+    values (p_telegram_user_id)
+    on conflict (telegram_user_id)
+        do update set telegram_user_id = excluded.telegram_user_id
+    returning * into v_user;
+
+    insert into user_settings (user_id, timezone)
+    values (v_user.id, p_timezone)
+    on conflict (user_id) do nothing;
+
+    return v_user;
+end;
+$$;
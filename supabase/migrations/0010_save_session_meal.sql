@@ -0,0 +1,28 @@
+create or replace function save_session_meal(
+    p_session_id uuid,
+    p_context jsonb,
+    p_user_id uuid,
+    p_logged_at timestamptz,
+    p_items jsonb
+) returns uuid
+language plpgsql
+as $$
+declare
+    v_meal_log_id uuid;
+    v_photo_id uuid;
+begin
+    v_meal_log_id := create_meal_log_with_items(p_user_id, p_logged_at, p_items);
+
+    update photo_sessions
+    set status = 'COMPLETED',
+        context_json = p_context
+    where id = p_session_id
+    returning photo_id into v_photo_id;
+
+    if v_photo_id is not null then
+        delete from photos where id = v_photo_id;
+    end if;
+
+    return v_meal_log_id;
+end;
+$$;
@@ -0,0 +1,27 @@
+create or replace function meal_log_user_activity(
+    p_user_ids uuid[],
+    p_start_7d timestamptz,
+    p_start_30d timestamptz,
+    p_end timestamptz
+) returns table (
+    user_id uuid,
+    logs_7d int,
+    logs_30d int,
+    calories_7d float8
+)
+language sql
+stable
+as $$
+    select
+        m.user_id,
+        (count(*) filter (where m.logged_at >= p_start_7d))::int,
+        count(*)::int,
+        coalesce(
+            sum(m.total_calories) filter (where m.logged_at >= p_start_7d), 0
+        )::float8
+    from meal_logs m
+    where m.user_id = any(p_user_ids)
+      and m.logged_at >= p_start_30d
+      and m.logged_at < p_end
+    group by m.user_id;
+$$;
@@ -9,9 +9,13 @@ os.environ.setdefault("ADMIN_TOKEN", "test-admin")
 os.environ.setdefault("OPENAI_API_KEY", "test-openai")
 os.environ.setdefault("FDC_API_KEY", "test-fdc")
 
+from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
+from types import MappingProxyType
 from uuid import UUID, uuid4
+from zoneinfo import ZoneInfo
 
+import orjson
 import pytest
 
 from nutrition_tracker.adapters.fdc_client import FdcClient
@@ -22,8 +26,9 @@ from nutrition_tracker.domain.admin import AdminUser
 from nutrition_tracker.domain.library import LibraryFood
 from nutrition_tracker.domain.meals import MealItemRecord, MealItemSnapshot
 from nutrition_tracker.domain.models import UserRecord
+from nutrition_tracker.domain.nutrition import MacroProfile
 from nutrition_tracker.domain.sessions import SessionRecord
-from nutrition_tracker.domain.stats import MealLogRow
+from nutrition_tracker.domain.stats import DailyTotals, MealLogRow, UserLogActivity
 from nutrition_tracker.services.admin import AdminRepository, AdminService
 from nutrition_tracker.services.audit import AuditRepository, AuditService
 from nutrition_tracker.services.cache import InMemoryCache
@@ -52,6 +57,7 @@ class InMemoryUserRepository(UserRepository):
     users: dict[int, UserRecord] = field(default_factory=dict)
     settings: set[UUID] = field(default_factory=set)
     touched: list[UUID] = field(default_factory=list)
+    flushes: int = 0
 
     def get_by_telegram_id(self, telegram_user_id: int) -> UserRecord | None:
         return self.users.get(telegram_user_id)
@@ -61,12 +67,19 @@ class InMemoryUserRepository(UserRepository):
         self.users[telegram_user_id] = user
         return user
 
-    def create_settings(self, user_id: UUID, timezone: str | None) -> None:
-        self.settings.add(user_id)
+    def create_user_with_settings(
+        self, telegram_user_id: int, timezone: str | None
+    ) -> UserRecord:
+        user = self.create_user(telegram_user_id)
+        self.settings.add(user.id)
+        return user
 
     def touch_last_active(self, user_id: UUID) -> None:
         self.touched.append(user_id)
 
+    def flush_last_active(self) -> None:
+        self.flushes += 1
+
 
 @dataclass
 class FakeTelegramClient(TelegramClient):
@@ -78,7 +91,10 @@ class FakeTelegramClient(TelegramClient):
     menu_button: dict[str, object] | None = None
 
     async def send_message(
-        self, chat_id: int, text: str, reply_markup: dict | None = None
+        self,
+        chat_id: int,
+        text: str,
+        reply_markup: dict | orjson.Fragment | None = None,
     ) -> None:
         self.messages.append((chat_id, text))
 
@@ -105,6 +121,9 @@ class FakeTelegramFileClient:
     async def download_file_bytes(self, file_id: str) -> bytes:
         return self.content
 
+    async def download_file_stream(self, file_id: str) -> AsyncIterator[bytes]:
+        yield self.content
+
 
 @dataclass
 class FakeVisionClient(VisionClient):
@@ -211,6 +230,10 @@ class InMemorySessionRepository(SessionRepository):
     """In-memory session repository for tests."""
 
     sessions: dict[UUID, SessionRecord] = field(default_factory=dict)
+    photo_repository: InMemoryPhotoRepository = field(
+        default_factory=InMemoryPhotoRepository
+    )
+    meal_log_repository: MealLogRepository | None = None
 
     def create_session(
         self,
@@ -224,7 +247,7 @@ class InMemorySessionRepository(SessionRepository):
             user_id=user_id,
             photo_id=photo_id,
             status=status,
-            context=context,
+            context=MappingProxyType(context),
         )
         self.sessions[session.id] = session
         return session
@@ -245,13 +268,29 @@ class InMemorySessionRepository(SessionRepository):
         self, session_id: UUID, status: str, context: dict[str, object]
     ) -> None:
         session = self.sessions[session_id]
+        if session.status in {"COMPLETED", "CANCELLED"}:
+            return
         self.sessions[session_id] = SessionRecord(
             id=session.id,
             user_id=session.user_id,
             photo_id=session.photo_id,
             status=status,
-            context=context,
+            context=MappingProxyType(context),
+        )
+
+    def complete_with_meal_log(
+        self, session: SessionRecord, logged_at, items: list[MealItemSnapshot]
+    ) -> UUID | None:
+        assert self.meal_log_repository is not None
+        if self.sessions[session.id].status in {"COMPLETED", "CANCELLED"}:
+            return None
+        meal_id = self.meal_log_repository.create_meal_log_with_items(
+            session.user_id, logged_at, items
         )
+        self.update_session(session.id, "COMPLETED", session.context)
+        if session.photo_id:
+            self.photo_repository.delete_photo(session.photo_id)
+        return meal_id
 
 
 @dataclass
@@ -366,23 +405,25 @@ class InMemoryMealLogRepository(MealLogRepository):
     meals: dict[UUID, dict[str, object]] = field(default_factory=dict)
     items: dict[UUID, MealItemRecord] = field(default_factory=dict)
 
-    def create_meal_log(self, user_id: UUID, logged_at, totals) -> UUID:
+    def create_meal_log_with_items(
+        self, user_id: UUID, logged_at, items: list[MealItemSnapshot]
+    ) -> UUID:
         meal_id = uuid4()
         self.meals[meal_id] = {
             "user_id": user_id,
             "logged_at": logged_at,
-            "totals": totals,
+            "totals": MacroProfile(
+                calories=sum(item.calories for item in items),
+                protein_g=sum(item.protein_g for item in items),
+                fat_g=sum(item.fat_g for item in items),
+                carbs_g=sum(item.carbs_g for item in items),
+            ),
         }
-        return meal_id
-
-    def create_meal_items(
-        self, meal_log_id: UUID, items: list[MealItemSnapshot]
-    ) -> None:
         for item in items:
             item_id = uuid4()
             self.items[item_id] = MealItemRecord(
                 id=item_id,
-                meal_log_id=meal_log_id,
+                meal_log_id=meal_id,
                 food_id=item.food_id,
                 name=item.name,
                 grams=item.grams,
@@ -392,6 +433,7 @@ class InMemoryMealLogRepository(MealLogRepository):
                 carbs_g=item.carbs_g,
                 nutrition_snapshot=item.nutrition_snapshot or {},
             )
+        return meal_id
 
     def get_meal_log(self, meal_log_id: UUID):
         meal = self.meals.get(meal_log_id)
@@ -441,9 +483,42 @@ class InMemoryStatsRepository(StatsRepository):
     def list_meal_logs(self, user_id: UUID, start, end) -> list[MealLogRow]:
         return [log for log in self.logs if start <= log.logged_at <= end]
 
+    def list_daily_totals(
+        self, user_id: UUID, start, end, timezone_name: str
+    ) -> list[DailyTotals]:
+        tz = ZoneInfo(timezone_name)
+        totals = {}
+        for log in self.list_meal_logs(user_id, start, end):
+            if log.logged_at >= end:
+                continue
+            day = log.logged_at.astimezone(tz).date()
+            current = totals.get(day) or DailyTotals(
+                day=day, calories=0, protein_g=0, fat_g=0, carbs_g=0
+            )
+            totals[day] = DailyTotals(
+                day=day,
+                calories=current.calories + log.total_calories,
+                protein_g=current.protein_g + log.total_protein_g,
+                fat_g=current.fat_g + log.total_fat_g,
+                carbs_g=current.carbs_g + log.total_carbs_g,
+            )
+        return sorted(totals.values(), key=lambda entry: entry.day)
+
     def list_recent_meal_logs(self, user_id: UUID, limit: int) -> list[MealLogRow]:
         return sorted(self.logs, key=lambda log: log.logged_at, reverse=True)[:limit]
 
+    def aggregate_user_logs(
+        self, user_ids: list[UUID], start_7d, start_30d, end
+    ) -> dict[UUID, UserLogActivity]:
+        logs_30d = [log for log in self.logs if start_30d <= log.logged_at < end]
+        logs_7d = [log for log in logs_30d if log.logged_at >= start_7d]
+        activity = UserLogActivity(
+            logs_last_7d=len(logs_7d),
+            logs_last_30d=len(logs_30d),
+            calories_last_7d=sum(log.total_calories for log in logs_7d),
+        )
+        return dict.fromkeys(user_ids, activity)
+
 
 @dataclass
 class InMemoryUserSettingsRepository(UserSettingsRepository):
@@ -470,11 +545,11 @@ class InMemoryAdminRepository(AdminRepository):
     def list_users(self) -> list[AdminUser]:
         return self.users
 
-    def list_sessions(self, limit: int) -> list[dict[str, object]]:
-        return self.sessions[:limit]
+    def list_sessions(self, limit: int, offset: int = 0) -> list[dict[str, object]]:
+        return self.sessions[offset : offset + limit]
 
-    def list_costs(self, limit: int) -> list[dict[str, object]]:
-        return self.costs[:limit]
+    def list_costs(self, limit: int, offset: int = 0) -> list[dict[str, object]]:
+        return self.costs[offset : offset + limit]
 
     def list_audit_events(self, user_id: UUID, limit: int) -> list[dict[str, object]]:
         return self.audits.get(user_id, [])[:limit]
@@ -537,7 +612,10 @@ def container(
 ) -> AppContainer:
     user_service = UserService(user_repository)
     photo_repository = InMemoryPhotoRepository()
-    session_repository = InMemorySessionRepository()
+    meal_log_repository = InMemoryMealLogRepository()
+    session_repository = InMemorySessionRepository(
+        photo_repository=photo_repository, meal_log_repository=meal_log_repository
+    )
     telegram_file_client = FakeTelegramFileClient()
     vision_service = VisionService(
         client=FakeVisionClient(),
@@ -553,9 +631,10 @@ def container(
     meal_log_service = MealLogService(
         nutrition_service=nutrition_service,
         library_service=library_service,
-        repository=InMemoryMealLogRepository(),
+        repository=meal_log_repository,
     )
     audit_service = AuditService(InMemoryAuditRepository())
+    stats_service = StatsService(InMemoryStatsRepository())
     session_service = SessionService(
         photo_repository=photo_repository,
         session_repository=session_repository,
@@ -563,8 +642,8 @@ def container(
         nutrition_service=nutrition_service,
         meal_log_service=meal_log_service,
         audit_service=audit_service,
+        stats_service=stats_service,
     )
-    stats_service = StatsService(InMemoryStatsRepository())
     user_settings_service = UserSettingsService(InMemoryUserSettingsRepository())
     start_handler = StartCommandHandler(
         user_service=user_service,
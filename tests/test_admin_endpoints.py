@@ -1,13 +1,14 @@
 """Tests for admin endpoints."""
 
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from uuid import uuid4
 
 from fastapi.testclient import TestClient
 
 from nutrition_tracker.api.app import create_app
 from nutrition_tracker.domain.admin import AdminUser
-from tests.conftest import InMemoryAdminRepository
+from nutrition_tracker.domain.stats import MealLogRow
+from tests.conftest import InMemoryAdminRepository, InMemoryStatsRepository
 
 
 def test_admin_users_endpoint(container) -> None:
@@ -30,6 +31,53 @@ def test_admin_users_endpoint(container) -> None:
     data = response.json()
     assert "users" in data
     assert data["users"][0]["telegram_user_id"] == 111
+    assert data["users"][0]["id"] == str(admin_repo.users[0].id)
+    last_active_at = admin_repo.users[0].last_active_at
+    assert last_active_at is not None
+    assert data["users"][0]["last_active_at"] == last_active_at.isoformat()
+
+
+def test_admin_users_endpoint_counts_recent_logs(container) -> None:
+    app = create_app(container)
+    client = TestClient(app)
+
+    admin_repo = container.admin_service.admin_repository
+    stats_repo = container.admin_service.stats_repository
+    assert isinstance(admin_repo, InMemoryAdminRepository)
+    assert isinstance(stats_repo, InMemoryStatsRepository)
+    admin_repo.users.append(
+        AdminUser(id=uuid4(), telegram_user_id=222, last_active_at=None)
+    )
+    now = datetime.now(tz=UTC)
+    stats_repo.logs = [
+        MealLogRow(
+            meal_id=uuid4(),
+            logged_at=now - timedelta(days=days_ago),
+            total_calories=700,
+            total_protein_g=0,
+            total_fat_g=0,
+            total_carbs_g=0,
+        )
+        for days_ago in (2, 20)
+    ]
+
+    response = client.get("/admin/users", headers={"X-Admin-Token": "admin-token"})
+
+    user = response.json()["users"][0]
+    assert user["logs_last_7d"] == 1
+    assert user["logs_last_30d"] == 2
+    assert user["avg_calories_7d"] == 100
+
+
+def test_admin_endpoint_rejects_wrong_token(container) -> None:
+    app = create_app(container)
+    client = TestClient(app)
+
+    missing = client.get("/admin/health")
+    wrong = client.get("/admin/health", headers={"X-Admin-Token": "admin-tokem"})
+
+    assert missing.status_code == 401
+    assert wrong.status_code == 401
 
 
 def test_admin_sessions_endpoint(container) -> None:
@@ -55,3 +103,125 @@ def test_admin_ui_endpoint(container) -> None:
 
     assert response.status_code == 200
     assert "Nutrition Tracker Admin" in response.text
+    assert response.headers["content-encoding"] == "gzip"
+
+    cached = client.get(
+        "/admin/ui", headers={"If-None-Match": response.headers["etag"]}
+    )
+
+    assert cached.status_code == 304
+
+
+def test_admin_overview_endpoint(container) -> None:
+    app = create_app(container)
+    client = TestClient(app)
+
+    admin_repo = container.admin_service.admin_repository
+    assert isinstance(admin_repo, InMemoryAdminRepository)
+    admin_repo.sessions.append({"id": "session-1", "status": "ACTIVE"})
+
+    response = client.get("/admin/overview", headers={"X-Admin-Token": "admin-token"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["users"] == []
+    assert data["sessions"][0]["id"] == "session-1"
+    assert data["usage"] == []
+
+
+def test_admin_user_detail_endpoint(container) -> None:
+    app = create_app(container)
+    client = TestClient(app)
+
+    user_id = uuid4()
+    admin_repo = container.admin_service.admin_repository
+    assert isinstance(admin_repo, InMemoryAdminRepository)
+    admin_repo.audits[user_id] = [{"id": "audit-1"}]
+
+    response = client.get(
+        f"/admin/users/{user_id}", headers={"X-Admin-Token": "admin-token"}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["user_id"] == str(user_id)
+    assert data["recent_meals"] == []
+    assert data["library"] == []
+    assert data["audit_events"] == [{"id": "audit-1"}]
+
+
+def test_admin_users_summary_is_cached(container) -> None:
+    admin_repo = container.admin_service.admin_repository
+    assert isinstance(admin_repo, InMemoryAdminRepository)
+
+    first = container.admin_service.list_users()
+    admin_repo.users.append(
+        AdminUser(id=uuid4(), telegram_user_id=222, last_active_at=None)
+    )
+    second = container.admin_service.list_users()
+
+    assert first == second == []
+
+
+def test_admin_user_detail_formats_meal_timestamps(container) -> None:
+    client = TestClient(create_app(container))
+    stats_repo = container.admin_service.stats_repository
+    assert isinstance(stats_repo, InMemoryStatsRepository)
+    logged_at = datetime(2024, 5, 1, 12, 30, 15, 250, tzinfo=UTC)
+    stats_repo.logs = [
+        MealLogRow(
+            meal_id=uuid4(),
+            logged_at=logged_at,
+            total_calories=500,
+            total_protein_g=30,
+            total_fat_g=10,
+            total_carbs_g=50,
+        )
+    ]
+
+    response = client.get(
+        f"/admin/users/{uuid4()}", headers={"X-Admin-Token": "admin-token"}
+    )
+
+    assert response.json()["recent_meals"][0]["logged_at"] == logged_at.isoformat()
+
+
+def test_admin_user_detail_row_shape(container) -> None:
+    client = TestClient(create_app(container))
+    user_id = uuid4()
+    stats_repo = container.admin_service.stats_repository
+    assert isinstance(stats_repo, InMemoryStatsRepository)
+    stats_repo.logs = [
+        MealLogRow(
+            meal_id=uuid4(),
+            logged_at=datetime.now(tz=UTC),
+            total_calories=500,
+            total_protein_g=30,
+            total_fat_g=10,
+            total_carbs_g=50,
+        )
+    ]
+    container.admin_service.library_repository.create_food(
+        user_id, {"name": "Rice", "source_type": "manual", "calories": 130}
+    )
+
+    response = client.get(
+        f"/admin/users/{user_id}", headers={"X-Admin-Token": "admin-token"}
+    )
+
+    data = response.json()
+    assert set(data["recent_meals"][0]) == {
+        "logged_at",
+        "total_calories",
+        "total_protein_g",
+        "total_fat_g",
+        "total_carbs_g",
+    }
+    assert set(data["library"][0]) == {
+        "id",
+        "name",
+        "brand",
+        "store",
+        "use_count",
+        "last_used_at",
+    }
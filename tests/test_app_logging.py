@@ -2,7 +2,9 @@
 
 import logging
 
-from nutrition_tracker.app_logging import configure_logging
+import orjson
+
+from nutrition_tracker.app_logging import JsonFormatter, configure_logging
 
 
 def test_configure_logging_idempotent() -> None:
@@ -17,3 +19,28 @@ def test_configure_logging_idempotent() -> None:
 
     assert first_count == 1
     assert second_count == 1
+
+
+def test_configure_logging_applies_level() -> None:
+    logger = logging.getLogger("nutrition_tracker")
+
+    configure_logging("DEBUG")
+
+    assert logger.level == logging.DEBUG
+    configure_logging()
+
+
+def test_json_formatter_keeps_extra_fields() -> None:
+    record = logging.LogRecord(
+        "nutrition_tracker.api", logging.ERROR, __file__, 1, "failed %s", ("x",), None
+    )
+    record.file_id = "abc"
+
+    payload = orjson.loads(JsonFormatter().format(record))
+
+    assert payload == {
+        "lvl": "ERROR",
+        "logger": "nutrition_tracker.api",
+        "msg": "failed x",
+        "file_id": "abc",
+    }
@@ -0,0 +1,71 @@
+"""Tests for shared client bootstrap."""
+
+import asyncio
+
+from nutrition_tracker import bootstrap
+from nutrition_tracker.bootstrap import (
+    create_supabase_http_client,
+    shared_openai_client,
+    shared_supabase_client,
+    warm,
+)
+from nutrition_tracker.containers import build_container
+
+
+def test_warm_reuses_shared_clients(settings) -> None:
+    warm(settings)
+
+    supabase_client = shared_supabase_client(
+        settings.supabase_url, settings.supabase_service_key
+    )
+    openai_client = shared_openai_client(settings.openai_api_key)
+
+    assert supabase_client is shared_supabase_client(
+        settings.supabase_url, settings.supabase_service_key
+    )
+    assert openai_client is shared_openai_client(settings.openai_api_key)
+
+
+def test_supabase_client_uses_pooled_http_client(settings) -> None:
+    supabase_client = shared_supabase_client(
+        settings.supabase_url, settings.supabase_service_key
+    )
+
+    session = supabase_client.postgrest.session
+
+    assert session is supabase_client.options.httpx_client
+    assert session.timeout.read == create_supabase_http_client().timeout.read
+
+
+def test_build_container_uses_shared_supabase_client(settings) -> None:
+    first = build_container(settings)
+    second = build_container(settings)
+
+    first_client = first.session_service.photo_repository.client
+    second_client = second.session_service.photo_repository.client
+
+    assert first_client is second_client
+    asyncio.run(first.close_resources())
+    asyncio.run(second.close_resources())
+
+
+def test_warm_prime_tolerates_query_failure(settings, monkeypatch) -> None:
+    class _FailingQuery:
+        def select(self, *_args):
+            return self
+
+        def limit(self, _count):
+            return self
+
+        def execute(self):
+            raise RuntimeError("offline")
+
+    class _FakeClient:
+        def table(self, _name):
+            return _FailingQuery()
+
+    monkeypatch.setattr(
+        bootstrap, "shared_supabase_client", lambda *_args: _FakeClient()
+    )
+
+    bootstrap.warm(settings, prime=True)
@@ -4,10 +4,15 @@ import asyncio
 import json
 
 import httpx
+import orjson
 
 from nutrition_tracker.adapters.fdc_client import HttpxFdcClient
 from nutrition_tracker.adapters.openai_vision_client import OpenAIVisionClient
-from nutrition_tracker.adapters.telegram_client import HttpxTelegramClient
+from nutrition_tracker.adapters.telegram_client import (
+    TELEGRAM_API_URL,
+    HttpxTelegramClient,
+    create_telegram_http_client,
+)
 from nutrition_tracker.adapters.telegram_file_client import HttpxTelegramFileClient
 
 
@@ -50,13 +55,34 @@ def test_telegram_client_send_and_callback() -> None:
         return httpx.Response(200, json={"ok": True, "result": {}})
 
     transport = httpx.MockTransport(handler)
-    async_client = httpx.AsyncClient(transport=transport)
+    async_client = httpx.AsyncClient(transport=transport, base_url=TELEGRAM_API_URL)
     client = HttpxTelegramClient(bot_token="token", http_client=async_client)
 
     asyncio.run(client.send_message(chat_id=1, text="Hi"))
     asyncio.run(client.answer_callback_query(callback_query_id="cbq-1"))
 
 
+def test_telegram_client_embeds_preserialized_reply_markup() -> None:
+    bodies: list[dict[str, object]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(orjson.loads(request.content))
+        return httpx.Response(200, json={"ok": True, "result": {}})
+
+    transport = httpx.MockTransport(handler)
+    async_client = httpx.AsyncClient(transport=transport, base_url=TELEGRAM_API_URL)
+    client = HttpxTelegramClient(bot_token="token", http_client=async_client)
+    markup = {"inline_keyboard": [[{"text": "Go", "callback_data": "go"}]]}
+
+    asyncio.run(
+        client.send_message(
+            chat_id=1, text="Hi", reply_markup=orjson.Fragment(orjson.dumps(markup))
+        )
+    )
+
+    assert bodies == [{"chat_id": 1, "text": "Hi", "reply_markup": markup}]
+
+
 def test_telegram_client_commands_and_menu_button() -> None:
     seen_paths: list[str] = []
 
@@ -70,7 +96,7 @@ def test_telegram_client_commands_and_menu_button() -> None:
         return httpx.Response(200, json={"ok": True, "result": True})
 
     transport = httpx.MockTransport(handler)
-    async_client = httpx.AsyncClient(transport=transport)
+    async_client = httpx.AsyncClient(transport=transport, base_url=TELEGRAM_API_URL)
     client = HttpxTelegramClient(bot_token="token", http_client=async_client)
 
     asyncio.run(
@@ -97,30 +123,53 @@ def test_telegram_file_client_downloads_bytes() -> None:
         return httpx.Response(200, content=b"image-bytes")
 
     transport = httpx.MockTransport(handler)
-    async_client = httpx.AsyncClient(transport=transport)
+    async_client = httpx.AsyncClient(transport=transport, base_url=TELEGRAM_API_URL)
     client = HttpxTelegramFileClient(bot_token="token", http_client=async_client)
 
     data = asyncio.run(client.download_file_bytes("file-id"))
 
     assert data == b"image-bytes"
 
+    async def collect() -> list[bytes]:
+        return [chunk async for chunk in client.download_file_stream("file-id")]
+
+    assert b"".join(asyncio.run(collect())) == b"image-bytes"
+
 
 def test_fdc_client_search_and_get() -> None:
     def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.params["api_key"] == "key"
         if request.url.path.endswith("/foods/search"):
             return httpx.Response(200, json={"foods": []})
         return httpx.Response(200, json={"fdcId": 1, "foodNutrients": []})
 
     transport = httpx.MockTransport(handler)
-    async_client = httpx.AsyncClient(transport=transport)
-    client = HttpxFdcClient(
-        api_key="key",
+    async_client = httpx.AsyncClient(
+        transport=transport,
         base_url="https://api.test",
-        http_client=async_client,
+        params={"api_key": "key"},
     )
+    client = HttpxFdcClient(http_client=async_client)
 
     search = asyncio.run(client.search_foods("rice"))
     food = asyncio.run(client.get_food(1))
 
     assert search == {"foods": []}
     assert food["fdcId"] == 1
+
+
+def test_fdc_client_create_requests_compressed_responses() -> None:
+    client = HttpxFdcClient.create(api_key="key", base_url="https://api.test")
+
+    assert client.http_client is None
+    session = client.session()
+    assert session.headers["Accept-Encoding"] == "br, gzip"
+    assert session.params["api_key"] == "key"
+    asyncio.run(client.close())
+
+
+def test_telegram_http_client_is_bound_to_api_url() -> None:
+    http_client = create_telegram_http_client()
+
+    assert str(http_client.base_url) == "https://api.telegram.org"
+    asyncio.run(http_client.aclose())
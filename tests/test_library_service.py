@@ -98,6 +98,6 @@ def test_library_ranking_prefers_recent_then_frequency() -> None:
         ),
     ]
 
-    ranked = LibraryService._rank(items)
+    ranked = LibraryService._rank(items, limit=1)
 
-    assert ranked[0].name == "B"
+    assert [food.name for food in ranked] == ["B"]
@@ -51,6 +51,40 @@ def test_meal_log_service_saves_and_computes_totals() -> None:
     assert repository.meals
 
 
+def test_meal_log_service_stamps_library_uses_with_logged_at() -> None:
+    library_repository = InMemoryLibraryRepository()
+    repository = InMemoryMealLogRepository()
+    service = MealLogService(
+        nutrition_service=NutritionService(
+            fdc_client=FakeFdcClient(),
+            cache=InMemoryCache(),
+        ),
+        library_service=LibraryService(library_repository),
+        repository=repository,
+    )
+    items = [
+        {
+            "name": name,
+            "grams": 100,
+            "source_type": "manual",
+            "basis": "per100g",
+            "calories": 100,
+            "protein_g": 10,
+            "fat_g": 1,
+            "carbs_g": 5,
+        }
+        for name in ("Rice", "Beans")
+    ]
+
+    asyncio.run(service.save_meal(user_id=uuid4(), items=items))
+
+    [meal] = repository.meals.values()
+    foods = list(library_repository.foods.values())
+    assert len(foods) == 2
+    assert all(food.use_count == 1 for food in foods)
+    assert {food.last_used_at for food in foods} == {meal["logged_at"]}
+
+
 def test_meal_log_service_updates_item_grams() -> None:
     nutrition_service = NutritionService(
         fdc_client=FakeFdcClient(),
@@ -1,15 +1,22 @@
 """Tests for session state machine."""
 
 import asyncio
-from uuid import uuid4
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from uuid import UUID, uuid4
 
 from nutrition_tracker.adapters.fdc_client import FdcClient
+from nutrition_tracker.domain.meals import MealLogSummary
+from nutrition_tracker.domain.sessions import SessionRecord
+from nutrition_tracker.domain.stats import MealLogRow
 from nutrition_tracker.services.audit import AuditService
 from nutrition_tracker.services.cache import InMemoryCache
 from nutrition_tracker.services.library import LibraryService
 from nutrition_tracker.services.meals import MealLogService
 from nutrition_tracker.services.nutrition import NutritionService
-from nutrition_tracker.services.sessions import SessionService
+from nutrition_tracker.services.sessions import SessionPrompt, SessionService
+from nutrition_tracker.services.stats import StatsService
 from tests.conftest import (
     FakeFdcClient,
     InMemoryAuditRepository,
@@ -17,6 +24,7 @@ from tests.conftest import (
     InMemoryMealLogRepository,
     InMemoryPhotoRepository,
     InMemorySessionRepository,
+    InMemoryStatsRepository,
 )
 
 
@@ -54,6 +62,7 @@ def test_session_flow_prompts_for_item_and_weight() -> None:
         nutrition_service=nutrition_service,
         meal_log_service=meal_log_service,
         audit_service=audit_service,
+        stats_service=StatsService(InMemoryStatsRepository()),
     )
 
     user_id = uuid4()
@@ -110,6 +119,7 @@ def test_session_flow_handles_multiple_items() -> None:
         nutrition_service=nutrition_service,
         meal_log_service=meal_log_service,
         audit_service=audit_service,
+        stats_service=StatsService(InMemoryStatsRepository()),
     )
 
     user_id = uuid4()
@@ -183,6 +193,7 @@ def test_session_manual_entry_flow() -> None:
         nutrition_service=nutrition_service,
         meal_log_service=meal_log_service,
         audit_service=audit_service,
+        stats_service=StatsService(InMemoryStatsRepository()),
     )
 
     user_id = uuid4()
@@ -253,6 +264,7 @@ def test_session_fdc_timeout_falls_back_to_selection() -> None:
         nutrition_service=nutrition_service,
         meal_log_service=meal_log_service,
         audit_service=audit_service,
+        stats_service=StatsService(InMemoryStatsRepository()),
     )
 
     user_id = uuid4()
@@ -303,6 +315,7 @@ def test_session_edit_flow_records_audit() -> None:
         nutrition_service=nutrition_service,
         meal_log_service=meal_log_service,
         audit_service=audit_service,
+        stats_service=StatsService(InMemoryStatsRepository()),
     )
 
     user_id = uuid4()
@@ -325,7 +338,7 @@ def test_session_edit_flow_records_audit() -> None:
     )
     meal_id = summary.meal_id
     assert meal_id is not None
-    prompt = service.start_edit_session(user_id, meal_id)
+    prompt = asyncio.run(service.start_edit_session(user_id, meal_id))
     assert prompt is not None
     session_id = list(session_repository.sessions.keys())[-1]
 
@@ -354,6 +367,7 @@ def test_cancel_active_session_deletes_photo() -> None:
         nutrition_service=nutrition_service,
         meal_log_service=meal_log_service,
         audit_service=audit_service,
+        stats_service=StatsService(InMemoryStatsRepository()),
     )
     user_id = uuid4()
     session_id, _ = asyncio.run(
@@ -367,7 +381,7 @@ def test_cancel_active_session_deletes_photo() -> None:
         )
     )
     assert photo_repository.photos
-    prompt = service.cancel_active_session(user_id)
+    prompt = asyncio.run(service.cancel_active_session(user_id))
     assert prompt is not None
     assert session_repository.sessions[session_id].status == "CANCELLED"
     assert not photo_repository.photos
@@ -392,10 +406,11 @@ def test_library_add_flow_creates_food() -> None:
         nutrition_service=nutrition_service,
         meal_log_service=meal_log_service,
         audit_service=audit_service,
+        stats_service=StatsService(InMemoryStatsRepository()),
     )
 
     user_id = uuid4()
-    prompt = service.start_library_add_session(user_id)
+    prompt = asyncio.run(service.start_library_add_session(user_id))
     assert "food name" in prompt.text.lower()
     session_id = list(session_repository.sessions.keys())[-1]
 
@@ -415,3 +430,157 @@ def test_library_add_flow_creates_food() -> None:
     assert prompt is not None
     assert session_repository.sessions[session_id].status == "COMPLETED"
     assert library_repo.foods
+
+
+def test_session_locks_are_shared_and_released() -> None:
+    nutrition_service = NutritionService(FakeFdcClient(), InMemoryCache())
+    library_service = LibraryService(InMemoryLibraryRepository())
+    service = SessionService(
+        photo_repository=InMemoryPhotoRepository(),
+        session_repository=InMemorySessionRepository(),
+        library_service=library_service,
+        nutrition_service=nutrition_service,
+        meal_log_service=MealLogService(
+            nutrition_service=nutrition_service,
+            library_service=library_service,
+            repository=InMemoryMealLogRepository(),
+        ),
+        audit_service=AuditService(InMemoryAuditRepository()),
+        stats_service=StatsService(InMemoryStatsRepository()),
+    )
+    session_id = uuid4()
+
+    lock = service._session_lock(session_id)
+    assert service._session_lock(session_id) is lock
+    assert service._session_lock(uuid4()) is not lock
+
+    del lock
+    assert session_id not in service._session_locks
+
+
+def _build_service(
+    session_repository: InMemorySessionRepository,
+    stats_service: StatsService | None = None,
+) -> SessionService:
+    nutrition_service = NutritionService(FakeFdcClient(), InMemoryCache())
+    library_service = LibraryService(InMemoryLibraryRepository())
+    assert session_repository.meal_log_repository is not None
+    return SessionService(
+        photo_repository=session_repository.photo_repository,
+        session_repository=session_repository,
+        library_service=library_service,
+        nutrition_service=nutrition_service,
+        meal_log_service=MealLogService(
+            nutrition_service=nutrition_service,
+            library_service=library_service,
+            repository=session_repository.meal_log_repository,
+        ),
+        audit_service=AuditService(InMemoryAuditRepository()),
+        stats_service=stats_service or StatsService(InMemoryStatsRepository()),
+    )
+
+
+def test_save_session_invalidates_cached_stats() -> None:
+    session_repository = InMemorySessionRepository(
+        meal_log_repository=InMemoryMealLogRepository()
+    )
+    stats_repository = InMemoryStatsRepository()
+    stats_service = StatsService(stats_repository)
+    service = _build_service(session_repository, stats_service)
+    user_id = uuid4()
+    session = session_repository.create_session(
+        user_id, None, "AWAITING_SAVE", {"resolved_items": []}
+    )
+    assert stats_service.get_today(user_id, "UTC").calories == 0
+    stats_repository.logs.append(
+        MealLogRow(
+            meal_id=uuid4(),
+            logged_at=datetime.now(tz=UTC),
+            total_calories=500,
+            total_protein_g=30,
+            total_fat_g=10,
+            total_carbs_g=50,
+        )
+    )
+
+    asyncio.run(service.save_session(session.id))
+
+    assert stats_service.get_today(user_id, "UTC").calories == 500
+
+
+def test_concurrent_saves_log_the_meal_once() -> None:
+    meal_log_repository = InMemoryMealLogRepository()
+    session_repository = InMemorySessionRepository(
+        meal_log_repository=meal_log_repository
+    )
+    service = _build_service(session_repository)
+    session = session_repository.create_session(
+        uuid4(), None, "AWAITING_SAVE", {"resolved_items": []}
+    )
+
+    async def save_twice() -> list[MealLogSummary | None]:
+        return await asyncio.gather(
+            service.save_session(session.id), service.save_session(session.id)
+        )
+
+    first, second = asyncio.run(save_twice())
+
+    assert first is not None
+    assert second is None
+    assert len(meal_log_repository.meals) == 1
+
+
+@dataclass
+class InterleavingSessionRepository(InMemorySessionRepository):
+    """Lets another handler update the session right after it is looked up."""
+
+    after_active_read: Callable[[], None] | None = None
+
+    def get_active_session(self, user_id: UUID) -> SessionRecord | None:
+        session = super().get_active_session(user_id)
+        if self.after_active_read is not None:
+            self.after_active_read()
+            self.after_active_read = None
+        return session
+
+
+def test_handle_text_rereads_session_under_lock() -> None:
+    session_repository = InterleavingSessionRepository(
+        meal_log_repository=InMemoryMealLogRepository()
+    )
+    service = _build_service(session_repository)
+    user_id = uuid4()
+    asyncio.run(service.start_library_add_session(user_id))
+    session_id = next(iter(session_repository.sessions))
+    session_repository.after_active_read = lambda: session_repository.update_session(
+        session_id, "CANCELLED", {}
+    )
+
+    prompt = asyncio.run(service.handle_text(user_id, "Trail mix"))
+
+    assert prompt is None
+    assert session_repository.sessions[session_id].status == "CANCELLED"
+
+
+def test_cancel_waits_for_in_flight_step() -> None:
+    session_repository = InMemorySessionRepository(
+        meal_log_repository=InMemoryMealLogRepository()
+    )
+    service = _build_service(session_repository)
+    user_id = uuid4()
+    session = session_repository.create_session(
+        user_id, None, "AWAITING_SAVE", {"resolved_items": []}
+    )
+
+    async def cancel_during_save() -> SessionPrompt | None:
+        async with service._session_lock(session.id):
+            cancel = asyncio.create_task(service.cancel_active_session(user_id))
+            await asyncio.sleep(0.05)
+            assert not cancel.done()
+            await service._save_session_meal(session)
+        return await cancel
+
+    prompt = asyncio.run(cancel_during_save())
+
+    assert prompt is None
+    assert session_repository.sessions[session.id].status == "COMPLETED"
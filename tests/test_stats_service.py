@@ -38,6 +38,27 @@ def test_get_today_aggregates_by_timezone() -> None:
     assert totals.protein_g == 30
 
 
+def test_get_week_fills_missing_days() -> None:
+    user_id = uuid4()
+    repo = InMemoryStatsRepository()
+    repo.logs = [
+        MealLogRow(
+            meal_id=uuid4(),
+            logged_at=datetime.now(tz=UTC),
+            total_calories=700,
+            total_protein_g=35,
+            total_fat_g=14,
+            total_carbs_g=70,
+        )
+    ]
+
+    service = StatsService(repo)
+    summary = service.get_week(user_id, "UTC")
+
+    assert len(summary.daily) == 7
+    assert summary.avg_calories == 100
+
+
 def test_get_history_returns_recent() -> None:
     user_id = uuid4()
     repo = InMemoryStatsRepository()
@@ -66,3 +87,50 @@ def test_get_history_returns_recent() -> None:
 
     assert len(history) == 1
     assert history[0].total_calories == 400
+
+
+def test_get_today_is_cached_until_invalidated() -> None:
+    user_id = uuid4()
+    repo = InMemoryStatsRepository()
+    meal = MealLogRow(
+        meal_id=uuid4(),
+        logged_at=datetime.now(tz=UTC),
+        total_calories=300,
+        total_protein_g=20,
+        total_fat_g=10,
+        total_carbs_g=30,
+    )
+    repo.logs = [meal]
+    service = StatsService(repo)
+
+    first = service.get_today(user_id, "UTC")
+    repo.logs = [meal, meal]
+    cached = service.get_today(user_id, "UTC")
+    service.invalidate_user(user_id)
+    refreshed = service.get_today(user_id, "UTC")
+
+    assert first.calories == 300
+    assert cached.calories == 300
+    assert refreshed.calories == 600
+
+
+def test_cached_stats_expire_after_ttl() -> None:
+    user_id = uuid4()
+    repo = InMemoryStatsRepository()
+    meal = MealLogRow(
+        meal_id=uuid4(),
+        logged_at=datetime.now(tz=UTC),
+        total_calories=300,
+        total_protein_g=20,
+        total_fat_g=10,
+        total_carbs_g=30,
+    )
+    repo.logs = [meal]
+    service = StatsService(repo, ttl_seconds=0)
+
+    first = service.get_today(user_id, "UTC")
+    repo.logs = [meal, meal]
+    second = service.get_today(user_id, "UTC")
+
+    assert first.calories == 300
+    assert second.calories == 600
@@ -4,6 +4,9 @@ from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from uuid import UUID, uuid4
 
+import pytest
+from postgrest.types import ReturnMethod
+
 from nutrition_tracker.adapters.supabase_admin_repository import SupabaseAdminRepository
 from nutrition_tracker.adapters.supabase_library_repository import (
     SupabaseLibraryRepository,
@@ -21,12 +24,12 @@ from nutrition_tracker.adapters.supabase_user_settings_repository import (
     SupabaseUserSettingsRepository,
 )
 from nutrition_tracker.domain.meals import MealItemSnapshot
-from nutrition_tracker.domain.nutrition import MacroProfile
+from nutrition_tracker.domain.sessions import SessionRecord
 
 
 @dataclass
 class FakeResponse:
-    data: list[dict[str, object]] | None
+    data: object | None
 
 
 @dataclass
@@ -36,7 +39,9 @@ class FakeTable:
         default_factory=lambda: {"select": [], "insert": [], "update": [], "delete": []}
     )
     last_payload: object | None = None
+    last_returning: object | None = None
     last_filters: list[tuple[str, object]] = field(default_factory=list)
+    last_range: tuple[int, int] | None = None
 
     def queue(self, action: str, data: list[dict[str, object]]) -> None:
         self.response_queue[action].append(data)
@@ -45,18 +50,21 @@ class FakeTable:
         self._action = "select"
         return self
 
-    def insert(self, payload) -> "FakeTable":  # type: ignore[no-untyped-def]
+    def insert(self, payload, returning=None) -> "FakeTable":  # type: ignore[no-untyped-def]
         self._action = "insert"
         self.last_payload = payload
+        self.last_returning = returning
         return self
 
-    def update(self, payload) -> "FakeTable":  # type: ignore[no-untyped-def]
+    def update(self, payload, returning=None) -> "FakeTable":  # type: ignore[no-untyped-def]
         self._action = "update"
         self.last_payload = payload
+        self.last_returning = returning
         return self
 
-    def delete(self) -> "FakeTable":
+    def delete(self, returning=None) -> "FakeTable":  # type: ignore[no-untyped-def]
         self._action = "delete"
+        self.last_returning = returning
         return self
 
     def eq(self, column: str, value) -> "FakeTable":  # type: ignore[no-untyped-def]
@@ -71,9 +79,17 @@ class FakeTable:
         self.last_filters.append((column, value))
         return self
 
+    def or_(self, filters: str) -> "FakeTable":
+        self.last_filters.append(("or", filters))
+        return self
+
     def limit(self, _count: int) -> "FakeTable":
         return self
 
+    def range(self, start: int, end: int) -> "FakeTable":
+        self.last_range = (start, end)
+        return self
+
     def order(self, _column: str, desc: bool = False) -> "FakeTable":
         return self
 
@@ -90,32 +106,101 @@ class FakeTable:
         return FakeResponse(data=data)
 
 
+@dataclass
+class FakeRpcCall:
+    data: object | None = None
+
+    def execute(self) -> FakeResponse:
+        return FakeResponse(data=self.data)
+
+
 @dataclass
 class FakeSupabaseClient:
     tables: dict[str, FakeTable] = field(default_factory=dict)
+    rpc_calls: list[tuple[str, dict[str, object]]] = field(default_factory=list)
+    rpc_data: object | None = None
 
     def table(self, name: str) -> FakeTable:
         if name not in self.tables:
             self.tables[name] = FakeTable(name=name)
         return self.tables[name]
 
+    def rpc(self, name: str, params: dict[str, object]) -> FakeRpcCall:
+        self.rpc_calls.append((name, params))
+        return FakeRpcCall(data=self.rpc_data)
+
+
+@dataclass
+class FailingRpcSupabaseClient(FakeSupabaseClient):
+    fail: bool = True
+
+    def rpc(self, name: str, params: dict[str, object]) -> FakeRpcCall:
+        if self.fail:
+            raise RuntimeError("rpc unavailable")
+        return super().rpc(name, params)
+
 
 def test_supabase_user_repository_roundtrip() -> None:
     client = FakeSupabaseClient()
     users_table = client.table("users")
     user_id = str(uuid4())
-    users_table.queue("insert", [{"id": user_id, "telegram_user_id": 123}])
+    client.rpc_data = {"id": user_id, "telegram_user_id": 123}
     users_table.queue("select", [{"id": user_id, "telegram_user_id": 123}])
 
     repository = SupabaseUserRepository(client)
-    created = repository.create_user(123)
+    created = repository.create_user_with_settings(123, timezone=None)
     fetched = repository.get_by_telegram_id(123)
 
     assert str(created.id) == user_id
+    assert client.rpc_calls == [
+        (
+            "create_user_with_settings",
+            {"p_telegram_user_id": 123, "p_timezone": None},
+        )
+    ]
     assert fetched is not None
     assert fetched.telegram_user_id == 123
 
 
+def test_supabase_user_repository_batches_touches() -> None:
+    client = FakeSupabaseClient()
+    repository = SupabaseUserRepository(client, touch_interval_seconds=3600)
+    first, second = uuid4(), uuid4()
+
+    repository.touch_last_active(first)
+    repository.touch_last_active(second)
+    repository.touch_last_active(first)
+
+    assert client.rpc_calls == []
+
+    repository.flush_last_active()
+
+    assert client.rpc_calls == [
+        ("touch_users_last_active", {"p_user_ids": sorted([str(first), str(second)])})
+    ]
+
+    repository.flush_last_active()
+
+    assert len(client.rpc_calls) == 1
+
+
+def test_supabase_user_repository_keeps_touches_when_flush_fails() -> None:
+    client = FailingRpcSupabaseClient()
+    repository = SupabaseUserRepository(client, touch_interval_seconds=3600)
+    user_id = uuid4()
+    repository.touch_last_active(user_id)
+
+    with pytest.raises(RuntimeError):
+        repository.flush_last_active()
+    client.fail = False
+    repository.flush_last_active()
+
+    assert client.rpc_calls[-1] == (
+        "touch_users_last_active",
+        {"p_user_ids": [str(user_id)]},
+    )
+
+
 def test_supabase_user_settings_repository() -> None:
     client = FakeSupabaseClient()
     settings_table = client.table("user_settings")
@@ -126,6 +211,7 @@ def test_supabase_user_settings_repository() -> None:
 
     repository.set_timezone(uuid4(), "America/Los_Angeles")
     assert isinstance(settings_table.last_payload, dict)
+    assert settings_table.last_returning == ReturnMethod.minimal
 
 
 def test_supabase_photo_repository() -> None:
@@ -184,9 +270,42 @@ def test_supabase_session_repository() -> None:
         context={},
     )
     fetched = repository.get_session(created.id)
+    active = repository.get_active_session(uuid4())
+    repository.update_session(created.id, "CANCELLED", {})
 
     assert created.photo_id is not None
+    assert created.context == {"items": []}
     assert fetched is not None
+    assert active is None
+    with pytest.raises(TypeError):
+        fetched.context["items"] = []  # type: ignore[index]
+    assert ("is_active", True) in sessions_table.last_filters
+    assert sessions_table.last_filters[-2:] == [
+        ("id", str(created.id)),
+        ("is_active", True),
+    ]
+
+
+def test_supabase_session_repository_skips_inactive_save() -> None:
+    client = FakeSupabaseClient()
+    repository = SupabaseSessionRepository(client)
+    session = SessionRecord(
+        id=uuid4(),
+        user_id=uuid4(),
+        photo_id=None,
+        status="AWAITING_SAVE",
+        context={},
+    )
+    meal_id = uuid4()
+
+    client.rpc_data = str(meal_id)
+    saved = repository.complete_with_meal_log(session, datetime.now(tz=UTC), [])
+    client.rpc_data = None
+    skipped = repository.complete_with_meal_log(session, datetime.now(tz=UTC), [])
+
+    assert saved == meal_id
+    assert skipped is None
+    assert [name for name, _ in client.rpc_calls] == ["save_session_meal"] * 2
 
 
 def test_supabase_stats_repository() -> None:
@@ -222,37 +341,72 @@ def test_supabase_stats_repository() -> None:
     repository = SupabaseStatsRepository(client)
     logs = repository.list_meal_logs(uuid4(), datetime.now(), datetime.now())
     recent = repository.list_recent_meal_logs(uuid4(), limit=1)
+    client.rpc_data = [
+        {
+            "day": "2024-01-02",
+            "calories": 300.0,
+            "protein_g": 20.0,
+            "fat_g": 10.0,
+            "carbs_g": 40.0,
+        }
+    ]
+    daily = repository.list_daily_totals(
+        uuid4(), datetime.now(tz=UTC), datetime.now(tz=UTC), "Europe/Berlin"
+    )
 
     assert logs
     assert recent
+    assert daily[0].calories == 300.0
+    assert client.rpc_calls[0][0] == "meal_log_daily_stats"
+    assert client.rpc_calls[0][1]["p_timezone"] == "Europe/Berlin"
+
+
+def test_supabase_stats_repository_aggregates_user_activity() -> None:
+    user_id = uuid4()
+    client = FakeSupabaseClient(
+        rpc_data=[
+            {
+                "user_id": str(user_id),
+                "logs_7d": 2,
+                "logs_30d": 5,
+                "calories_7d": 1400.0,
+            }
+        ]
+    )
+    now = datetime.now(tz=UTC)
+
+    activity = SupabaseStatsRepository(client).aggregate_user_logs(
+        [user_id], now, now, now
+    )
+
+    assert activity[user_id].logs_last_30d == 5
+    assert activity[user_id].calories_last_7d == 1400.0
+    name, params = client.rpc_calls[-1]
+    assert name == "meal_log_user_activity"
+    assert params["p_user_ids"] == [str(user_id)]
 
 
 def test_supabase_meal_log_repository() -> None:
-    client = FakeSupabaseClient()
-    logs_table = client.table("meal_logs")
-    items_table = client.table("meal_items")
     meal_id = str(uuid4())
-    logs_table.queue("insert", [{"id": meal_id}])
+    client = FakeSupabaseClient(rpc_data=meal_id)
 
     repository = SupabaseMealLogRepository(client)
-    created_id = repository.create_meal_log(
+    created_id = repository.create_meal_log_with_items(
         user_id=uuid4(),
         logged_at=datetime.now(tz=UTC),
-        totals=MacroProfile(100, 10, 5, 20),
-    )
-    repository.create_meal_items(
-        created_id,
-        [MealItemSnapshot("rice", 100, 130, 3, 1, 28)],
+        items=[MealItemSnapshot("rice", 100, 130, 3, 1, 28)],
     )
 
     assert str(created_id) == meal_id
-    assert isinstance(items_table.last_payload, list)
+    name, params = client.rpc_calls[-1]
+    assert name == "create_meal_log_with_items"
+    assert params["p_items"][0]["item_calories"] == 130
 
 
 def test_supabase_library_repository() -> None:
     client = FakeSupabaseClient()
     foods_table = client.table("foods_user_library")
-    aliases_table = client.table("food_aliases")
+    search_view = client.table("foods_user_library_search")
     food_id = str(uuid4())
 
     foods_table.queue(
@@ -272,9 +426,7 @@ def test_supabase_library_repository() -> None:
             }
         ],
     )
-    foods_table.queue("select", [])
-    aliases_table.queue("select", [{"food_id": food_id}])
-    foods_table.queue(
+    search_view.queue(
         "select",
         [
             {
@@ -314,12 +466,17 @@ def test_supabase_library_repository() -> None:
     results = repository.search_foods(uuid4(), "Rice", limit=5)
     top = repository.list_top_foods(uuid4(), limit=5)
     repository.add_alias(uuid4(), UUID(food_id), "Rice")
-    foods_table.queue("select", [{"use_count": 1}])
     repository.increment_usage(UUID(food_id), datetime.now(tz=UTC))
 
     assert created.name == "Rice"
     assert results
+    assert search_view.last_filters[-1] == (
+        "or",
+        'name.ilike."*Rice*",alias_texts.ilike."*Rice*"',
+    )
     assert top
+    assert client.rpc_calls[-1][0] == "increment_food_use_count"
+    assert client.rpc_calls[-1][1]["p_food_id"] == food_id
 
 
 def test_supabase_admin_repository() -> None:
@@ -347,10 +504,12 @@ def test_supabase_admin_repository() -> None:
     repository = SupabaseAdminRepository(client)
     users = repository.list_users()
     sessions = repository.list_sessions(limit=5)
-    costs = repository.list_costs(limit=5)
+    costs = repository.list_costs(limit=5, offset=10)
     audits = repository.list_audit_events(UUID(user_id), limit=5)
 
     assert users
     assert sessions
     assert costs
     assert audits
+    assert sessions_table.last_range == (0, 4)
+    assert costs_table.last_range == (10, 14)
@@ -1,7 +1,11 @@
 """Tests for user service."""
 
+from uuid import uuid4
+
+from nutrition_tracker.services.cache import InMemoryCache
+from nutrition_tracker.services.user_settings import UserSettingsService
 from nutrition_tracker.services.users import UserService
-from tests.conftest import InMemoryUserRepository
+from tests.conftest import InMemoryUserRepository, InMemoryUserSettingsRepository
 
 
 def test_ensure_user_creates_user_and_settings() -> None:
@@ -22,3 +26,64 @@ def test_ensure_user_touches_existing_user() -> None:
     service.ensure_user(telegram_user_id=456)
 
     assert repository.touched == [user.id]
+
+
+def test_ensure_user_caches_lookup() -> None:
+    repository = InMemoryUserRepository()
+    service = UserService(repository)
+
+    created = service.ensure_user(telegram_user_id=789)
+    repository.users.clear()
+    cached = service.ensure_user(telegram_user_id=789)
+
+    assert cached == created
+    assert repository.touched == [created.id]
+
+
+def test_unset_timezone_is_not_cached() -> None:
+    repository = InMemoryUserSettingsRepository()
+    service = UserSettingsService(repository)
+    user_id = uuid4()
+
+    assert not service.is_timezone_set(user_id)
+    repository.timezones[user_id] = "Europe/Berlin"
+
+    assert service.is_timezone_set(user_id)
+    assert service.get_timezone(user_id) == "Europe/Berlin"
+
+
+def test_stored_timezone_is_cached_until_saved() -> None:
+    repository = InMemoryUserSettingsRepository()
+    service = UserSettingsService(repository)
+    user_id = uuid4()
+    repository.timezones[user_id] = "Europe/Berlin"
+
+    assert service.get_timezone(user_id) == "Europe/Berlin"
+    repository.timezones[user_id] = "America/Chicago"
+    assert service.get_timezone(user_id) == "Europe/Berlin"
+    service.set_timezone(user_id, "Asia/Tokyo")
+
+    assert service.get_timezone(user_id) == "Asia/Tokyo"
+
+
+def test_in_memory_cache_evicts_oldest_entry() -> None:
+    cache = InMemoryCache(max_entries=2)
+
+    cache.set("a", 1, ttl_seconds=60)
+    cache.set("b", 2, ttl_seconds=60)
+    cache.set("c", 3, ttl_seconds=60)
+
+    assert cache.get("a") is None
+    assert cache.get("c") == 3
+
+
+def test_in_memory_cache_keeps_recently_read_entries() -> None:
+    cache = InMemoryCache(max_entries=2)
+
+    cache.set("a", 1, ttl_seconds=60)
+    cache.set("b", 2, ttl_seconds=60)
+    cache.get("a")
+    cache.set("c", 3, ttl_seconds=60)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
@@ -1,8 +1,13 @@
 """Tests for vision service."""
 
 import asyncio
+from collections.abc import AsyncIterator
 
-from nutrition_tracker.services.vision import VisionService, _to_data_url
+from nutrition_tracker.services.vision import (
+    VisionService,
+    _to_data_url,
+    stream_to_data_url,
+)
 from tests.conftest import FakeVisionClient
 
 
@@ -32,3 +37,15 @@ def test_to_data_url_defaults_to_jpeg() -> None:
     url = _to_data_url(data)
 
     assert url.startswith("data:image/jpeg;base64,")
+
+
+def test_stream_to_data_url_matches_buffered_encoding() -> None:
+    data = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 3
+
+    async def chunks() -> AsyncIterator[bytes]:
+        for start in range(0, len(data), 7):
+            yield data[start : start + 7]
+
+    url = asyncio.run(stream_to_data_url(chunks()))
+
+    assert url == _to_data_url(data)
@@ -40,6 +40,7 @@ def test_webhook_start_creates_user_and_sends_message(
 
     assert response.status_code == 200
     assert 123 in user_repository.users
+    assert user_repository.flushes == 1
     assert telegram_client.messages
     chat_id, text = telegram_client.messages[0]
     assert chat_id == 99
@@ -86,6 +87,41 @@ def test_webhook_photo_starts_session(
     assert len(session_repo.sessions) == 1
 
 
+def test_webhook_photo_rejected_while_session_open(
+    container, telegram_client: FakeTelegramClient
+) -> None:
+    app = create_app(container)
+    client = TestClient(app)
+
+    def photo_update(update_id: int) -> dict[str, object]:
+        return {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": 1700000001,
+                "chat": {"id": 101, "type": "private"},
+                "from": {"id": 321, "is_bot": False, "first_name": "Test"},
+                "photo": [
+                    {
+                        "file_id": "large",
+                        "file_unique_id": "large-unique",
+                        "width": 256,
+                        "height": 256,
+                    }
+                ],
+            },
+        }
+
+    client.post("/telegram/webhook", json=photo_update(30))
+    response = client.post("/telegram/webhook", json=photo_update(31))
+
+    assert response.status_code == 200
+    assert "already have an active session" in telegram_client.messages[-1][1]
+    session_repo = container.session_service.session_repository
+    assert isinstance(session_repo, InMemorySessionRepository)
+    assert len(session_repo.sessions) == 1
+
+
 def test_webhook_callback_advances_session(
     container, telegram_client: FakeTelegramClient
 ) -> None:
@@ -178,6 +214,9 @@ def test_webhook_save_creates_meal_log(
     repo = container.meal_log_service.repository
     assert isinstance(repo, InMemoryMealLogRepository)
     assert repo.meals
+    saved = container.session_service.session_repository.get_session(session.id)
+    assert saved is not None
+    assert saved.status == "COMPLETED"
 
 
 def test_webhook_today_command_returns_totals(
@@ -215,6 +254,8 @@ def test_webhook_today_command_returns_totals(
     assert response.status_code == 200
     assert telegram_client.messages
     assert "calories" in telegram_client.messages[-1][1].lower()
+    assert "\\n" not in telegram_client.messages[-1][1]
+    assert "Today totals:\nCalories: 700" in telegram_client.messages[-1][1]
 
 
 def test_webhook_library_and_add_flow(
@@ -441,3 +482,85 @@ def test_webhook_blocks_unknown_user(
     assert 123 not in user_repository.users
     assert telegram_client.messages
     assert telegram_client.messages[0][1] == "This bot is private."
+
+
+def test_webhook_acks_when_processing_fails(container, monkeypatch, caplog) -> None:
+    async def failing_handle(**_kwargs: int) -> None:
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(container.start_command_handler, "handle", failing_handle)
+    app = create_app(container)
+    client = TestClient(app)
+
+    payload = {
+        "update_id": 78,
+        "message": {
+            "message_id": 10,
+            "date": 1700000000,
+            "chat": {"id": 99, "type": "private"},
+            "from": {"id": 123, "is_bot": False, "first_name": "Test"},
+            "text": "/start",
+        },
+    }
+
+    response = client.post("/telegram/webhook", json=payload)
+
+    assert response.status_code == 200
+    assert "Failed to process Telegram update" in caplog.text
+
+
+def test_webhook_skips_retried_update(
+    container, telegram_client: FakeTelegramClient
+) -> None:
+    app = create_app(container)
+    client = TestClient(app)
+
+    payload = {
+        "update_id": 79,
+        "message": {
+            "message_id": 10,
+            "date": 1700000000,
+            "chat": {"id": 99, "type": "private"},
+            "from": {"id": 123, "is_bot": False, "first_name": "Test"},
+            "text": "/start",
+        },
+    }
+
+    first = client.post("/telegram/webhook", json=payload)
+    retry = client.post("/telegram/webhook", json=payload)
+
+    assert first.status_code == 200
+    assert retry.status_code == 200
+    assert len(telegram_client.messages) == 1
+
+
+def test_webhook_rejects_malformed_update(container) -> None:
+    app = create_app(container)
+    client = TestClient(app)
+
+    response = client.post("/telegram/webhook", json={"message": {"text": "hi"}})
+
+    assert response.status_code == 400
+
+
+def test_webhook_rejects_unlisted_sender_without_full_decode(
+    container, settings, telegram_client: FakeTelegramClient
+) -> None:
+    container.settings = settings.model_copy(update={"telegram_allowed_user_ids": "1"})
+    client = TestClient(create_app(container))
+
+    payload = {
+        "update_id": 60,
+        "message": {
+            "message_id": 60,
+            "date": 1700000000,
+            "chat": {"id": 808, "type": "private"},
+            "from": {"id": 666},
+            "photo": [{"file_id": "spam"}],
+        },
+    }
+
+    response = client.post("/telegram/webhook", json=payload)
+
+    assert response.status_code == 200
+    assert telegram_client.messages == [(808, "This bot is private.")]